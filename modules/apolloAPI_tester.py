@@ -1,14 +1,19 @@
+import os
+import sys
 import requests
 import json
 
-# Replace this with your actual API key
-API_KEY = "bWD6TaPWZUJyG3IWAzkEbg"
+# Export your Apollo API key as APOLLO_API_KEY
+API_KEY = os.getenv('APOLLO_API_KEY')
+
+# Set APOLLO_BASE_URL (e.g. to mock_apollo_server.py) to test without the live API
+BASE_URL = os.getenv('APOLLO_BASE_URL', "https://api.apollo.io/v1")
 
 def test_api_health():
     """
     Test if the API key is valid and working
     """
-    url = "https://api.apollo.io/v1/auth/health"
+    url = f"{BASE_URL}/auth/health"
     
     headers = {
         "Content-Type": "application/json",
@@ -47,7 +52,7 @@ def test_company_search():
     """
     Test a simple company search to verify API access
     """
-    url = "https://api.apollo.io/v1/organizations/search"
+    url = f"{BASE_URL}/organizations/search"
     
     headers = {
         "Content-Type": "application/json",
@@ -100,7 +105,7 @@ def test_contact_search():
     """
     Test a simple contact/people search
     """
-    url = "https://api.apollo.io/v1/mixed_people/search"
+    url = f"{BASE_URL}/mixed_people/search"
     
     headers = {
         "Content-Type": "application/json",
@@ -153,7 +158,7 @@ def search_companies_by_name(company_name):
     """
     Search for a specific company by name
     """
-    url = "https://api.apollo.io/v1/organizations/search"
+    url = f"{BASE_URL}/organizations/search"
     
     headers = {
         "Content-Type": "application/json",
@@ -201,6 +206,10 @@ if __name__ == "__main__":
     print("=" * 50)
     print("APOLLO.IO API KEY TESTER")
     print("=" * 50)
+
+    if not API_KEY:
+        print("❌ Error: APOLLO_API_KEY is not set")
+        sys.exit(1)
     
     # Test 1: Check API health
     health_ok = test_api_health()
@@ -0,0 +1,246 @@
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from rate_limiter import RateLimiter, RETRY_STATUSES
+from response_cache import CacheMiss, ResponseCache
+
+
+# Override with APOLLO_BASE_URL to point every client at a local stand-in
+# such as mock_apollo_server.py
+APOLLO_BASE_URL = os.getenv('APOLLO_BASE_URL', "https://api.apollo.io/v1")
+
+# Connect time is measured inside urllib3 (on the thread doing the request)
+# and picked up by ApolloClient once the response headers are back.
+_connect_timing = threading.local()
+
+
+class _ConnectTimerMixin:
+    """Record how long the TCP (+TLS) setup of a pooled connection takes."""
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            elapsed = time.perf_counter() - start
+            _connect_timing.seconds = getattr(_connect_timing, 'seconds', 0.0) + elapsed
+
+
+class _TimedHTTPConnection(_ConnectTimerMixin, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_ConnectTimerMixin, HTTPSConnection):
+    pass
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class _PooledAdapter(HTTPAdapter):
+    """HTTPAdapter whose pools use the connect-timing connection classes."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _TimedHTTPConnectionPool,
+            'https': _TimedHTTPSConnectionPool,
+        }
+
+
+@dataclass
+class RequestTiming:
+    """Latency breakdown of a single Apollo API call (seconds)."""
+    endpoint: str
+    status_code: int
+    connect: float
+    wait: float
+    transfer: float
+    total: float
+    num_bytes: int
+
+    @property
+    def reused_connection(self) -> bool:
+        return self.connect == 0.0
+
+
+class ApolloClient:
+    """Shared, pooled HTTP client for every Apollo API call.
+
+    One keep-alive ``requests.Session`` is reused across calls so pages and
+    per-organization lookups share TCP/TLS connections instead of opening a
+    new one each time. Every call is paced by a shared RateLimiter and
+    429/5xx responses are retried with jittered exponential backoff. With a
+    ResponseCache attached, identical requests are answered from disk.
+    """
+
+    def __init__(self, api_key: str, pool_size: int = 10, base_url: str = APOLLO_BASE_URL,
+                 timings_maxlen: int = 10000, rate_limiter: RateLimiter = None,
+                 max_retries: int = 5, cache: ResponseCache = None):
+        """
+        Initialize the client.
+
+        Args:
+            api_key: Apollo API key sent as ``X-Api-Key``
+            pool_size: Maximum number of keep-alive connections per host.
+                       Should be at least the number of concurrent callers.
+            base_url: API root, overridable for local stand-ins
+            timings_maxlen: Number of recent RequestTiming entries kept
+            rate_limiter: Limiter shared with other clients; a fresh one by default
+            max_retries: Retries for 429/5xx responses before giving up
+            cache: Optional on-disk response cache consulted before the network
+        """
+        self.api_key = api_key
+        self.base_url = base_url.rstrip('/')
+        self.pool_size = pool_size
+        self.timings = deque(maxlen=timings_maxlen)
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.max_retries = max_retries
+        self.cache = cache
+        self._timings_lock = threading.Lock()
+
+        self.session = requests.Session()
+        self.session.headers.update({
+            'Content-Type': 'application/json',
+            'Cache-Control': 'no-cache',
+            'Accept-Encoding': 'gzip, deflate',
+            'Connection': 'keep-alive',
+            'X-Api-Key': api_key
+        })
+        adapter = _PooledAdapter(pool_connections=pool_size, pool_maxsize=pool_size, pool_block=True)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def url(self, endpoint: str) -> str:
+        """Build the absolute URL for an endpoint such as 'organizations/search'."""
+        return f"{self.base_url}/{endpoint.lstrip('/')}"
+
+    def request(self, method: str, endpoint: str, payload: dict = None, params: dict = None,
+                timeout: float = 30) -> requests.Response:
+        """Send a rate-limited request, retrying 429/5xx with backoff.
+
+        Raises CacheMiss when the cache is in cache-only mode and has no entry.
+        """
+        cache_key = payload if payload is not None else params
+        use_cache = self.cache is not None and self.cache.caches(endpoint)
+        if use_cache:
+            body = self.cache.get(endpoint, cache_key)
+            if body is not None:
+                return self._cached_response(endpoint, body)
+            if self.cache.mode == 'cache-only':
+                raise CacheMiss(f"{endpoint} not in cache (cache-only mode)")
+
+        attempt = 0
+        while True:
+            self.rate_limiter.acquire(endpoint)
+            response = self._send(method, endpoint, payload, params, timeout)
+            self.rate_limiter.update_from_headers(endpoint, response.headers)
+
+            if response.status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+                if use_cache and response.status_code == 200:
+                    self.cache.put(endpoint, cache_key, response.content)
+                return response
+            delay = self.rate_limiter.backoff(endpoint, attempt, response.headers)
+            print(f"  ⏳ {endpoint} returned {response.status_code}, retrying in {delay:.1f}s")
+            attempt += 1
+
+    def _send(self, method: str, endpoint: str, payload: dict, params: dict,
+              timeout: float) -> requests.Response:
+        """Send one request over the pooled session and record its latency breakdown."""
+        _connect_timing.seconds = 0.0
+        start = time.perf_counter()
+        response = self.session.request(method, self.url(endpoint), json=payload, params=params,
+                                        timeout=timeout, stream=True)
+        headers_at = time.perf_counter()
+        # Reading .content pulls (and gunzips) the body, then releases the
+        # connection back to the pool for the next caller.
+        body = response.content
+        done_at = time.perf_counter()
+
+        connect = getattr(_connect_timing, 'seconds', 0.0)
+        timing = RequestTiming(
+            endpoint=endpoint,
+            status_code=response.status_code,
+            connect=connect,
+            wait=max(headers_at - start - connect, 0.0),
+            transfer=done_at - headers_at,
+            total=done_at - start,
+            num_bytes=len(body)
+        )
+        with self._timings_lock:
+            self.timings.append(timing)
+        return response
+
+    def _cached_response(self, endpoint: str, body: bytes) -> requests.Response:
+        """Wrap a cached body in a Response so callers cannot tell the difference."""
+        response = requests.Response()
+        response.status_code = 200
+        response._content = body
+        response.encoding = 'utf-8'
+        response.url = self.url(endpoint)
+        response.headers['Content-Type'] = 'application/json'
+        response.headers['X-Cache'] = 'HIT'
+        return response
+
+    def post(self, endpoint: str, payload: dict, timeout: float = 30) -> requests.Response:
+        return self.request('POST', endpoint, payload=payload, timeout=timeout)
+
+    def get(self, endpoint: str, params: dict = None, timeout: float = 30) -> requests.Response:
+        return self.request('GET', endpoint, params=params, timeout=timeout)
+
+    def latency_summary(self) -> dict:
+        """Aggregate recorded timings per endpoint."""
+        with self._timings_lock:
+            timings = list(self.timings)
+
+        summary = {}
+        for t in timings:
+            s = summary.setdefault(t.endpoint, {
+                'requests': 0, 'new_connections': 0,
+                'connect': 0.0, 'wait': 0.0, 'transfer': 0.0, 'total': 0.0, 'bytes': 0
+            })
+            s['requests'] += 1
+            s['new_connections'] += 0 if t.reused_connection else 1
+            s['connect'] += t.connect
+            s['wait'] += t.wait
+            s['transfer'] += t.transfer
+            s['total'] += t.total
+            s['bytes'] += t.num_bytes
+        return summary
+
+    def display_latency_summary(self):
+        """Print average connect / wait / transfer time per endpoint."""
+        summary = self.latency_summary()
+        if not summary:
+            return
+        print(f"\n{'='*70}")
+        print("⏱️  API LATENCY")
+        print(f"{'='*70}")
+        for endpoint, s in summary.items():
+            n = s['requests']
+            print(f"  {endpoint}: {n} requests, {s['new_connections']} new connections | "
+                  f"avg connect {s['connect'] / n * 1000:.0f}ms, "
+                  f"wait {s['wait'] / n * 1000:.0f}ms, "
+                  f"transfer {s['transfer'] / n * 1000:.0f}ms")
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,267 @@
+import os
+import argparse
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+
+from input_handler import InputHandler
+from apollo_client import ApolloClient
+from rate_limiter import RateLimiter
+from icp_query import EMPLOYEE_RANGES, ICPQuery
+from icp_scoring import ICPScorer
+from query_planner import QueryPlanner
+from crawl_journal import CrawlInterrupted, CrawlJournal, DEFAULT_JOURNAL_PATH
+from dedup_index import DedupIndex, DEFAULT_INDEX_PATH, org_keys, unique_by_keys
+from result_sink import JSONLSink, add_output_arguments
+from response_cache import CacheMiss, add_cache_arguments, cache_from_args
+from new import ApolloDataRetriever
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Payload fields ICPQuery.matches / ICPScorer re-check locally, so queries that
+# differ only in these can share one broader Apollo crawl.
+LOCAL_FIELDS = ('organization_locations', 'organization_num_employees_ranges')
+
+
+@dataclass
+class PlannedQuery:
+    """One Apollo organization crawl serving one or more ICPs."""
+    query: ICPQuery
+    members: list = field(default_factory=list)
+
+
+def load_icp_configs(paths: list) -> dict:
+    """Map ICP name (file stem) -> parsed YAML for files and directories of YAMLs."""
+    files = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            files.extend(sorted(p for p in path.iterdir() if p.suffix.lower() in ('.yaml', '.yml')))
+        else:
+            files.append(path)
+
+    configs = {}
+    for file in files:
+        name = file.stem
+        if name in configs:
+            name = f"{file.parent.name}_{file.stem}"
+        configs[name] = InputHandler(str(file), file_type='yaml').read()
+    return configs
+
+
+def _search_key(query: ICPQuery) -> tuple:
+    """The part of the org payload that Apollo must filter on (not locally checkable)."""
+    payload = query.org_payload()
+    return tuple(sorted(
+        (k, tuple(v) if isinstance(v, list) else v)
+        for k, v in payload.items() if k not in LOCAL_FIELDS + ('page', 'per_page')
+    ))
+
+
+def _merge(queries: list) -> ICPQuery:
+    """Smallest single query whose results are a superset of every member's.
+
+    An empty location / employee-range list means "no filter", so it wins.
+    """
+    first = queries[0]
+    if all(q.locations for q in queries):
+        locations = tuple(dict.fromkeys(loc for q in queries for loc in q.locations))
+        geography = tuple(dict.fromkeys(g for q in queries for g in q.geography))
+    else:
+        locations = geography = ()
+    if all(q.employee_ranges for q in queries):
+        wanted = {r for q in queries for r in q.employee_ranges}
+        employee_ranges = tuple(r for r in EMPLOYEE_RANGES if r in wanted)
+    else:
+        employee_ranges = ()
+    return replace(first, locations=locations, geography=geography,
+                   employee_ranges=employee_ranges, employee_min=None)
+
+
+def plan_queries(icp_configs: dict) -> list:
+    """Group ICPs into the distinct Apollo crawls needed to serve all of them.
+
+    ICPs are grouped when their payloads agree on every filter Apollo has
+    to apply (keyword tags, tech stack, funding); within a group, locations
+    and employee ranges are unioned into one query, and each ICP's own
+    constraints are re-applied locally afterwards. Identical ICPs therefore
+    cost one crawl, and a narrower ICP rides along with a broader one.
+    """
+    groups = {}
+    for name, icp_config in icp_configs.items():
+        query = ICPQuery.from_config(icp_config)
+        groups.setdefault(_search_key(query), []).append((name, query))
+    return [
+        PlannedQuery(query=_merge([q for _, q in members]), members=[name for name, _ in members])
+        for members in groups.values()
+    ]
+
+
+def fit_to_ceiling(apollo, plan: list, icp_configs: dict, planner: QueryPlanner = None) -> list:
+    """Undo merges whose union query has more results than Apollo will page through.
+
+    A merged crawl past the page ceiling would lose orgs that each ICP
+    alone could reach, so its members go back to their own queries
+    (identical ones still share a crawl). A merge that cannot be sized is
+    undone as well.
+    """
+    planner = planner or QueryPlanner(apollo)
+    fitted = []
+    for planned in plan:
+        if len(planned.members) > 1:
+            try:
+                total = planner.count(planned.query)
+            except (RuntimeError, CacheMiss, OSError) as e:
+                total = None
+                print(f"⚠️  Could not size the query for {', '.join(planned.members)}: {e}")
+            if total is None or total > planner.capacity:
+                if total is not None:
+                    print(f"⚠️  Query for {', '.join(planned.members)} has {total} results, past the "
+                          f"{planner.capacity} Apollo serves; crawling its ICPs separately")
+                own = {}
+                for name in planned.members:
+                    own.setdefault(ICPQuery.from_config(icp_configs[name]), []).append(name)
+                fitted.extend(PlannedQuery(query=query, members=names) for query, names in own.items())
+                continue
+        fitted.append(planned)
+    return fitted
+
+
+def display_plan(plan: list, num_icps: int):
+    print(f"\n{'='*70}")
+    print(f"🗺️  BATCH PLAN: {num_icps} ICPs -> {len(plan)} Apollo queries")
+    print(f"{'='*70}")
+    for i, planned in enumerate(plan, 1):
+        q = planned.query
+        print(f"{i}. {len(planned.members)} ICP(s): {', '.join(planned.members)}")
+        print(f"   Keywords: {list(q.keyword_tags)[:4]} | Locations: {list(q.locations) or 'any'} | "
+              f"Employee ranges: {len(q.employee_ranges) or 'any'}")
+
+
+def run_batch(apollo: ApolloDataRetriever, icp_configs: dict, output_dir: str = '.', compress: str = None,
+              max_pages='all', concurrency: int = 10, enrich: bool = True,
+              journal: CrawlJournal = None, dedup: DedupIndex = None) -> dict:
+    """Crawl each planned query once and fan the results out to every ICP.
+
+    Merged queries too large for Apollo's page ceiling are split back into
+    per-ICP crawls first (fit_to_ceiling). Returns a map of ICP name ->
+    {'organizations', 'people'}. Each ICP's matches are written to
+    ``<output_dir>/<name>/``; people are looked up once per organization
+    (per distinct title set) however many ICPs share it.
+    """
+    plan = fit_to_ceiling(apollo, plan_queries(icp_configs), icp_configs)
+    display_plan(plan, len(icp_configs))
+    suffix = {None: '.jsonl', 'gzip': '.jsonl.gz', 'zstd': '.jsonl.zst'}[compress]
+
+    results = {}
+    for i, planned in enumerate(plan, 1):
+        print(f"\n🔍 Query {i}/{len(plan)} for {', '.join(planned.members)}")
+        fetched = []
+        try:
+            for page, orgs in apollo.iter_organization_pages(planned.query, max_pages, concurrency, journal):
+                fetched.extend(orgs)
+                print(f"  ✓ Page {page}: found {len(orgs)} organizations")
+        except CrawlInterrupted as e:
+            print(f"\n❌ Crawl stopped at {e}; its ICPs get partial results")
+        fetched = unique_by_keys(fetched, org_keys)
+
+        for name in planned.members:
+            # Copies, so each ICP's icp_score does not overwrite another's
+            matched = ICPScorer(ICPQuery.from_config(icp_configs[name])).rank([dict(o) for o in fetched])
+            results[name] = {'organizations': matched, 'people': []}
+            with JSONLSink(Path(output_dir) / name / f"apollo_organizations{suffix}",
+                           compression=compress, append=False) as sink:
+                sink.write_many(matched)
+            print(f"  🎯 {name}: {len(matched)} of {len(fetched)} organizations match")
+
+    if enrich:
+        _enrich_batch(apollo, icp_configs, results, output_dir, suffix, compress, concurrency, journal, dedup)
+    return results
+
+
+def _enrich_batch(apollo, icp_configs, results, output_dir, suffix, compress, concurrency, journal, dedup):
+    """People lookups for the union of matched orgs, once per distinct title set."""
+    by_titles = {}
+    for name, icp_config in icp_configs.items():
+        titles = tuple(ICPQuery.from_config(icp_config).enrichment_titles)
+        by_titles.setdefault(titles, []).append(name)
+
+    for names in by_titles.values():
+        orgs = unique_by_keys([o for n in names for o in results[n]['organizations']], org_keys)
+        if not orgs:
+            continue
+        people = apollo.enrich_people_from_organizations(orgs, icp_configs[names[0]], concurrency=concurrency,
+                                                         journal=journal, dedup=dedup)
+        by_org = {}
+        for person in people:
+            by_org.setdefault(person['organization_context']['id'], []).append(person)
+
+        for name in names:
+            icp_people = [p for o in results[name]['organizations'] for p in by_org.get(o.get('id'), [])]
+            results[name]['people'] = icp_people
+            with JSONLSink(Path(output_dir) / name / f"apollo_people{suffix}",
+                           compression=compress, append=False) as sink:
+                sink.write_many(icp_people)
+            print(f"  👥 {name}: {len(icp_people)} people")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run many ICPs with one crawl per distinct Apollo query")
+    parser.add_argument('icps', nargs='+', help='ICP YAML files and/or directories of them')
+    parser.add_argument('--max-pages', default='all', help='Organization pages per query, or "all"')
+    parser.add_argument('--no-enrich', action='store_true', help='Skip the people enrichment step')
+    parser.add_argument('--plan-only', action='store_true', help='Print the query plan and exit')
+    add_cache_arguments(parser)
+    add_output_arguments(parser)
+    parser.add_argument('--resume', action='store_true',
+                        help='Skip pages and organizations completed by an earlier (interrupted) run')
+    parser.add_argument('--journal', default=DEFAULT_JOURNAL_PATH, help='SQLite crawl progress journal')
+    parser.add_argument('--dedup-index', default=DEFAULT_INDEX_PATH,
+                        help='SQLite identity index shared across runs')
+    parser.add_argument('--no-dedup', action='store_true',
+                        help='Disable the cross-run identity index (always re-fetch people)')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    icp_configs = load_icp_configs(args.icps)
+    if not icp_configs:
+        print("❌ Error: No ICP YAML files found")
+        return
+    if args.plan_only:
+        display_plan(plan_queries(icp_configs), len(icp_configs))
+        return
+
+    api_key = os.getenv('APOLLO_API_KEY')
+    if not api_key and not args.cache_only:
+        print("❌ Error: Set APOLLO_API_KEY in .env file")
+        return
+
+    print(f"\n🎯 BATCH ICP SEARCH ({len(icp_configs)} ICPs)")
+    concurrency = int(os.getenv('APOLLO_CONCURRENCY', 10))
+    rate_limiter = RateLimiter(requests_per_minute=float(os.getenv('APOLLO_REQUESTS_PER_MINUTE', 50)))
+    cache = cache_from_args(args)
+    client = ApolloClient(api_key, pool_size=max(concurrency, int(os.getenv('APOLLO_POOL_SIZE', 10))),
+                          rate_limiter=rate_limiter, cache=cache)
+    apollo = ApolloDataRetriever(api_key, client=client)
+    journal = CrawlJournal(args.journal, resume=args.resume)
+    dedup = None if args.no_dedup else DedupIndex(args.dedup_index)
+
+    max_pages = args.max_pages if args.max_pages == 'all' else int(args.max_pages)
+    results = run_batch(apollo, icp_configs, output_dir=args.output_dir, compress=args.compress,
+                        max_pages=max_pages, concurrency=concurrency, enrich=not args.no_enrich,
+                        journal=journal, dedup=dedup)
+
+    print(f"\n{'='*70}")
+    print("📦 BATCH SUMMARY")
+    print(f"{'='*70}")
+    for name, result in results.items():
+        print(f"  • {name}: {len(result['organizations'])} organizations, {len(result['people'])} people")
+    print(f"\n✅ Results written under {args.output_dir}/<icp name>/")
+    apollo.client.display_latency_summary()
+    if cache:
+        print(f"\n💾 Response cache: {cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,299 @@
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import queue
+import resource
+import signal
+import sys
+import time
+import tracemalloc
+
+import requests
+import yaml
+
+from mock_apollo_server import MockApolloConfig, MockApolloData, start_mock_server
+
+
+def _percentile(values: list, pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(int(round(pct / 100 * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+# ------------------- IMPLEMENTATIONS UNDER TEST ------------------- #
+def run_new(client, icp_config: dict, max_pages, concurrency: int):
+    from new import ApolloDataRetriever
+    apollo = ApolloDataRetriever(client.api_key, client=client)
+    orgs = apollo.search_organizations(icp_config, max_pages=max_pages,
+                                       concurrency=concurrency)['organizations']
+    people = apollo.enrich_people_from_organizations(orgs, icp_config, concurrency=concurrency)
+    return len(orgs), len(people)
+
+
+def run_premium(client, icp_config: dict, max_pages, concurrency: int):
+    from retrieve_data_apollo_premium import ApolloDataRetriever
+    apollo = ApolloDataRetriever(client.api_key, client=client)
+    orgs = apollo.search_organizations(icp_config).get('organizations', [])
+    people = apollo.search_people(icp_config).get('people', [])
+    return len(orgs), len(people)
+
+
+def run_free(client, icp_config: dict, max_pages, concurrency: int):
+    from retrieve_data_apollo import ApolloDataRetriever
+    apollo = ApolloDataRetriever(client.api_key, client=client)
+    orgs = apollo.search(icp_config).get('organizations', [])
+    return len(orgs), 0
+
+
+IMPLEMENTATIONS = {
+    'new-sequential': (run_new, 1),
+    'new-concurrent': (run_new, None),
+    'premium': (run_premium, 1),
+    'free': (run_free, 1),
+}
+
+
+def _run_one(name: str, base_url: str, icp_config: dict, max_pages, concurrency: int,
+             requests_per_minute: float, results):
+    """Child-process body: run one implementation and report its metrics."""
+    from apollo_client import ApolloClient
+    from rate_limiter import RateLimiter
+
+    func, fixed_concurrency = IMPLEMENTATIONS[name]
+    concurrency = fixed_concurrency or concurrency
+    client = ApolloClient('benchmark-key', pool_size=max(concurrency, 1), base_url=base_url,
+                          rate_limiter=RateLimiter(requests_per_minute=requests_per_minute))
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        num_orgs, num_people = func(client, icp_config, max_pages, concurrency)
+    elapsed = time.perf_counter() - start
+
+    latencies = [t.total for t in client.timings]
+    results.put({
+        'implementation': name,
+        'concurrency': concurrency,
+        'seconds': round(elapsed, 3),
+        'requests': len(latencies),
+        'orgs': num_orgs,
+        'people': num_people,
+        'orgs_per_sec': round(num_orgs / elapsed, 1) if elapsed else 0.0,
+        'people_per_sec': round(num_people / elapsed, 1) if elapsed else 0.0,
+        'p50_ms': round(_percentile(latencies, 50) * 1000, 1),
+        'p99_ms': round(_percentile(latencies, 99) * 1000, 1),
+        'peak_rss_mb': round(_peak_rss_mb(), 1),
+    })
+
+
+def _collect(proc, results, timeout: float) -> dict:
+    """The child's metrics row, or None if it crashed or ran past ``timeout`` seconds."""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return results.get(timeout=1)
+        except queue.Empty:
+            pass
+        if not proc.is_alive():
+            # The row may still be in the queue's pipe when the child exits
+            try:
+                return results.get(timeout=1)
+            except queue.Empty:
+                return None
+        if time.monotonic() >= deadline:
+            proc.terminate()
+            return None
+
+
+def run_benchmarks(names: list, base_url: str, icp_config: dict, max_pages='all',
+                   concurrency: int = 10, requests_per_minute: float = 60000,
+                   timeout: float = 600) -> list:
+    """Run each implementation in its own process so peak RSS is not shared.
+
+    Implementations that crash or run longer than ``timeout`` seconds are
+    reported and left out of the result rows.
+    """
+    ctx = multiprocessing.get_context('spawn')
+    rows = []
+    for name in names:
+        results = ctx.Queue()
+        proc = ctx.Process(target=_run_one, args=(name, base_url, icp_config, max_pages,
+                                                  concurrency, requests_per_minute, results))
+        proc.start()
+        row = _collect(proc, results, timeout)
+        proc.join()
+        if row is None or proc.exitcode != 0:
+            timed_out = proc.exitcode == -signal.SIGTERM
+            reason = f"timed out after {timeout:g}s" if timed_out else f"exited with code {proc.exitcode}"
+            print(f"❌ {name} benchmark {reason}; skipped")
+            continue
+        rows.append(row)
+    return rows
+
+
+# ------------------- PARSE BENCHMARK ------------------- #
+def _parse_paths() -> dict:
+    """Page decoders to compare: name -> callable(raw bytes) -> organizations."""
+    from fast_decode import orjson
+
+    def response_json(raw):
+        # The pre-orjson path: requests' Response.json() on the full body
+        response = requests.Response()
+        response._content = raw
+        response.encoding = 'utf-8'
+        return response.json()['organizations']
+
+    paths = {
+        'response.json': response_json,
+        'json.loads': lambda raw: json.loads(raw)['organizations'],
+    }
+    if orjson is not None:
+        paths['orjson'] = lambda raw: orjson.loads(raw)['organizations']
+    return paths
+
+
+def run_parse_benchmark(num_pages: int = 200, per_page: int = 100, repeat: int = 3) -> list:
+    """Decode ``num_pages`` mock organizations/search bodies with each parse path."""
+    orgs = MockApolloData(MockApolloConfig(num_orgs=per_page * 4)).organizations
+    pages = [
+        json.dumps({'organizations': [orgs[(p * per_page + i) % len(orgs)] for i in range(per_page)],
+                    'pagination': {'page': p + 1, 'per_page': per_page}}).encode('utf-8')
+        for p in range(num_pages)
+    ]
+
+    rows = []
+    for name, decode in _parse_paths().items():
+        best = best_sink = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for raw in pages:
+                decode(raw)
+            best = min(best, time.perf_counter() - start)
+            # Decode plus what the journal / JSONL sink then do with each page
+            start = time.perf_counter()
+            for raw in pages:
+                json.dumps(decode(raw), separators=(',', ':'))
+            best_sink = min(best_sink, time.perf_counter() - start)
+        # Memory retained by the decoded organizations of one batch
+        tracemalloc.start()
+        kept = [decode(raw) for raw in pages[:20]]
+        retained = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del kept
+        rows.append({
+            'decoder': name,
+            'ms_per_page': round(best / num_pages * 1000, 3),
+            'orgs_per_sec': round(num_pages * per_page / best),
+            'ms_per_page_with_sink': round(best_sink / num_pages * 1000, 3),
+            'kb_per_org': round(retained / (20 * per_page) / 1024, 2),
+        })
+    return rows
+
+
+def display_parse_results(rows: list):
+    print(f"\n{'='*70}")
+    print("🧮 PAGE PARSE BENCHMARK")
+    print(f"{'='*70}")
+    header = f"{'decoder':<20}{'ms/page':>10}{'orgs/s':>12}{'+sink ms':>10}{'KB/org':>10}"
+    print(header)
+    print('-' * len(header))
+    for r in rows:
+        print(f"{r['decoder']:<20}{r['ms_per_page']:>10}{r['orgs_per_sec']:>12}"
+              f"{r['ms_per_page_with_sink']:>10}{r['kb_per_org']:>10}")
+
+
+def display_results(rows: list):
+    print(f"\n{'='*100}")
+    print("🏁 APOLLO RETRIEVER BENCHMARK")
+    print(f"{'='*100}")
+    header = f"{'implementation':<16}{'conc':>5}{'secs':>9}{'reqs':>7}{'orgs/s':>10}{'people/s':>10}" \
+             f"{'p50 ms':>9}{'p99 ms':>9}{'RSS MB':>9}"
+    print(header)
+    print('-' * len(header))
+    for r in rows:
+        print(f"{r['implementation']:<16}{r['concurrency']:>5}{r['seconds']:>9}{r['requests']:>7}"
+              f"{r['orgs_per_sec']:>10}{r['people_per_sec']:>10}{r['p50_ms']:>9}{r['p99_ms']:>9}"
+              f"{r['peak_rss_mb']:>9}")
+
+
+def find_regressions(rows: list, baseline: list, tolerance: float) -> list:
+    """Implementations whose orgs/sec or people/sec dropped more than ``tolerance``."""
+    previous = {r['implementation']: r for r in baseline}
+    regressions = []
+    for row in rows:
+        base = previous.get(row['implementation'])
+        if not base:
+            continue
+        for metric in ('orgs_per_sec', 'people_per_sec'):
+            if base[metric] and row[metric] < base[metric] * (1 - tolerance):
+                regressions.append(f"{row['implementation']} {metric}: {base[metric]} -> {row[metric]}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput benchmark against the mock Apollo API")
+    parser.add_argument('--config', default='data/icp_config.yaml', help='ICP YAML config')
+    parser.add_argument('--implementations', nargs='+', default=list(IMPLEMENTATIONS),
+                        choices=list(IMPLEMENTATIONS))
+    parser.add_argument('--orgs', type=int, default=500, help='Organizations served by the mock')
+    parser.add_argument('--latency', type=float, default=0.05, help='Mock response latency (s)')
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--forbid-people', action='store_true', help='Mock 403s on mixed_people/search')
+    parser.add_argument('--rate-limit', type=int, default=0, help='Mock requests per minute before 429s')
+    parser.add_argument('--max-pages', default='all')
+    parser.add_argument('--concurrency', type=int, default=10)
+    parser.add_argument('--timeout', type=float, default=600,
+                        help='Seconds before an implementation run is abandoned')
+    parser.add_argument('--parse', action='store_true',
+                        help='Benchmark page decoding (full vs. projected, json vs. orjson) and exit')
+    parser.add_argument('--parse-pages', type=int, default=200)
+    parser.add_argument('--output', help='Write results as JSON')
+    parser.add_argument('--baseline', help='Earlier --output file to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='Allowed throughput drop vs. baseline before failing')
+    args = parser.parse_args()
+
+    if args.parse:
+        display_parse_results(run_parse_benchmark(args.parse_pages))
+        return
+
+    with open(args.config, 'r', encoding='utf-8') as f:
+        icp_config = yaml.safe_load(f)
+
+    config = MockApolloConfig(num_orgs=args.orgs, latency=args.latency, error_rate=args.error_rate,
+                              forbid_people=args.forbid_people, rate_limit_per_minute=args.rate_limit)
+    server, base_url = start_mock_server(config)
+    max_pages = args.max_pages if args.max_pages == 'all' else int(args.max_pages)
+
+    rows = run_benchmarks(args.implementations, base_url, icp_config, max_pages, args.concurrency,
+                          timeout=args.timeout)
+    server.shutdown()
+    display_results(rows)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(rows, f, indent=2)
+        print(f"\n✅ Results saved to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            regressions = find_regressions(rows, json.load(f), args.tolerance)
+        if regressions:
+            print("\n❌ Performance regressions:")
+            for r in regressions:
+                print(f"  • {r}")
+            sys.exit(1)
+        print("\n✅ No throughput regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+import math
+import time
+from dataclasses import dataclass
+
+from icp_query import ICPQuery
+from icp_scoring import ICPScorer
+from query_planner import PAGE_CEILING
+
+
+# Apollo credits charged per organization people lookup
+DEFAULT_CREDITS_PER_LOOKUP = 1
+
+# Assumed request latency when page 1 came from the response cache
+DEFAULT_LATENCY = 1.0
+
+
+@dataclass
+class CrawlEstimate:
+    """Projected cost of a search + enrichment run, from the first result page."""
+    total_entries: int
+    org_pages: int
+    est_matches: int
+    match_rate: float
+    people_calls: int
+    credits: int
+    seconds: float
+
+
+class BudgetPlanner:
+    """Estimate a crawl's calls, credits and wall time, and keep it inside hard budgets.
+
+    The estimate fetches only page 1 of the organization search (a cache hit
+    for the real crawl afterwards): ``pagination.total_entries`` gives the
+    number of pages, and the fraction of page 1 passing the local ICP filter
+    gives the expected number of people lookups.
+    """
+
+    def __init__(self, apollo, requests_per_minute: float = 50, concurrency: int = 10,
+                 max_credits: int = None, max_seconds: float = None,
+                 credits_per_lookup: int = DEFAULT_CREDITS_PER_LOOKUP, per_page: int = 25):
+        """
+        Args:
+            apollo: ApolloDataRetriever used for the page-1 probe
+            requests_per_minute: Expected sustained request rate
+            concurrency: Requests in flight at once
+            max_credits: Hard cap on credits spent on people lookups (None = unlimited)
+            max_seconds: Hard cap on wall time from construction (None = unlimited)
+            credits_per_lookup: Credits charged per people lookup
+            per_page: Organization page size used by the crawl
+        """
+        self.apollo = apollo
+        self.requests_per_minute = requests_per_minute
+        self.concurrency = concurrency
+        self.max_credits = max_credits
+        self.max_seconds = max_seconds
+        self.credits_per_lookup = credits_per_lookup
+        self.per_page = per_page
+        self.started = time.monotonic()
+
+    @property
+    def deadline(self) -> float:
+        """time.monotonic() value at which the time budget runs out, or None."""
+        return self.started + self.max_seconds if self.max_seconds is not None else None
+
+    @property
+    def max_lookups(self) -> int:
+        """People lookups the credit budget allows, or None."""
+        return self.max_credits // self.credits_per_lookup if self.max_credits is not None else None
+
+    def _seconds(self, calls: int, latency: float) -> float:
+        """Wall time for ``calls`` requests: bound by the rate limit or by latency / concurrency."""
+        rate_bound = calls / (self.requests_per_minute / 60) if self.requests_per_minute else 0.0
+        latency_bound = calls * latency / max(self.concurrency, 1)
+        return max(rate_bound, latency_bound)
+
+    def estimate(self, icp_config, max_pages=2, split: bool = False) -> CrawlEstimate:
+        """Project the run from page 1 of the organization search.
+
+        Args:
+            icp_config: ICP YAML dict or compiled ICPQuery
+            max_pages: Page limit of the crawl, or "all"
+            split: The crawl is partitioned past the page ceiling (query_planner)
+        """
+        query = icp_config if isinstance(icp_config, ICPQuery) else ICPQuery.from_config(icp_config)
+        num_timings = len(self.apollo.client.timings)
+        data = self.apollo._fetch_org_page(self.apollo.transform_org_config(query), 1)
+        timings = list(self.apollo.client.timings)[num_timings:]
+        latency = timings[-1].total if timings else DEFAULT_LATENCY
+
+        orgs = data.get('organizations', [])
+        total_entries = data.get('pagination', {}).get('total_entries', len(orgs)) or 0
+        pages = math.ceil(total_entries / self.per_page)
+        if not split:
+            pages = min(pages, PAGE_CEILING)
+            if max_pages != 'all':
+                pages = min(pages, int(max_pages))
+        reachable = min(total_entries, pages * self.per_page)
+
+        match_rate = len(ICPScorer(query).rank([dict(o) for o in orgs])) / len(orgs) if orgs else 0.0
+        est_matches = round(reachable * match_rate)
+        people_calls = est_matches
+        if self.max_lookups is not None:
+            people_calls = min(people_calls, self.max_lookups)
+
+        return CrawlEstimate(
+            total_entries=total_entries,
+            org_pages=pages,
+            est_matches=est_matches,
+            match_rate=match_rate,
+            people_calls=people_calls,
+            credits=people_calls * self.credits_per_lookup,
+            seconds=self._seconds(pages + people_calls, latency),
+        )
+
+    def select(self, organizations: list, dedup=None, job_titles: list = None) -> list:
+        """Highest-scoring organizations whose lookups fit the credit budget.
+
+        ``organizations`` should already be ranked (ICPScorer.rank). Orgs the
+        dedup index can answer for ``job_titles`` cost nothing and are always kept.
+        """
+        if self.max_lookups is None:
+            return organizations
+        selected = []
+        paid = 0
+        for org in organizations:
+            if dedup and dedup.people_fetched(org, job_titles):
+                selected.append(org)
+            elif paid < self.max_lookups:
+                selected.append(org)
+                paid += 1
+        return selected
+
+    def display(self, estimate: CrawlEstimate):
+        print(f"\n{'='*70}")
+        print("💳 CRAWL BUDGET PLAN")
+        print(f"{'='*70}")
+        print(f"  • Total entries: {estimate.total_entries}")
+        print(f"  • Organization pages: {estimate.org_pages}")
+        print(f"  • Expected ICP matches: {estimate.est_matches} ({estimate.match_rate:.0%} of page 1)")
+        print(f"  • People lookups: {estimate.people_calls}")
+        print(f"  • Credits: {estimate.credits}"
+              + (f" (budget {self.max_credits})" if self.max_credits is not None else ""))
+        print(f"  • Estimated time: {estimate.seconds:.0f}s"
+              + (f" (budget {self.max_seconds:g}s)" if self.max_seconds is not None else ""))
+        if self.max_seconds is not None and estimate.seconds > self.max_seconds:
+            print("  ⚠️  Estimated time exceeds the budget; the run will stop when it runs out")
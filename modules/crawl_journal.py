@@ -0,0 +1,118 @@
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+
+
+DEFAULT_JOURNAL_PATH = '.cache/crawl_journal.sqlite'
+
+
+class CrawlInterrupted(Exception):
+    """A crawl stopped before every requested page / organization was fetched."""
+
+
+def _pack(records) -> bytes:
+    return zlib.compress(json.dumps(records, separators=(',', ':')).encode('utf-8'))
+
+
+def _unpack(blob: bytes):
+    return json.loads(zlib.decompress(blob))
+
+
+class CrawlJournal:
+    """Durable progress journal for organization -> people crawls.
+
+    Completed organization pages and completed per-org people lookups are
+    committed to SQLite as soon as they finish (in any order), keyed by a
+    crawl key derived from the request payload. A resumed crawl reads them
+    back instead of spending API credits on them again.
+    """
+
+    def __init__(self, path: str = DEFAULT_JOURNAL_PATH, resume: bool = True):
+        """
+        Args:
+            path: SQLite file holding the journal
+            resume: Reuse progress from earlier runs. When False, a crawl key's
+                    progress is cleared the first time it is used in this run.
+        """
+        self.path = Path(path)
+        self.resume = resume
+        self._started = set()
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS pages (
+                crawl_key TEXT NOT NULL,
+                page INTEGER NOT NULL,
+                total_pages INTEGER,
+                orgs BLOB NOT NULL,
+                completed_at REAL NOT NULL,
+                PRIMARY KEY (crawl_key, page)
+            );
+            CREATE TABLE IF NOT EXISTS org_people (
+                crawl_key TEXT NOT NULL,
+                org_id TEXT NOT NULL,
+                people BLOB NOT NULL,
+                completed_at REAL NOT NULL,
+                PRIMARY KEY (crawl_key, org_id)
+            );
+        """)
+        self._conn.commit()
+
+    def _start(self, crawl_key: str):
+        """Clear stale progress once per key when not resuming. Caller holds the lock."""
+        if self.resume or crawl_key in self._started:
+            return
+        self._started.add(crawl_key)
+        self._conn.execute("DELETE FROM pages WHERE crawl_key = ?", (crawl_key,))
+        self._conn.execute("DELETE FROM org_people WHERE crawl_key = ?", (crawl_key,))
+        self._conn.commit()
+
+    # ------------------- ORGANIZATION PAGES ------------------- #
+    def completed_pages(self, crawl_key: str) -> dict:
+        """Map of page number -> (organizations, total_pages) already fetched."""
+        with self._lock:
+            self._start(crawl_key)
+            rows = self._conn.execute(
+                "SELECT page, orgs, total_pages FROM pages WHERE crawl_key = ?", (crawl_key,)
+            ).fetchall()
+        return {page: (_unpack(orgs), total_pages) for page, orgs, total_pages in rows}
+
+    def record_page(self, crawl_key: str, page: int, organizations: list, total_pages: int):
+        with self._lock:
+            self._start(crawl_key)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages (crawl_key, page, total_pages, orgs, completed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (crawl_key, page, total_pages, _pack(organizations), time.time())
+            )
+            self._conn.commit()
+
+    # ------------------- PEOPLE LOOKUPS ------------------- #
+    def completed_orgs(self, crawl_key: str) -> dict:
+        """Map of org id -> people already fetched for it."""
+        with self._lock:
+            self._start(crawl_key)
+            rows = self._conn.execute(
+                "SELECT org_id, people FROM org_people WHERE crawl_key = ?", (crawl_key,)
+            ).fetchall()
+        return {org_id: _unpack(people) for org_id, people in rows}
+
+    def record_org(self, crawl_key: str, org_id: str, people: list):
+        with self._lock:
+            self._start(crawl_key)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO org_people (crawl_key, org_id, people, completed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (crawl_key, org_id, _pack(people), time.time())
+            )
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,273 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+
+
+DEFAULT_INDEX_PATH = '.cache/identity_index.sqlite'
+
+
+def _normalize_domain(domain: str) -> str:
+    domain = domain.strip().lower()
+    for prefix in ('https://', 'http://'):
+        if domain.startswith(prefix):
+            domain = domain[len(prefix):]
+    if domain.startswith('www.'):
+        domain = domain[4:]
+    return domain.split('/')[0]
+
+
+def _normalize_url(url: str) -> str:
+    url = url.strip().lower()
+    for prefix in ('https://', 'http://'):
+        if url.startswith(prefix):
+            url = url[len(prefix):]
+    if url.startswith('www.'):
+        url = url[4:]
+    return url.rstrip('/')
+
+
+def org_keys(org: dict) -> list:
+    """Identity keys of an Apollo organization: id, primary domain, LinkedIn uid."""
+    keys = []
+    if org.get('id'):
+        keys.append(f"id:{org['id']}")
+    if org.get('primary_domain'):
+        keys.append(f"domain:{_normalize_domain(org['primary_domain'])}")
+    if org.get('linkedin_uid'):
+        keys.append(f"linkedin:{org['linkedin_uid']}")
+    return keys
+
+
+def person_keys(person: dict) -> list:
+    """Identity keys of an Apollo person / contact: id and LinkedIn URL."""
+    keys = []
+    if person.get('id'):
+        keys.append(f"id:{person['id']}")
+    if person.get('linkedin_url'):
+        keys.append(f"linkedin:{_normalize_url(person['linkedin_url'])}")
+    return keys
+
+
+def titles_key(job_titles) -> str:
+    """Stable key of a people-search title filter (order and case do not matter)."""
+    titles = sorted({t.strip().lower() for t in job_titles or () if t and t.strip()})
+    return hashlib.sha1(json.dumps(titles).encode('utf-8')).hexdigest()[:16] if titles else ''
+
+
+def unique_by_keys(records: list, key_func, seen: set = None) -> list:
+    """Drop records sharing any identity key with an earlier record.
+
+    Pass the same ``seen`` set across calls to de-duplicate over several batches.
+    """
+    seen = set() if seen is None else seen
+    unique = []
+    for record in records:
+        keys = key_func(record)
+        if keys and any(k in seen for k in keys):
+            continue
+        seen.update(keys)
+        unique.append(record)
+    return unique
+
+
+class DedupIndex:
+    """Persistent cross-run identity index for organizations and people.
+
+    Organizations are matched on Apollo id, primary domain or LinkedIn uid
+    and people on id or LinkedIn URL, so the same entity returned by
+    different keyword combinations, pages or runs resolves to one canonical
+    id. The index also remembers which organizations already had their
+    people fetched for a given set of job titles, so enrichment can skip
+    the credit; a lookup with different titles is a different search and
+    is never answered from another one's people.
+    """
+
+    def __init__(self, path: str = DEFAULT_INDEX_PATH, people_max_age_days: float = 30):
+        """
+        Args:
+            path: SQLite file holding the index
+            people_max_age_days: Reuse stored people for this long before
+                                 spending a credit to refresh them
+        """
+        self.path = Path(path)
+        self.people_max_age = people_max_age_days * 86400
+        self.people_reused = 0
+        self._run_seen = set()
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS org_keys (
+                key TEXT PRIMARY KEY,
+                org_id TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS orgs (
+                org_id TEXT PRIMARY KEY,
+                first_seen REAL NOT NULL,
+                last_seen REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS people_lookups (
+                org_id TEXT NOT NULL,
+                titles_key TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                PRIMARY KEY (org_id, titles_key)
+            );
+            CREATE TABLE IF NOT EXISTS lookup_people (
+                org_id TEXT NOT NULL,
+                titles_key TEXT NOT NULL,
+                person_id TEXT NOT NULL,
+                PRIMARY KEY (org_id, titles_key, person_id)
+            );
+            CREATE TABLE IF NOT EXISTS person_keys (
+                key TEXT PRIMARY KEY,
+                person_id TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS people (
+                person_id TEXT PRIMARY KEY,
+                org_id TEXT NOT NULL,
+                record BLOB NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_people_org ON people(org_id);
+        """)
+        self._conn.commit()
+
+    def _resolve(self, table: str, id_column: str, keys: list) -> str:
+        """Canonical id for the first key already in the index. Caller holds the lock."""
+        for key in keys:
+            row = self._conn.execute(
+                f"SELECT {id_column} FROM {table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row:
+                return row[0]
+        return None
+
+    # ------------------- ORGANIZATIONS ------------------- #
+    def resolve_org(self, org: dict) -> str:
+        with self._lock:
+            return self._resolve('org_keys', 'org_id', org_keys(org))
+
+    def merge_orgs(self, organizations: list) -> list:
+        """Register organizations and return those not already returned in this run.
+
+        Each org is resolved to a canonical id (first-seen Apollo id) and any
+        new identity keys are linked to it.
+        """
+        unique = []
+        now = time.time()
+        with self._lock:
+            for org in organizations:
+                keys = org_keys(org)
+                if not keys:
+                    unique.append(org)
+                    continue
+                canonical = self._resolve('org_keys', 'org_id', keys) or org.get('id') or keys[0]
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO org_keys (key, org_id) VALUES (?, ?)",
+                    [(k, canonical) for k in keys]
+                )
+                self._conn.execute(
+                    "INSERT INTO orgs (org_id, first_seen, last_seen) VALUES (?, ?, ?) "
+                    "ON CONFLICT(org_id) DO UPDATE SET last_seen = excluded.last_seen",
+                    (canonical, now, now)
+                )
+                if canonical in self._run_seen:
+                    continue
+                self._run_seen.add(canonical)
+                unique.append(org)
+            self._conn.commit()
+        return unique
+
+    # ------------------- PEOPLE ------------------- #
+    def people_fetched(self, org: dict, job_titles: list = None) -> bool:
+        """Whether people for this org and title filter were fetched recently enough to reuse."""
+        with self._lock:
+            org_id = self._resolve('org_keys', 'org_id', org_keys(org))
+            if org_id is None:
+                return False
+            row = self._conn.execute(
+                "SELECT fetched_at FROM people_lookups WHERE org_id = ? AND titles_key = ?",
+                (org_id, titles_key(job_titles))
+            ).fetchone()
+        return bool(row and time.time() - row[0] <= self.people_max_age)
+
+    def stored_people(self, org: dict, job_titles: list = None) -> list:
+        """People an earlier lookup with the same title filter recorded for this org."""
+        with self._lock:
+            org_id = self._resolve('org_keys', 'org_id', org_keys(org))
+            rows = self._conn.execute(
+                "SELECT p.record FROM lookup_people l JOIN people p ON p.person_id = l.person_id "
+                "WHERE l.org_id = ? AND l.titles_key = ?", (org_id, titles_key(job_titles))
+            ).fetchall() if org_id else []
+            self.people_reused += 1
+        return [json.loads(zlib.decompress(r[0])) for r in rows]
+
+    def record_people(self, org: dict, people: list, job_titles: list = None) -> list:
+        """Store the people a lookup with ``job_titles`` returned and mark that lookup as done.
+
+        Returns the people de-duplicated against each other.
+        """
+        people = unique_by_keys(people, person_keys)
+        key = titles_key(job_titles)
+        now = time.time()
+        with self._lock:
+            keys = org_keys(org)
+            org_id = self._resolve('org_keys', 'org_id', keys) or org.get('id')
+            if org_id is None:
+                return people
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO org_keys (key, org_id) VALUES (?, ?)",
+                [(k, org_id) for k in keys]
+            )
+            self._conn.execute("DELETE FROM lookup_people WHERE org_id = ? AND titles_key = ?", (org_id, key))
+            for person in people:
+                p_keys = person_keys(person)
+                if not p_keys:
+                    continue
+                person_id = self._resolve('person_keys', 'person_id', p_keys) or person.get('id') or p_keys[0]
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO person_keys (key, person_id) VALUES (?, ?)",
+                    [(k, person_id) for k in p_keys]
+                )
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO people (person_id, org_id, record) VALUES (?, ?, ?)",
+                    (person_id, org_id, zlib.compress(json.dumps(person, separators=(',', ':')).encode('utf-8')))
+                )
+                self._conn.execute(
+                    "INSERT OR IGNORE INTO lookup_people (org_id, titles_key, person_id) VALUES (?, ?, ?)",
+                    (org_id, key, person_id)
+                )
+            self._conn.execute(
+                "INSERT OR IGNORE INTO orgs (org_id, first_seen, last_seen) VALUES (?, ?, ?)",
+                (org_id, now, now)
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO people_lookups (org_id, titles_key, fetched_at) VALUES (?, ?, ?)",
+                (org_id, key, now)
+            )
+            self._conn.commit()
+        return people
+
+    def expire_people(self, organizations: list):
+        """Forget that people were fetched for these orgs (any title filter) so the next lookup re-fetches them."""
+        with self._lock:
+            for org in organizations:
+                org_id = self._resolve('org_keys', 'org_id', org_keys(org))
+                if org_id:
+                    self._conn.execute("DELETE FROM people_lookups WHERE org_id = ?", (org_id,))
+            self._conn.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            orgs = self._conn.execute("SELECT COUNT(*) FROM orgs").fetchone()[0]
+            people = self._conn.execute("SELECT COUNT(*) FROM people").fetchone()[0]
+        return {'orgs': orgs, 'people': people, 'people_lookups_reused': self.people_reused}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,130 @@
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from records import GROWTH_COLUMNS
+
+
+DEFAULT_SNAPSHOT_PATH = '.cache/org_snapshots.sqlite'
+
+# Relative change in these counts that makes an org worth re-enriching
+SIZE_FIELDS = ['estimated_num_employees', 'organization_revenue']
+
+
+def org_snapshot(org: dict) -> dict:
+    """The slice of an organization record that delta refresh compares."""
+    snapshot = {f: org.get(f) for f in SIZE_FIELDS + GROWTH_COLUMNS}
+    snapshot['keywords'] = sorted({str(k).lower() for k in org.get('keywords') or []})
+    return snapshot
+
+
+@dataclass
+class OrgDelta:
+    """Organizations of a fresh crawl split against the stored snapshots."""
+    new: list = field(default_factory=list)
+    changed: list = field(default_factory=list)
+    unchanged: list = field(default_factory=list)
+
+    @property
+    def to_enrich(self) -> list:
+        return self.new + self.changed
+
+
+class SnapshotStore:
+    """Last-seen snapshot of every organization, for incremental refreshes.
+
+    A refresh compares freshly fetched orgs against their stored snapshot and
+    only orgs that are new or moved beyond a threshold need the (credit
+    consuming) people enrichment again.
+    """
+
+    def __init__(self, path: str = DEFAULT_SNAPSHOT_PATH, size_threshold: float = 0.1,
+                 growth_threshold: float = 0.05, keyword_threshold: float = 0.2):
+        """
+        Args:
+            path: SQLite file holding the snapshots
+            size_threshold: Relative change in employees / revenue that counts as changed
+            growth_threshold: Absolute change in a headcount growth rate that counts as changed
+            keyword_threshold: Jaccard distance between keyword sets that counts as changed
+        """
+        self.path = Path(path)
+        self.size_threshold = size_threshold
+        self.growth_threshold = growth_threshold
+        self.keyword_threshold = keyword_threshold
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS snapshots (
+                org_id TEXT PRIMARY KEY,
+                snapshot TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        """)
+        self._conn.commit()
+
+    def changed(self, old: dict, new: dict) -> bool:
+        """Whether ``new`` moved beyond the thresholds relative to ``old``."""
+        for f in SIZE_FIELDS:
+            before, after = old.get(f), new.get(f)
+            if before is None or after is None:
+                if before != after:
+                    return True
+                continue
+            if abs(after - before) > self.size_threshold * max(abs(before), 1):
+                return True
+        for f in GROWTH_COLUMNS:
+            before, after = old.get(f), new.get(f)
+            if before is None or after is None:
+                if before != after:
+                    return True
+                continue
+            if abs(after - before) > self.growth_threshold:
+                return True
+        before, after = set(old.get('keywords') or []), set(new.get('keywords') or [])
+        union = before | after
+        return bool(union) and 1 - len(before & after) / len(union) > self.keyword_threshold
+
+    def diff(self, organizations: list) -> OrgDelta:
+        """Split organizations into new / changed / unchanged vs. the stored snapshots."""
+        delta = OrgDelta()
+        ids = [org.get('id') for org in organizations if org.get('id')]
+        stored = {}
+        with self._lock:
+            # Stay below SQLite's bound-parameter limit
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                rows = self._conn.execute(
+                    f"SELECT org_id, snapshot FROM snapshots WHERE org_id IN ({','.join('?' * len(chunk))})",
+                    chunk
+                ).fetchall()
+                stored.update((org_id, json.loads(snapshot)) for org_id, snapshot in rows)
+
+        for org in organizations:
+            previous = stored.get(org.get('id'))
+            if previous is None:
+                delta.new.append(org)
+            elif self.changed(previous, org_snapshot(org)):
+                delta.changed.append(org)
+            else:
+                delta.unchanged.append(org)
+        return delta
+
+    def record(self, organizations: list):
+        """Store the current snapshot of each organization."""
+        now = time.time()
+        rows = [(org['id'], json.dumps(org_snapshot(org)), now) for org in organizations if org.get('id')]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO snapshots (org_id, snapshot, updated_at) VALUES (?, ?, ?)", rows
+            )
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,256 @@
+import hashlib
+import os
+import sqlite3
+import threading
+from pathlib import Path
+
+import numpy as np
+
+try:
+    from gpt4all import Embed4All
+except ImportError:  # optional: only needed for semantic ranking
+    Embed4All = None
+
+from icp_query import ICPQuery
+
+
+DEFAULT_INDEX_DIR = '.cache/embeddings'
+
+
+def profile_text(org) -> str:
+    """Text an organization is embedded from: name, industries, keywords and technologies."""
+    parts = [org.get('name') or '', org.get('industry') or '']
+    for field in ('industries', 'secondary_industries', 'keywords', 'technology_names'):
+        parts.append(', '.join(str(v) for v in org.get(field) or ()))
+    return '. '.join(p for p in parts if p)
+
+
+def icp_text(query: ICPQuery) -> str:
+    """Natural-language description of the ICP, embedded once per run."""
+    parts = [', '.join(query.industries), ', '.join(query.keywords), ', '.join(query.tech_stack)]
+    return '. '.join(p for p in parts if p)
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+class EmbeddingIndex:
+    """On-disk vector index of organization profile embeddings.
+
+    Vectors are L2-normalized float32 rows in a memory-mapped file, so cosine
+    similarity is a dot product and top-k over the whole universe is one
+    matrix-vector product. A SQLite table maps org id -> (row, content hash):
+    an org is only re-embedded when its profile text changes, and its row is
+    overwritten in place. New vectors are appended before their rows are
+    committed, and opening the index cuts the file back to the committed
+    rows, so a crash between the two cannot shift later rows.
+    """
+
+    def __init__(self, directory: str = DEFAULT_INDEX_DIR, embedder=None, batch_size: int = 64):
+        """
+        Args:
+            directory: Holds vectors.f32 and index.sqlite
+            embedder: Object with ``embed(list_of_texts) -> list_of_vectors``
+                      (default: gpt4all's Embed4All, CPU-only)
+            batch_size: Texts per embedder call
+        """
+        if embedder is None:
+            if Embed4All is None:
+                raise ValueError("Embedding index requires the 'gpt4all' package")
+            embedder = Embed4All()
+        self.embedder = embedder
+        self.batch_size = batch_size
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.vectors_path = self.directory / 'vectors.f32'
+        self._lock = threading.Lock()
+        self._matrix = None
+        self._icp_vectors = {}
+        self.embedded = 0
+
+        self._conn = sqlite3.connect(str(self.directory / 'index.sqlite'), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE IF NOT EXISTS rows (
+                org_id TEXT PRIMARY KEY,
+                row INTEGER NOT NULL,
+                content_hash TEXT NOT NULL,
+                name TEXT
+            );
+        """)
+        if 'name' not in {c[1] for c in self._conn.execute("PRAGMA table_info(rows)")}:
+            self._conn.execute("ALTER TABLE rows ADD COLUMN name TEXT")
+        self._conn.commit()
+        dim = self._conn.execute("SELECT value FROM meta WHERE key = 'dim'").fetchone()
+        self.dim = int(dim[0]) if dim else None
+        self._rows = {org_id: (row, digest) for org_id, row, digest
+                      in self._conn.execute("SELECT org_id, row, content_hash FROM rows")}
+        self._repair()
+
+    def __len__(self):
+        return len(self._rows)
+
+    def _repair(self):
+        """Make vectors.f32 hold exactly the committed rows after an interrupted add()."""
+        if self.dim is None:
+            return
+        row_bytes = self.dim * np.dtype(np.float32).itemsize
+        size = self.vectors_path.stat().st_size if self.vectors_path.exists() else 0
+        stored = size // row_bytes
+        if size > len(self._rows) * row_bytes:
+            # Vectors appended by an add() whose rows were never committed
+            with open(self.vectors_path, 'rb+') as f:
+                f.truncate(len(self._rows) * row_bytes)
+        elif stored < len(self._rows):
+            # Rows whose vectors never reached the disk; they are re-embedded on the next add()
+            lost = [org_id for org_id, (row, _) in self._rows.items() if row >= stored]
+            self._conn.executemany("DELETE FROM rows WHERE org_id = ?", [(o,) for o in lost])
+            self._conn.commit()
+            for org_id in lost:
+                del self._rows[org_id]
+            if size:
+                with open(self.vectors_path, 'rb+') as f:
+                    f.truncate(stored * row_bytes)
+
+    # ------------------- EMBEDDING ------------------- #
+    def embed(self, texts: list) -> np.ndarray:
+        """(len(texts), dim) L2-normalized float32 embeddings, batch_size texts per call."""
+        chunks = []
+        for start in range(0, len(texts), self.batch_size):
+            chunks.append(np.asarray(self.embedder.embed(texts[start:start + self.batch_size]), dtype=np.float32))
+        if not chunks:
+            return np.zeros((0, self.dim or 0), dtype=np.float32)
+        vectors = np.vstack(chunks)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms == 0, 1, norms)
+
+    def _set_dim(self, dim: int):
+        if self.dim is None:
+            self.dim = dim
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('dim', ?)", (str(dim),))
+        elif dim != self.dim:
+            raise ValueError(f"Embedder returns {dim}-d vectors but the index holds {self.dim}-d ones")
+
+    def matrix(self) -> np.ndarray:
+        """Read-only memmap of every stored vector (rows as in the id table)."""
+        if self._matrix is None and self._rows:
+            self._matrix = np.memmap(self.vectors_path, dtype=np.float32, mode='r',
+                                     shape=(len(self._rows), self.dim))
+        return self._matrix
+
+    def add(self, organizations: list) -> int:
+        """Embed orgs that are new or whose profile text changed; returns how many were embedded."""
+        pending = {}
+        for org in organizations:
+            org_id = org.get('id')
+            if not org_id:
+                continue
+            text = profile_text(org)
+            digest = content_hash(text)
+            stored = self._rows.get(org_id)
+            if stored is None or stored[1] != digest:
+                pending[org_id] = (text, digest, org.get('name'))
+        if not pending:
+            return 0
+
+        ids = list(pending)
+        vectors = self.embed([pending[i][0] for i in ids])
+        with self._lock:
+            self._set_dim(vectors.shape[1])
+            self._matrix = None
+            updates = [(i, v) for i, v in zip(ids, vectors) if i in self._rows]
+            if updates:
+                stored = np.memmap(self.vectors_path, dtype=np.float32, mode='r+', shape=(len(self._rows), self.dim))
+                for org_id, vector in updates:
+                    stored[self._rows[org_id][0]] = vector
+                stored.flush()
+                del stored
+            new = [(i, v) for i, v in zip(ids, vectors) if i not in self._rows]
+            if new:
+                with open(self.vectors_path, 'ab') as f:
+                    f.write(np.vstack([v for _, v in new]).astype(np.float32).tobytes())
+                    f.flush()
+                    os.fsync(f.fileno())
+            for org_id, _ in new:
+                self._rows[org_id] = (len(self._rows), None)
+            for org_id in ids:
+                self._rows[org_id] = (self._rows[org_id][0], pending[org_id][1])
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO rows (org_id, row, content_hash, name) VALUES (?, ?, ?, ?)",
+                [(i, self._rows[i][0], pending[i][1], pending[i][2]) for i in ids]
+            )
+            self._conn.commit()
+        self.embedded += len(ids)
+        return len(ids)
+
+    # ------------------- QUERIES ------------------- #
+    def similarity(self, vector: np.ndarray, org_ids: list) -> np.ndarray:
+        """Cosine similarity of ``vector`` to each org (NaN for orgs not in the index)."""
+        matrix = self.matrix()
+        out = np.full(len(org_ids), np.nan, dtype=np.float32)
+        rows = [(i, self._rows[o][0]) for i, o in enumerate(org_ids) if o in self._rows]
+        if rows and matrix is not None:
+            positions, indices = zip(*rows)
+            out[list(positions)] = matrix[list(indices)] @ vector
+        return out
+
+    def top_k(self, vector: np.ndarray, k: int = 10, exclude: set = None) -> list:
+        """(org_id, similarity) of the ``k`` stored orgs closest to ``vector``, best first."""
+        matrix = self.matrix()
+        if matrix is None or k <= 0:
+            return []
+        scores = np.asarray(matrix @ vector)
+        by_row = {row: org_id for org_id, (row, _) in self._rows.items()}
+        if exclude:
+            for org_id in exclude:
+                if org_id in self._rows:
+                    scores[self._rows[org_id][0]] = -np.inf
+        k = min(k, len(scores))
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best], kind='stable')]
+        return [(by_row[int(r)], float(scores[r])) for r in best if np.isfinite(scores[r])]
+
+    def lookalikes(self, org_ids: list, k: int = 10) -> list:
+        """Stored orgs most similar to the centroid of ``org_ids`` (e.g. closed-won accounts)."""
+        matrix = self.matrix()
+        rows = [self._rows[o][0] for o in org_ids if o in self._rows]
+        if matrix is None or not rows:
+            return []
+        centroid = np.asarray(matrix[rows]).mean(axis=0)
+        centroid /= np.linalg.norm(centroid) or 1
+        return self.top_k(centroid, k, exclude=set(org_ids))
+
+    def names(self, org_ids: list) -> dict:
+        """org id -> organization name as last embedded (orgs indexed by earlier runs too)."""
+        if not org_ids:
+            return {}
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT org_id, name FROM rows WHERE org_id IN ({','.join('?' * len(org_ids))})", list(org_ids)
+            ).fetchall()
+        return dict(rows)
+
+    def icp_vector(self, query: ICPQuery) -> np.ndarray:
+        """Embedding of the ICP description (computed once per query)."""
+        if query.fingerprint not in self._icp_vectors:
+            self._icp_vectors[query.fingerprint] = self.embed([icp_text(query)])[0]
+        return self._icp_vectors[query.fingerprint]
+
+    def rank(self, query: ICPQuery, organizations: list) -> list:
+        """Attach ``semantic_score`` (similarity to the ICP text) and sort best first."""
+        self.add(organizations)
+        vector = self.icp_vector(query)
+        scores = self.similarity(vector, [o.get('id') for o in organizations])
+        for org, score in zip(organizations, scores):
+            org['semantic_score'] = None if np.isnan(score) else round(float(score), 4)
+        return sorted(organizations, key=lambda o: o.get('semantic_score') or 0.0, reverse=True)
+
+    def stats(self) -> dict:
+        return {'vectors': len(self._rows), 'dim': self.dim, 'embedded_this_run': self.embedded}
+
+    def close(self):
+        with self._lock:
+            self._matrix = None
+            self._conn.close()
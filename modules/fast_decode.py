@@ -0,0 +1,14 @@
+import json
+
+try:
+    import orjson
+except ImportError:  # optional: falls back to the stdlib decoder
+    orjson = None
+
+
+def loads(raw):
+    """Decode a JSON document from bytes / str with orjson when installed."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
@@ -0,0 +1,254 @@
+import hashlib
+import json
+from dataclasses import dataclass
+from functools import lru_cache
+
+
+# Apollo's organization_num_employees_ranges buckets, smallest first
+EMPLOYEE_RANGES = (
+    '1,10', '11,20', '21,50', '51,100', '101,200', '201,500',
+    '501,1000', '1001,2000', '2001,5000', '5001,10000', '10001+'
+)
+
+# (largest employee_count_min, first bucket to request). Keeps the one
+# bucket below the minimum, since Apollo buckets straddle the ICP boundary.
+_EMPLOYEE_LADDER = ((10, 0), (20, 1), (50, 2), (100, 3), (200, 4), (500, 5))
+_EMPLOYEE_LADDER_DEFAULT = 6
+
+ORG_FUNDING_STAGES = ('seed', 'series_a', 'series_b', 'series_c', 'series_d', 'series_e', 'series_f')
+PEOPLE_FUNDING_STAGES = ('seed', 'series_a', 'series_b', 'series_c', 'series_d', 'series_e')
+
+# Country shorthands Apollo resolves to a country name (lower-cased)
+LOCATION_ALIASES = {'usa': 'united states', 'us': 'united states', 'u.s.': 'united states',
+                    'united states of america': 'united states'}
+
+# person_titles for the people search when hiring_data_roles is set
+DATA_ROLE_TITLES = (
+    'Chief Data Officer', 'VP of Data', 'Head of Data', 'Director of Data',
+    'Data Science Manager', 'VP of Analytics', 'Head of Analytics', 'Chief Analytics Officer'
+)
+
+# Titles looked up per organization during people enrichment
+ENRICHMENT_TITLES = (
+    'Chief Data Officer', 'VP of Data', 'Head of Data',
+    'Director of Data', 'VP of Analytics', 'Head of Analytics',
+    'Chief Analytics Officer', 'VP of Engineering', 'CTO'
+)
+
+
+def parse_revenue(val):
+    """Parse revenue strings such as '20M', '1.5B' or '750K' into an int."""
+    if not val:
+        return None
+    val = str(val).upper().replace(',', '').strip()
+    if 'B' in val:
+        return int(float(val.replace('B', '')) * 1_000_000_000)
+    elif 'M' in val:
+        return int(float(val.replace('M', '')) * 1_000_000)
+    elif 'K' in val:
+        return int(float(val.replace('K', '')) * 1_000)
+    return int(float(val))
+
+
+def normalize_geography(geo: str) -> str:
+    """Map ICP geography shorthands to Apollo location names."""
+    return 'United States' if geo.upper() in ['USA', 'US'] else geo
+
+
+def location_key(location) -> str:
+    """Comparable form of a location: lower-cased first component, country shorthands expanded."""
+    if not isinstance(location, str):
+        return None
+    key = location.split(',')[0].strip().lower()
+    return LOCATION_ALIASES.get(key, key)
+
+
+def employee_ranges_for(emp_min: int) -> tuple:
+    """Apollo employee buckets to request for an ICP employee_count_min."""
+    for limit, first in _EMPLOYEE_LADDER:
+        if emp_min <= limit:
+            return EMPLOYEE_RANGES[first:]
+    return EMPLOYEE_RANGES[_EMPLOYEE_LADDER_DEFAULT:]
+
+
+def _unique(values) -> tuple:
+    """De-duplicate while keeping first-seen order."""
+    return tuple(dict.fromkeys(values or ()))
+
+
+def _payload(items: tuple, **overrides) -> dict:
+    """Fresh, caller-owned payload dict from a frozen template."""
+    payload = {k: list(v) if isinstance(v, tuple) else v for k, v in items}
+    payload.update(overrides)
+    return payload
+
+
+@dataclass(frozen=True)
+class ICPQuery:
+    """Canonical, hashable form of an ICP config.
+
+    Compiled once per distinct YAML (see compile_icp). It produces the
+    Apollo organization and people payloads and the local filter predicate,
+    so equal ICPs share caches and dedup keys.
+    """
+    geography: tuple = ()
+    locations: tuple = ()
+    excluded_locations: tuple = ()  # set by QueryPlanner splits, not by YAML
+    employee_min: int = None
+    employee_ranges: tuple = ()
+    revenue_min: int = None
+    revenue_max: int = None
+    industries: tuple = ()
+    keywords: tuple = ()
+    tech_stack: tuple = ()
+    funding: bool = False
+    hiring_data_roles: bool = False
+
+    @classmethod
+    def from_config(cls, icp_config: dict) -> 'ICPQuery':
+        return compile_icp(icp_config)
+
+    @property
+    def keyword_tags(self) -> tuple:
+        """Industries and keywords combined, as sent in q_organization_keyword_tags."""
+        return _unique(self.industries + self.keywords)
+
+    @property
+    def location_keys(self) -> frozenset:
+        """location_key() of every requested location, matched against country, state or city."""
+        return frozenset(location_key(loc) for loc in self.locations)
+
+    @property
+    def enrichment_titles(self) -> list:
+        return list(ENRICHMENT_TITLES) if self.hiring_data_roles else []
+
+    @property
+    def fingerprint(self) -> str:
+        """Stable across processes (unlike hash()); safe for on-disk keys."""
+        return _fingerprint(self)
+
+    # ------------------- APOLLO PAYLOADS ------------------- #
+    def org_payload(self, page: int = 1, per_page: int = 25) -> dict:
+        """Apollo organizations/search payload."""
+        return _payload(_org_template(self), page=page, per_page=per_page)
+
+    def people_payload(self, page: int = 1, per_page: int = 25) -> dict:
+        """Apollo people/search payload."""
+        return _payload(_people_template(self), page=page, per_page=per_page)
+
+    def free_tier_payload(self, page: int = 1, per_page: int = 10) -> dict:
+        """organizations/search payload limited to filters on Apollo's free tier."""
+        items = []
+        if self.keyword_tags:
+            items.append(('q_organization_keyword_tags', self.keyword_tags))
+        if self.geography:
+            items.append(('organization_locations', self.geography))
+        return _payload(tuple(items), page=page, per_page=per_page)
+
+    # ------------------- LOCAL FILTER ------------------- #
+    def matches(self, org: dict, allow_unknown_revenue: bool = False) -> bool:
+        """Whether an Apollo organization satisfies every hard ICP constraint.
+
+        This is the per-record form of ICPScorer's vectorized constraints.
+        """
+        if self.revenue_min is not None or self.revenue_max is not None:
+            revenue = org.get('organization_revenue') or 0
+            if revenue <= 0:
+                if not allow_unknown_revenue:
+                    return False
+            elif not ((self.revenue_min or 0) <= revenue <= (self.revenue_max or float('inf'))):
+                return False
+        if self.employee_min is not None:
+            employees = org.get('estimated_num_employees')
+            if employees is None or employees < self.employee_min:
+                return False
+        if self.locations and not any(location_key(org.get(field)) in self.location_keys
+                                      for field in ('country', 'state', 'city')):
+            return False
+        return True
+
+
+@lru_cache(maxsize=None)
+def _org_template(query: ICPQuery) -> tuple:
+    items = []
+    # 1. GEOGRAPHY
+    if query.locations:
+        items.append(('organization_locations', query.locations))
+    if query.excluded_locations:
+        items.append(('organization_not_locations', query.excluded_locations))
+    # 2. EMPLOYEE COUNT
+    if query.employee_ranges:
+        items.append(('organization_num_employees_ranges', query.employee_ranges))
+    # 3. INDUSTRY + KEYWORDS
+    if query.keyword_tags:
+        items.append(('q_organization_keyword_tags', query.keyword_tags))
+    # 4. TECH STACK
+    if query.tech_stack:
+        items.append(('organization_technology_slugs', query.tech_stack))
+    # 5. FUNDING SIGNAL
+    if query.funding:
+        items.append(('funding_stage_list', ORG_FUNDING_STAGES))
+    # 6. REVENUE is not an Apollo search filter; it is enforced locally by
+    #    matches() / ICPScorer.
+    return tuple(items)
+
+
+@lru_cache(maxsize=None)
+def _people_template(query: ICPQuery) -> tuple:
+    items = []
+    if query.locations:
+        items.append(('person_locations', query.locations))
+    if query.employee_ranges:
+        items.append(('organization_num_employees_ranges', query.employee_ranges))
+    if query.keywords:
+        items.append(('q_keywords', ' '.join(query.keywords)))
+    if query.industries:
+        items.append(('organization_industry_keyword_tags', query.industries))
+    if query.tech_stack:
+        items.append(('organization_technology_slugs', query.tech_stack))
+    if query.hiring_data_roles:
+        items.append(('person_titles', DATA_ROLE_TITLES))
+    if query.funding:
+        items.append(('organization_latest_funding_stage_cd', PEOPLE_FUNDING_STAGES))
+    return tuple(items)
+
+
+@lru_cache(maxsize=None)
+def _fingerprint(query: ICPQuery) -> str:
+    canonical = json.dumps(
+        {k: v for k, v in query.__dict__.items()}, sort_keys=True, separators=(',', ':')
+    )
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:16]
+
+
+def compile_icp(icp_config: dict) -> ICPQuery:
+    """Compile (and memoize) an ICP YAML dict into an ICPQuery."""
+    return _compile(json.dumps(icp_config, sort_keys=True, default=str))
+
+
+@lru_cache(maxsize=1024)
+def _compile(config_json: str) -> ICPQuery:
+    icp_config = json.loads(config_json)
+    icp = icp_config.get('ICP', {}) or {}
+    signals = icp_config.get('Signals', {}) or {}
+
+    geography = _unique(icp.get('geography'))
+    emp_min = icp.get('employee_count_min')
+    revenue_min = revenue_max = None
+    if 'revenue_min' in icp or 'revenue_max' in icp:
+        revenue_min = parse_revenue(icp.get('revenue_min', '0'))
+        revenue_max = parse_revenue(icp.get('revenue_max', '10B'))
+
+    return ICPQuery(
+        geography=geography,
+        locations=_unique(normalize_geography(g) for g in geography),
+        employee_min=emp_min,
+        employee_ranges=employee_ranges_for(emp_min) if emp_min is not None else (),
+        revenue_min=revenue_min,
+        revenue_max=revenue_max,
+        industries=_unique(icp.get('industry')),
+        keywords=_unique(icp.get('keywords')),
+        tech_stack=_unique(signals.get('tech_stack')),
+        funding=bool(signals.get('funding')),
+        hiring_data_roles=bool(signals.get('hiring_data_roles')),
+    )
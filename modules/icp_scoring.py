@@ -0,0 +1,212 @@
+from itertools import chain
+
+import numpy as np
+import pandas as pd
+
+from icp_query import ICPQuery, location_key
+from keyword_matcher import KeywordMatcher
+from records import GROWTH_COLUMNS
+
+
+# Relative weight of each soft signal in the final ICP score (sums to 1)
+DEFAULT_WEIGHTS = {
+    'keywords': 0.5,
+    'industry': 0.2,
+    'growth': 0.3,
+    # organizations/search results carry no technology list; raise this when
+    # scoring enriched orgs that have technology_names
+    'tech': 0.0,
+}
+
+LOCATION_COLUMNS = ['country', 'state', 'city']
+
+
+class TagColumn:
+    """A list-of-strings column stored flat: one (row, vocabulary code) pair per tag.
+
+    Strings are factorized once at load time, so term matching runs once per
+    distinct tag and scoring works on integer arrays.
+    """
+
+    def __init__(self, rows: np.ndarray, codes: np.ndarray, vocabulary: np.ndarray, num_rows: int):
+        self.rows = rows
+        self.codes = codes
+        self.vocabulary = vocabulary
+        self.num_rows = num_rows
+
+    @classmethod
+    def from_lists(cls, lists: list) -> 'TagColumn':
+        lengths = np.fromiter(map(len, lists), dtype=np.int64, count=len(lists))
+        flat = np.fromiter(chain.from_iterable(lists), dtype=object, count=int(lengths.sum()))
+        codes, uniques = pd.factorize(flat)
+        vocabulary = np.array([str(v).lower() for v in uniques], dtype=object)
+        rows = np.repeat(np.arange(len(lists)), lengths)
+        return cls(rows, codes, vocabulary, len(lists))
+
+    def term_counts(self, matcher: KeywordMatcher) -> np.ndarray:
+        """(num_rows, num_terms) hits of each matcher term across each row's tags."""
+        counts = np.zeros((self.num_rows, len(matcher)), dtype=np.int32)
+        if not len(matcher) or not len(self.codes):
+            return counts
+        # One automaton pass per distinct tag, then gather per tag occurrence
+        vocab_hits = matcher.count_matrix(self.vocabulary)
+        tag_hit = vocab_hits.any(axis=1)[self.codes]
+        rows, codes = self.rows[tag_hit], self.codes[tag_hit]
+        for term in range(len(matcher)):
+            counts[:, term] = np.bincount(rows, weights=vocab_hits[codes, term], minlength=self.num_rows)
+        return counts
+
+    def overlap(self, matcher: KeywordMatcher) -> np.ndarray:
+        """Fraction of the matcher's terms found in each row's tags."""
+        if not len(matcher):
+            return np.zeros(self.num_rows)
+        return (self.term_counts(matcher) > 0).sum(axis=1) / len(matcher)
+
+
+class OrgColumns:
+    """Columnar view of a batch of organizations: scalar frame plus tag columns."""
+
+    def __init__(self, frame: pd.DataFrame, keywords: TagColumn, industries: TagColumn,
+                 technologies: TagColumn):
+        self.frame = frame
+        self.keywords = keywords
+        self.industries = industries
+        self.technologies = technologies
+
+
+class ICPScorer:
+    """Apply ICP constraints and weighted signals to organization results locally.
+
+    Apollo ignores revenue and only loosely applies keyword filters, so every
+    constraint is re-checked here as vectorized pandas/numpy operations over
+    a columnar frame of organizations.
+    """
+
+    def __init__(self, icp, weights: dict = None, allow_unknown_revenue: bool = False):
+        """
+        Args:
+            icp: Compiled ICPQuery, or a parsed ICP YAML dict (ICP / Signals sections)
+            weights: Override DEFAULT_WEIGHTS for the soft signals
+            allow_unknown_revenue: Let orgs without revenue data pass the revenue band
+        """
+        query = icp if isinstance(icp, ICPQuery) else ICPQuery.from_config(icp)
+        self.query = query
+        self.weights = dict(DEFAULT_WEIGHTS, **(weights or {}))
+        self.allow_unknown_revenue = allow_unknown_revenue
+
+        self.revenue_min = query.revenue_min
+        self.revenue_max = query.revenue_max
+        self.employee_min = query.employee_min
+        self.location_keys = query.location_keys
+        # Compiled once per scorer; matching is token-level and plural-insensitive
+        self.keyword_matcher = KeywordMatcher(query.keywords)
+        self.industry_matcher = KeywordMatcher(query.industries)
+        self.tech_matcher = KeywordMatcher(query.tech_stack)
+
+    def to_frame(self, organizations: list) -> 'OrgColumns':
+        """Load organization dicts into the columns used for scoring."""
+        frame = pd.DataFrame({
+            'id': [o.get('id') for o in organizations],
+            'name': [o.get('name') for o in organizations],
+            'organization_revenue': pd.to_numeric(
+                pd.Series([o.get('organization_revenue') for o in organizations], dtype=object),
+                errors='coerce'),
+            'estimated_num_employees': pd.to_numeric(
+                pd.Series([o.get('estimated_num_employees') for o in organizations], dtype=object),
+                errors='coerce'),
+            **{col: [o.get(col) for o in organizations] for col in LOCATION_COLUMNS},
+            **{
+                col: pd.to_numeric(pd.Series([o.get(col) for o in organizations], dtype=object),
+                                   errors='coerce')
+                for col in GROWTH_COLUMNS
+            },
+        })
+        keywords = TagColumn.from_lists([o.get('keywords') or [] for o in organizations])
+        industries = TagColumn.from_lists([
+            ([o['industry']] if o.get('industry') else []) + list(o.get('industries') or ())
+            + list(o.get('secondary_industries') or ())
+            for o in organizations
+        ])
+        technologies = TagColumn.from_lists([o.get('technology_names') or [] for o in organizations])
+        return OrgColumns(frame, keywords, industries, technologies)
+
+    def score(self, columns: 'OrgColumns') -> pd.DataFrame:
+        """Return the frame with ``icp_match`` (all hard constraints hold) and ``icp_score`` added."""
+        frame = columns.frame.copy()
+        revenue = frame['organization_revenue'].where(frame['organization_revenue'] > 0)
+        employees = frame['estimated_num_employees']
+
+        # Hard constraints
+        match = np.ones(len(frame), dtype=bool)
+        if self.revenue_min is not None or self.revenue_max is not None:
+            in_band = revenue.between(self.revenue_min or 0, self.revenue_max or np.inf).to_numpy(copy=True)
+            if self.allow_unknown_revenue:
+                in_band |= revenue.isna().to_numpy()
+            match &= in_band
+        if self.employee_min is not None:
+            match &= (employees >= self.employee_min).to_numpy()
+        if self.location_keys:
+            # Apollo's organization_locations accepts countries, states and cities
+            located = np.zeros(len(frame), dtype=bool)
+            for col in LOCATION_COLUMNS:
+                located |= frame[col].map(location_key).isin(self.location_keys).to_numpy()
+            match &= located
+
+        # Weighted signals, each scaled to [0, 1]
+        keyword_hits = columns.keywords.term_counts(self.keyword_matcher)
+        keyword_score = ((keyword_hits > 0).sum(axis=1) / len(self.keyword_matcher)
+                         if len(self.keyword_matcher) else np.zeros(len(frame)))
+        industry_score = np.maximum(
+            columns.industries.overlap(self.industry_matcher),
+            columns.keywords.overlap(self.industry_matcher),
+        )
+        tech_score = columns.technologies.overlap(self.tech_matcher)
+        growth_score = (
+            frame[GROWTH_COLUMNS].mean(axis=1, skipna=True).fillna(0).clip(0, 1).to_numpy()
+        )
+
+        frame['keyword_hits'] = keyword_hits.sum(axis=1)
+        frame['keyword_score'] = keyword_score
+        frame['industry_score'] = industry_score
+        frame['growth_score'] = growth_score
+        frame['tech_score'] = tech_score
+        frame['icp_match'] = match
+        frame['icp_score'] = (
+            self.weights['keywords'] * keyword_score
+            + self.weights['industry'] * industry_score
+            + self.weights['growth'] * growth_score
+            + self.weights['tech'] * tech_score
+        )
+        return frame
+
+    def term_hits(self, columns: 'OrgColumns') -> pd.DataFrame:
+        """Per-term hit counts for each org: one column per ICP keyword, industry and technology."""
+        parts = {}
+        for prefix, column, matcher in (('keyword', columns.keywords, self.keyword_matcher),
+                                        ('industry', columns.industries, self.industry_matcher),
+                                        ('tech', columns.technologies, self.tech_matcher)):
+            counts = column.term_counts(matcher)
+            for i, term in enumerate(matcher.terms):
+                parts[f"{prefix}:{term}"] = counts[:, i]
+        return pd.DataFrame(parts, index=columns.frame.index)
+
+    def rank(self, organizations: list, only_matches: bool = True) -> list:
+        """Return organizations ordered by ICP score, with ``icp_score`` attached.
+
+        Args:
+            organizations: Raw Apollo organization dicts
+            only_matches: Drop orgs that fail any hard ICP constraint
+        """
+        if not organizations:
+            return []
+        scored = self.score(self.to_frame(organizations))
+        if only_matches:
+            scored = scored[scored['icp_match']]
+        scored = scored.sort_values('icp_score', ascending=False, kind='stable')
+
+        ranked = []
+        for idx, score in zip(scored.index, scored['icp_score'].to_numpy()):
+            org = organizations[idx]
+            org['icp_score'] = round(float(score), 4)
+            ranked.append(org)
+        return ranked
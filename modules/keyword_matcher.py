@@ -0,0 +1,103 @@
+import re
+from collections import deque
+
+import numpy as np
+
+
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#]*")
+
+# Words whose trailing 's' is not a plural
+_NOT_PLURAL = ('ss', 'us', 'is', 'os')
+
+
+def normalize_token(token: str) -> str:
+    """Singularize a lowercase token with light suffix rules (companies -> company)."""
+    if len(token) > 4 and token.endswith('ies'):
+        return token[:-3] + 'y'
+    if len(token) > 3 and token.endswith('s') and not token.endswith(_NOT_PLURAL):
+        return token[:-1]
+    return token
+
+
+def tokenize(text: str) -> list:
+    """Lowercased, singularized word tokens of ``text``."""
+    return [normalize_token(t) for t in _TOKEN.findall(str(text).lower())]
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton over word tokens for a fixed set of ICP terms.
+
+    Terms and text are tokenized the same way (case-folded, plurals
+    stripped), so "Machine Learning" matches "machine-learning platforms".
+    Matches are whole-token: "ai" does not fire inside "retail". Scanning is
+    linear in the number of text tokens however many terms there are.
+    """
+
+    def __init__(self, terms: list):
+        """
+        Args:
+            terms: ICP keywords / industries / technologies; duplicates after
+                   normalization count as one term
+        """
+        self.terms = []
+        seen = {}
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+
+        for term in terms:
+            tokens = tuple(tokenize(term))
+            if not tokens or tokens in seen:
+                continue
+            seen[tokens] = len(self.terms)
+            self.terms.append(term)
+            node = 0
+            for token in tokens:
+                nxt = self._goto[node].get(token)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][token] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                node = nxt
+            self._out[node] = self._out[node] + (seen[tokens],)
+
+        # Breadth-first failure links; each node inherits its fallback's outputs
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for token, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and token not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(token, 0)
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def __len__(self):
+        return len(self.terms)
+
+    def counts(self, text: str) -> list:
+        """Hits per term (in ``self.terms`` order) in one text."""
+        hits = [0] * len(self.terms)
+        node = 0
+        goto, fail, out = self._goto, self._fail, self._out
+        for token in tokenize(text):
+            while node and token not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(token, 0)
+            for term in out[node]:
+                hits[term] += 1
+        return hits
+
+    def count_matrix(self, texts) -> np.ndarray:
+        """(len(texts), num_terms) hit counts, one automaton pass per text."""
+        matrix = np.zeros((len(texts), len(self.terms)), dtype=np.int32)
+        if not self.terms:
+            return matrix
+        for i, text in enumerate(texts):
+            hits = self.counts(text)
+            if any(hits):
+                matrix[i] = hits
+        return matrix
@@ -0,0 +1,238 @@
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from openai import OpenAI
+except ImportError:  # optional: only needed for the OpenAI-compatible backend
+    OpenAI = None
+
+try:
+    from gpt4all import GPT4All
+except ImportError:  # optional: only needed for the local gpt4all backend
+    GPT4All = None
+
+from icp_query import ICPQuery
+
+
+DEFAULT_OPENAI_MODEL = 'gpt-4o-mini'
+DEFAULT_GPT4ALL_MODEL = 'Meta-Llama-3-8B-Instruct.Q4_0.gguf'
+
+# Completions are deterministic (temperature 0), so cached verdicts stay valid for a month
+LLM_CACHE_TTL = 30 * 24 * 3600
+
+SYSTEM_PROMPT = """You qualify B2B sales prospects against an ideal customer profile (ICP).
+
+ICP:
+{icp}
+
+For every numbered record you are given, decide whether it fits the ICP.
+Reply with ONLY a JSON array, one object per record, in the same order:
+[{{"i": 1, "qualified": true, "score": 0-100, "reason": "<= 15 words"}}, ...]"""
+
+
+def icp_description(query: ICPQuery) -> str:
+    lines = [
+        f"Industries: {', '.join(query.industries) or 'any'}",
+        f"Keywords: {', '.join(query.keywords) or 'any'}",
+        f"Locations: {', '.join(query.locations) or 'any'}",
+        f"Minimum employees: {query.employee_min or 'any'}",
+    ]
+    if query.revenue_min or query.revenue_max:
+        lines.append(f"Revenue: {query.revenue_min or 0} - {query.revenue_max or 'no max'}")
+    if query.tech_stack:
+        lines.append(f"Technologies: {', '.join(query.tech_stack)}")
+    if query.funding:
+        lines.append("Must have raised funding")
+    return '\n'.join(lines)
+
+
+def record_text(record) -> str:
+    """One-line summary of an organization or person, the unit that is cached and deduplicated."""
+    if record.get('title') is not None or record.get('organization_context') is not None:
+        org = record.get('organization_context') or {}
+        return (f"Person: {record.get('title') or 'unknown title'} ({record.get('seniority') or 'n/a'}) "
+                f"at {org.get('name', 'unknown')} | {org.get('industry') or 'n/a'} | {org.get('employees') or '?'} employees")
+    keywords = ', '.join(list(record.get('keywords') or ())[:15])
+    tech = ', '.join(list(record.get('technology_names') or ())[:10])
+    return (f"Organization: {record.get('name', 'unknown')} | {record.get('industry') or 'n/a'} | "
+            f"{record.get('estimated_num_employees') or '?'} employees | revenue {record.get('organization_revenue') or '?'} | "
+            f"{record.get('country') or 'n/a'} | keywords: {keywords or 'n/a'} | tech: {tech or 'n/a'}")
+
+
+def parse_verdicts(text: str, count: int) -> list:
+    """Verdict dicts by record position from a completion; None where the model gave nothing usable."""
+    verdicts = [None] * count
+    start, end = text.find('['), text.rfind(']')
+    if start < 0 or end <= start:
+        return verdicts
+    try:
+        items = json.loads(text[start:end + 1])
+    except json.JSONDecodeError:
+        return verdicts
+    for pos, item in enumerate(items if isinstance(items, list) else []):
+        if not isinstance(item, dict):
+            continue
+        i = item.get('i', pos + 1)
+        if isinstance(i, int) and 1 <= i <= count:
+            verdicts[i - 1] = {
+                'qualified': bool(item.get('qualified')),
+                'score': item.get('score'),
+                'reason': str(item.get('reason') or '')[:200],
+            }
+    return verdicts
+
+
+class OpenAIBackend:
+    """Chat completions from OpenAI or any OpenAI-compatible server (vLLM, llama.cpp, Ollama)."""
+
+    def __init__(self, model: str = DEFAULT_OPENAI_MODEL, base_url: str = None, api_key: str = None):
+        if OpenAI is None:
+            raise ValueError("The OpenAI backend requires the 'openai' package")
+        self.model = model
+        # Local stand-ins usually ignore the key, but the client insists on one
+        api_key = api_key or os.getenv('OPENAI_API_KEY') or ('not-needed' if base_url else None)
+        self.client = OpenAI(api_key=api_key, base_url=base_url)
+
+    def complete(self, system: str, prompt: str) -> str:
+        response = self.client.chat.completions.create(
+            model=self.model, temperature=0,
+            messages=[{'role': 'system', 'content': system}, {'role': 'user', 'content': prompt}],
+        )
+        return response.choices[0].message.content or ''
+
+
+class GPT4AllBackend:
+    """Local gpt4all model; generation is serialized since one model instance is not thread-safe."""
+
+    def __init__(self, model: str = DEFAULT_GPT4ALL_MODEL, max_tokens: int = 2048):
+        if GPT4All is None:
+            raise ValueError("The gpt4all backend requires the 'gpt4all' package")
+        self.model = model
+        self.max_tokens = max_tokens
+        self._llm = GPT4All(model)
+        self._lock = threading.Lock()
+
+    def complete(self, system: str, prompt: str) -> str:
+        with self._lock, self._llm.chat_session(system_prompt=system):
+            return self._llm.generate(prompt, max_tokens=self.max_tokens, temp=0)
+
+
+class LLMQualifier:
+    """Qualify organizations or people against the ICP with batched LLM prompts.
+
+    Identical records (same summary text) are sent once, ``batch_size``
+    records share one prompt, and batches run on a bounded thread pool.
+    Each record's verdict is cached in the ResponseCache under
+    ``llm/<model>`` keyed by the ICP prompt and the record text, so a re-run
+    only pays for records that are new or changed.
+    """
+
+    def __init__(self, backend, icp_query: ICPQuery, cache=None, batch_size: int = 20, max_workers: int = 4):
+        """
+        Args:
+            backend: OpenAIBackend / GPT4AllBackend (anything with complete(system, prompt))
+            icp_query: ICP the records are judged against
+            cache: Shared ResponseCache (verdicts are not cached if None)
+            batch_size: Records per prompt
+            max_workers: Concurrent prompts
+        """
+        self.backend = backend
+        self.system = SYSTEM_PROMPT.format(icp=icp_description(icp_query))
+        self.cache = cache
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.endpoint = f"llm/{backend.model}"
+        if cache is not None:
+            cache.ttls.setdefault(self.endpoint, LLM_CACHE_TTL)
+        self.stats = {'records': 0, 'unique': 0, 'cached': 0, 'prompts': 0, 'failed': 0}
+
+    def _params(self, text: str) -> dict:
+        return {'system': self.system, 'record': text}
+
+    def _run_batch(self, texts: list) -> list:
+        prompt = '\n'.join(f"{i}. {text}" for i, text in enumerate(texts, 1))
+        try:
+            completion = self.backend.complete(self.system, prompt)
+        except Exception as e:
+            print(f"⚠️ LLM batch of {len(texts)} failed: {e}")
+            return [None] * len(texts)
+        return parse_verdicts(completion, len(texts))
+
+    def qualify(self, records: list) -> list:
+        """Verdict dict (``qualified``, ``score``, ``reason``) per record, or None if it could not be judged."""
+        texts = [record_text(r) for r in records]
+        verdicts = {}
+        pending = []
+        for text in dict.fromkeys(texts):
+            cached = self.cache.get(self.endpoint, self._params(text)) if self.cache else None
+            if cached is not None:
+                verdicts[text] = json.loads(cached)
+            else:
+                pending.append(text)
+        self.stats['records'] += len(texts)
+        self.stats['unique'] += len(verdicts) + len(pending)
+        self.stats['cached'] += len(verdicts)
+
+        batches = [pending[i:i + self.batch_size] for i in range(0, len(pending), self.batch_size)]
+        if batches:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                for batch, results in zip(batches, pool.map(self._run_batch, batches)):
+                    self.stats['prompts'] += 1
+                    for text, verdict in zip(batch, results):
+                        if verdict is None:
+                            self.stats['failed'] += 1
+                            continue
+                        verdicts[text] = verdict
+                        if self.cache:
+                            self.cache.put(self.endpoint, self._params(text), json.dumps(verdict).encode('utf-8'))
+        return [verdicts.get(text) for text in texts]
+
+    def annotate(self, records: list) -> list:
+        """Set ``llm_qualified`` / ``llm_score`` / ``llm_reason`` on each judged record.
+
+        Records the LLM could not judge are left untouched (``llm_qualified``
+        stays unset); rejected records score 0.
+        """
+        for record, verdict in zip(records, self.qualify(records)):
+            if verdict is None:
+                continue
+            score = verdict.get('score')
+            record['llm_qualified'] = verdict['qualified']
+            record['llm_score'] = float(score) if verdict['qualified'] and isinstance(score, (int, float)) \
+                else (100.0 if verdict['qualified'] else 0.0)
+            record['llm_reason'] = verdict['reason']
+        return records
+
+
+def keep_qualified(records: list) -> tuple:
+    """(records the LLM did not reject, how many of those it could not judge)."""
+    kept = [r for r in records if r.get('llm_qualified') is not False]
+    return kept, sum(1 for r in kept if r.get('llm_qualified') is None)
+
+
+def backend_from_args(args):
+    """Backend chosen by --llm-backend / --llm-model / --llm-base-url."""
+    if args.llm_backend == 'gpt4all':
+        return GPT4AllBackend(args.llm_model or DEFAULT_GPT4ALL_MODEL)
+    return OpenAIBackend(args.llm_model or DEFAULT_OPENAI_MODEL,
+                         base_url=args.llm_base_url or os.getenv('OPENAI_BASE_URL'))
+
+
+def add_llm_arguments(parser):
+    """Add the shared --qualify switches to an ArgumentParser."""
+    parser.add_argument('--qualify', action='store_true',
+                        help='Qualify matched organizations with an LLM before enrichment')
+    parser.add_argument('--qualify-people', action='store_true',
+                        help='Qualify the people found with an LLM as well')
+    parser.add_argument('--qualified-only', action='store_true',
+                        help='With --qualify / --qualify-people, drop records the LLM rejected '
+                             '(records it could not judge are kept)')
+    parser.add_argument('--llm-backend', choices=('openai', 'gpt4all'), default='openai',
+                        help='OpenAI-compatible server or a local gpt4all model')
+    parser.add_argument('--llm-model', default=None, help='Model name (backend default if omitted)')
+    parser.add_argument('--llm-base-url', default=None,
+                        help='OpenAI-compatible endpoint, e.g. http://localhost:8000/v1 (default: $OPENAI_BASE_URL)')
+    parser.add_argument('--llm-batch', type=int, default=20, help='Records per prompt')
+    parser.add_argument('--llm-workers', type=int, default=4, help='Concurrent prompts')
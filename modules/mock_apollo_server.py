@@ -0,0 +1,274 @@
+import argparse
+import copy
+import gzip
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from icp_query import location_key
+
+
+DEFAULT_SEED_PATH = 'apollo_organizations_results.json'
+
+
+@dataclass
+class MockApolloConfig:
+    """Behaviour of the local Apollo stand-in."""
+    seed_path: str = DEFAULT_SEED_PATH
+    num_orgs: int = 2000
+    people_per_org: int = 5
+    latency: float = 0.05           # mean seconds added to every response
+    latency_jitter: float = 0.5     # +/- fraction of latency
+    error_rate: float = 0.0         # probability of a 500 on any request
+    forbid_people: bool = False     # mixed_people/search answers 403 (free plan)
+    forbid_contacts: bool = False   # contacts/search answers 403 as well
+    rate_limit_per_minute: int = 0  # 0 disables 429s
+    max_pages: int = 500            # Apollo's pagination ceiling
+    random_seed: int = 7
+
+
+class MockApolloData:
+    """Synthetic organizations and people cloned from a real search response."""
+
+    def __init__(self, config: MockApolloConfig):
+        self.config = config
+        rng = random.Random(config.random_seed)
+        seed_path = Path(config.seed_path)
+        if seed_path.exists():
+            with open(seed_path, 'r', encoding='utf-8') as f:
+                seeds = json.load(f).get('organizations', [])
+        else:
+            seeds = []
+        if not seeds:
+            seeds = [{'name': 'Seed Org', 'keywords': ['software'], 'country': 'United States'}]
+
+        self.organizations = []
+        for i in range(config.num_orgs):
+            org = copy.deepcopy(seeds[i % len(seeds)])
+            org['id'] = f"mock{i:08x}"
+            org['name'] = f"{org.get('name', 'Org')} #{i}"
+            org['primary_domain'] = f"org{i}.example.com"
+            org['website_url'] = f"http://www.org{i}.example.com"
+            org['linkedin_uid'] = str(100000 + i)
+            org['estimated_num_employees'] = int(rng.lognormvariate(5, 1.6)) + 1
+            org['organization_revenue'] = float(org['estimated_num_employees'] * rng.randint(50_000, 400_000))
+            self.organizations.append(org)
+        self.by_id = {org['id']: org for org in self.organizations}
+
+    def search_organizations(self, payload: dict) -> list:
+        orgs = self.organizations
+        ranges = payload.get('organization_num_employees_ranges')
+        if ranges:
+            bounds = [_parse_range(r) for r in ranges]
+            orgs = [o for o in orgs
+                    if any(lo <= o['estimated_num_employees'] <= hi for lo, hi in bounds)]
+        locations = payload.get('organization_locations')
+        if locations:
+            wanted = {location_key(loc) for loc in locations}
+            orgs = [o for o in orgs if _org_location_keys(o) & wanted]
+        excluded = payload.get('organization_not_locations')
+        if excluded:
+            unwanted = {location_key(loc) for loc in excluded}
+            orgs = [o for o in orgs if not _org_location_keys(o) & unwanted]
+        return orgs
+
+    def people_for(self, org_id: str) -> list:
+        org = self.by_id.get(org_id)
+        if org is None:
+            return []
+        titles = ['CTO', 'VP of Data', 'Head of Analytics', 'Chief Data Officer', 'VP of Engineering']
+        return [
+            {
+                'id': f"{org_id}-p{j}",
+                'name': f"Person {j} at {org['name']}",
+                'title': titles[j % len(titles)],
+                'organization_id': org_id,
+                'organization_name': org['name'],
+                'linkedin_url': f"http://www.linkedin.com/in/{org_id}-p{j}",
+                'email': f"person{j}@{org['primary_domain']}",
+            }
+            for j in range(self.config.people_per_org)
+        ]
+
+
+def _org_location_keys(org: dict) -> set:
+    return {location_key(org.get(field)) for field in ('country', 'state', 'city')} - {None}
+
+
+def _parse_range(value: str) -> tuple:
+    if value.endswith('+'):
+        return int(value[:-1]), float('inf')
+    lo, hi = value.split(',')
+    return int(lo), int(hi)
+
+
+def _paginate(items: list, payload: dict, max_pages: int) -> tuple:
+    per_page = int(payload.get('per_page', 25) or 25)
+    page = int(payload.get('page', 1) or 1)
+    total_pages = min(max((len(items) + per_page - 1) // per_page, 1), max_pages)
+    start = (page - 1) * per_page
+    chunk = items[start:start + per_page] if page <= total_pages else []
+    pagination = {
+        'page': page,
+        'per_page': per_page,
+        'total_entries': len(items),
+        'total_pages': total_pages,
+    }
+    return chunk, pagination
+
+
+def make_handler(data: MockApolloData, config: MockApolloConfig):
+    rng = random.Random(config.random_seed)
+    rng_lock = threading.Lock()
+    window = {'start': time.monotonic(), 'count': 0}
+    window_lock = threading.Lock()
+
+    class MockApolloHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        disable_nagle_algorithm = True
+
+        def log_message(self, *args):
+            pass
+
+        def _send_json(self, status: int, body: dict, headers: dict = None):
+            raw = json.dumps(body).encode('utf-8')
+            if 'gzip' in (self.headers.get('Accept-Encoding') or ''):
+                raw = gzip.compress(raw, 5)
+                headers = dict(headers or {}, **{'Content-Encoding': 'gzip'})
+            # Status line, headers and body go out in one write: a separate
+            # body write after the headers would stall on Nagle's algorithm.
+            lines = [f"{self.protocol_version} {status} {self.responses[status][0]}",
+                     f"Server: {self.version_string()}",
+                     f"Date: {self.date_time_string()}",
+                     'Content-Type: application/json',
+                     f"Content-Length: {len(raw)}"]
+            lines.extend(f"{name}: {value}" for name, value in (headers or {}).items())
+            self.log_request(status, len(raw))
+            self.wfile.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + raw)
+
+        def _rate_limit_headers(self) -> tuple:
+            """Return (allowed, headers) for the fixed one-minute window."""
+            limit = config.rate_limit_per_minute
+            if not limit:
+                return True, {}
+            with window_lock:
+                now = time.monotonic()
+                if now - window['start'] >= 60:
+                    window['start'], window['count'] = now, 0
+                window['count'] += 1
+                used = window['count']
+                reset_in = 60 - (now - window['start'])
+            headers = {
+                'x-rate-limit-minute': limit,
+                'x-minute-usage': min(used, limit),
+                'x-minute-requests-left': max(limit - used, 0),
+            }
+            if used > limit:
+                headers['Retry-After'] = max(int(reset_in) + 1, 1)
+                return False, headers
+            return True, headers
+
+        def _simulate_network(self) -> bool:
+            """Sleep for the configured latency; return False to inject a 500."""
+            with rng_lock:
+                jitter = rng.uniform(-config.latency_jitter, config.latency_jitter)
+                fail = rng.random() < config.error_rate
+            time.sleep(max(config.latency * (1 + jitter), 0))
+            return not fail
+
+        def _endpoint(self) -> str:
+            path = self.path.split('?', 1)[0]
+            return path.split('/v1/', 1)[-1].strip('/')
+
+        def do_GET(self):
+            if self._endpoint() == 'auth/health':
+                self._send_json(200, {'healthy': True, 'is_logged_in': True})
+            else:
+                self._send_json(404, {'error': 'not found'})
+
+        def do_POST(self):
+            length = int(self.headers.get('Content-Length') or 0)
+            payload = json.loads(self.rfile.read(length) or b'{}')
+            endpoint = self._endpoint()
+
+            allowed, headers = self._rate_limit_headers()
+            if not self._simulate_network():
+                self._send_json(500, {'error': 'injected failure'}, headers)
+                return
+            if not allowed:
+                self._send_json(429, {'error': 'rate limited'}, headers)
+                return
+
+            if endpoint == 'organizations/search':
+                orgs, pagination = _paginate(data.search_organizations(payload), payload, config.max_pages)
+                self._send_json(200, {'organizations': orgs, 'pagination': pagination}, headers)
+            elif endpoint in ('mixed_people/search', 'contacts/search'):
+                if endpoint == 'mixed_people/search' and config.forbid_people:
+                    self._send_json(403, {'error': 'api/v1/mixed_people/search is not accessible with this api_key on a free plan'}, headers)
+                    return
+                if endpoint == 'contacts/search' and config.forbid_contacts:
+                    self._send_json(403, {'error': 'api/v1/contacts/search is not accessible with this api_key'}, headers)
+                    return
+                people = []
+                for org_id in payload.get('organization_ids') or []:
+                    people.extend(data.people_for(org_id))
+                chunk, pagination = _paginate(people, payload, config.max_pages)
+                key = 'people' if endpoint == 'mixed_people/search' else 'contacts'
+                self._send_json(200, {key: chunk, 'pagination': pagination}, headers)
+            elif endpoint == 'people/search':
+                people = [p for org in data.organizations[:200] for p in data.people_for(org['id'])]
+                chunk, pagination = _paginate(people, payload, config.max_pages)
+                self._send_json(200, {'people': chunk, 'pagination': pagination}, headers)
+            else:
+                self._send_json(404, {'error': f'unknown endpoint {endpoint}'}, headers)
+
+    return MockApolloHandler
+
+
+def start_mock_server(config: MockApolloConfig = None, host: str = '127.0.0.1', port: int = 0):
+    """Start the mock in a background thread; returns (server, base_url)."""
+    config = config or MockApolloConfig()
+    data = MockApolloData(config)
+    server = ThreadingHTTPServer((host, port), make_handler(data, config))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_port}/v1"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the Apollo API")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--seed', default=DEFAULT_SEED_PATH, help='Organization search result to clone')
+    parser.add_argument('--orgs', type=int, default=2000)
+    parser.add_argument('--people-per-org', type=int, default=5)
+    parser.add_argument('--latency', type=float, default=0.05, help='Mean response latency (s)')
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--forbid-people', action='store_true', help='403 on mixed_people/search')
+    parser.add_argument('--forbid-contacts', action='store_true', help='403 on contacts/search')
+    parser.add_argument('--rate-limit', type=int, default=0, help='Requests per minute before 429s')
+    parser.add_argument('--max-pages', type=int, default=500)
+    args = parser.parse_args()
+
+    config = MockApolloConfig(
+        seed_path=args.seed, num_orgs=args.orgs, people_per_org=args.people_per_org,
+        latency=args.latency, error_rate=args.error_rate, forbid_people=args.forbid_people,
+        forbid_contacts=args.forbid_contacts,
+        rate_limit_per_minute=args.rate_limit, max_pages=args.max_pages
+    )
+    server, base_url = start_mock_server(config, args.host, args.port)
+    print(f"🧪 Mock Apollo API listening on {base_url} ({config.num_orgs} orgs)")
+    print("   Point clients at it with APOLLO_BASE_URL or ApolloClient(base_url=...)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,29 @@
 import os
-import requests
+import argparse
 import json
+import asyncio
 import time
+from concurrent.futures import ThreadPoolExecutor
 from input_handler import InputHandler
+from apollo_client import ApolloClient
+from rate_limiter import RateLimiter
+from icp_query import ICPQuery
+from icp_scoring import ICPScorer
+from crawl_journal import CrawlInterrupted, CrawlJournal, DEFAULT_JOURNAL_PATH
+from query_planner import search_partitioned
+from streaming_ranker import search_top_k
+from pipeline import parse_workers, run_pipeline
+from budget_planner import BudgetPlanner
+from delta_refresh import SnapshotStore, DEFAULT_SNAPSHOT_PATH
+from embedding_index import EmbeddingIndex, DEFAULT_INDEX_DIR as DEFAULT_EMBEDDINGS_DIR
+from llm_qualifier import LLMQualifier, add_llm_arguments, backend_from_args, keep_qualified
+from dedup_index import DedupIndex, DEFAULT_INDEX_PATH, person_keys, unique_by_keys
+from fast_decode import loads
+from prospect_store import ProspectStore, DEFAULT_STORE_NAME
+from records import Organization, Person, organization_context
+from title_normalizer import TitleNormalizer, DEFAULT_MODEL
+from result_sink import JSONLSink, add_output_arguments, sink_from_args
+from response_cache import ResponseCache, add_cache_arguments, cache_from_args
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -12,105 +33,48 @@ load_dotenv()
 class ApolloDataRetriever:
     """Retrieve data from Apollo API based on ICP configuration."""
     
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, client: ApolloClient = None, pool_size: int = 10,
+                 project: bool = False):
+        """
+        Args:
+            api_key: Apollo API key
+            client: Shared ApolloClient (a new pooled one is created if omitted)
+            pool_size: Connection pool size for a newly created client
+            project: Keep only the org / person fields the pipeline uses (the
+                     records.py slots) in returned results; streamed output,
+                     the journal and the dedup index always get full payloads
+        """
         self.api_key = api_key
-        self.headers = {
-            'Content-Type': 'application/json',
-            'Cache-Control': 'no-cache',
-            'X-Api-Key': api_key
-        }
-
-    def transform_org_config(self, icp_config: dict) -> dict:
-        """Transform ICP config to Apollo Organizations API format."""
-        icp = icp_config.get('ICP', {})
-        signals = icp_config.get('Signals', {})
+        # One pooled keep-alive client shared by every endpoint call
+        self.client = client or ApolloClient(api_key, pool_size=pool_size)
+        self.keep_raw = not project
+        # Org ids whose people lookup failed or was skipped in the last enrichment run
+        self.failed_org_ids = set()
 
-        apollo_params = {
-            'page': 1,
-            'per_page': 25
-        }
-
-        # 1. Map GEOGRAPHY
-        if 'geography' in icp:
-            locations = []
-            for geo in icp['geography']:
-                if geo.upper() in ['USA', 'US']:
-                    locations.append('United States')
-                else:
-                    locations.append(geo)
-            apollo_params['organization_locations'] = locations
-
-        # 2. Map EMPLOYEE COUNT
-        if 'employee_count_min' in icp:
-            emp_min = icp['employee_count_min']
-            ranges = []
-            if emp_min <= 10:
-                ranges = ['1,10', '11,20', '21,50', '51,100', '101,200', '201,500', '501,1000', '1001,2000', '2001,5000', '5001,10000', '10001+']
-            elif emp_min <= 20:
-                ranges = ['11,20', '21,50', '51,100', '101,200', '201,500', '501,1000', '1001,2000', '2001,5000', '5001,10000', '10001+']
-            elif emp_min <= 50:
-                ranges = ['21,50', '51,100', '101,200', '201,500', '501,1000', '1001,2000', '2001,5000', '5001,10000', '10001+']
-            elif emp_min <= 100:
-                ranges = ['51,100', '101,200', '201,500', '501,1000', '1001,2000', '2001,5000', '5001,10000', '10001+']
-            elif emp_min <= 200:
-                ranges = ['101,200', '201,500', '501,1000', '1001,2000', '2001,5000', '5001,10000', '10001+']
-            elif emp_min <= 500:
-                ranges = ['201,500', '501,1000', '1001,2000', '2001,5000', '5001,10000', '10001+']
-            else:
-                ranges = ['501,1000', '1001,2000', '2001,5000', '5001,10000', '10001+']
-            apollo_params['organization_num_employees_ranges'] = ranges
-
-        # 3. Map INDUSTRY + KEYWORDS
-        keyword_tags = []
-        if 'industry' in icp:
-            keyword_tags.extend(icp['industry'])
-        if 'keywords' in icp:
-            keyword_tags.extend(icp['keywords'])
-        if keyword_tags:
-            apollo_params['q_organization_keyword_tags'] = keyword_tags
-
-        # 4. Map TECH STACK
-        if 'tech_stack' in signals and signals['tech_stack']:
-            apollo_params['organization_technology_slugs'] = signals['tech_stack']
-
-        # 5. Map FUNDING SIGNAL
-        if signals.get('funding'):
-            apollo_params['funding_stage_list'] = [
-                'seed', 'series_a', 'series_b', 'series_c', 'series_d', 'series_e', 'series_f'
-            ]
-
-        # 6. Map REVENUE
-        if 'revenue_min' in icp or 'revenue_max' in icp:
-            rev_min = icp.get('revenue_min', '0')
-            rev_max = icp.get('revenue_max', '10B')
-
-            def parse_revenue(val):
-                if not val:
-                    return None
-                val = str(val).upper().replace(',', '').strip()
-                if 'B' in val:
-                    return int(float(val.replace('B', '')) * 1_000_000_000)
-                elif 'M' in val:
-                    return int(float(val.replace('M', '')) * 1_000_000)
-                elif 'K' in val:
-                    return int(float(val.replace('K', '')) * 1_000)
-                return int(float(val))
-
-            min_revenue = parse_revenue(rev_min)
-            max_revenue = parse_revenue(rev_max)
-
-            apollo_params['_revenue_min'] = min_revenue
-            apollo_params['_revenue_max'] = max_revenue
-
-        return apollo_params
+    def transform_org_config(self, icp_config) -> dict:
+        """Transform ICP config (YAML dict or compiled ICPQuery) to Apollo Organizations API format."""
+        query = icp_config if isinstance(icp_config, ICPQuery) else ICPQuery.from_config(icp_config)
+        return query.org_payload()
 
     # ------------------- STEP 1: ORGANIZATION SEARCH ------------------- #
-    def search_organizations(self, icp_config: dict, max_pages: int = 2) -> dict:
-        """Search organizations using Apollo API with pagination."""
-        url = "https://api.apollo.io/v1/organizations/search"
-
-        apollo_params = self.transform_org_config(icp_config)
-
+    def search_organizations(self, icp_config: dict, max_pages=2, concurrency: int = 5,
+                             sink: JSONLSink = None, journal: CrawlJournal = None,
+                             dedup: DedupIndex = None, deadline: float = None,
+                             keep_raw: bool = None) -> dict:
+        """Search organizations using Apollo API with pagination.
+
+        ``max_pages`` is a page count or "all"; pages after the first are
+        prefetched concurrently (see iter_organization_pages). Each page is
+        appended to ``sink`` as soon as it arrives. With a ``dedup`` index,
+        organizations already returned in this run (by id, domain or
+        LinkedIn uid) are dropped. No further pages are read once the
+        time.monotonic() ``deadline`` passes. The result's ``complete`` flag
+        is False when the crawl stopped early.
+
+        Full payloads go to ``sink``; the returned organizations are compact
+        Organization records (with the payload too when ``keep_raw``, which
+        defaults to the retriever's setting).
+        """
         print(f"\n{'='*70}")
         print("🔍 STEP 1: SEARCHING ORGANIZATIONS")
         print(f"{'='*70}")
@@ -125,116 +89,247 @@ class ApolloDataRetriever:
         print(f"  • Tech Stack: {signals.get('tech_stack', [])}")
         print(f"  • Funding: {signals.get('funding', False)}")
 
+        keep_raw = self.keep_raw if keep_raw is None else keep_raw
         all_orgs = []
-        page = 1
-
-        while page <= max_pages:
-            apollo_params['page'] = page
-            print(f"\nFetching page {page}...")
-            try:
-                response = requests.post(url, headers=self.headers, json=apollo_params, timeout=30)
-
-                if response.status_code != 200:
-                    print(f"\n❌ API Response Status: {response.status_code}")
-                    print(f"Response Body: {response.text}")
-                    break
-
-                data = response.json()
-                orgs = data.get('organizations', [])
-                all_orgs.extend(orgs)
-                pagination = data.get('pagination', {})
-                total_pages = pagination.get('total_pages', 1)
-
-                print(f"  ✓ Found {len(orgs)} organizations on this page")
-
-                if page >= total_pages or page >= max_pages:
+        complete = True
+        try:
+            for page, orgs in self.iter_organization_pages(icp_config, max_pages, concurrency, journal):
+                found = len(orgs)
+                if dedup:
+                    orgs = dedup.merge_orgs(orgs)
+                if sink:
+                    sink.write_many(orgs)
+                all_orgs.extend(Organization.from_api(o, keep_raw) for o in orgs)
+                duplicates = f" ({found - len(orgs)} duplicates)" if found != len(orgs) else ""
+                print(f"  ✓ Page {page}: found {found} organizations{duplicates}")
+                if deadline is not None and time.monotonic() >= deadline:
+                    complete = False
+                    print("\n⏰ Time budget spent; stopping the organization crawl")
                     break
-
-                page += 1
-                time.sleep(1)
-
-            except Exception as e:
-                print(f"Error: {e}")
-                break
+        except CrawlInterrupted as e:
+            complete = False
+            print(f"\n❌ Crawl stopped at {e}")
+            if journal:
+                print("   Completed pages are journaled; rerun with --resume to continue.")
 
         return {
             'organizations': all_orgs,
-            'pagination': {'total_entries': len(all_orgs)}
+            'pagination': {'total_entries': len(all_orgs)},
+            'complete': complete
         }
 
+    def iter_organization_pages(self, icp_config, max_pages=2, concurrency: int = 5,
+                                journal: CrawlJournal = None):
+        """Yield (page, organizations) in page order for an ICP dict or ICPQuery.
+
+        Page 1 is fetched first to learn ``total_pages``; the remaining pages
+        are then fetched in parallel (paced by the client's rate limiter) and
+        streamed back in order as soon as each one is ready. With a
+        ``journal``, each page is recorded the moment it completes and pages
+        recorded by an earlier run are replayed instead of re-fetched.
+        Raises CrawlInterrupted at the first page that fails.
+        """
+        apollo_params = self.transform_org_config(icp_config)
+        crawl_key = ResponseCache.key('organizations/search', dict(apollo_params, page=None))
+        done = journal.completed_pages(crawl_key) if journal else {}
+        if done:
+            print(f"\n♻️  Resuming: {len(done)} pages already journaled")
+
+        def fetch(page: int):
+            if page in done:
+                return done[page]
+            data = self._fetch_org_page(apollo_params, page)
+            orgs = data.get('organizations', [])
+            total_pages = data.get('pagination', {}).get('total_pages', 1) or 1
+            if journal:
+                journal.record_page(crawl_key, page, orgs, total_pages)
+            return orgs, total_pages
+
+        print("\nFetching page 1...")
+        try:
+            orgs, total_pages = fetch(1)
+        except Exception as e:
+            raise CrawlInterrupted(f"page 1: {e}") from e
+
+        last_page = total_pages if max_pages == 'all' else min(int(max_pages), total_pages)
+        yield 1, orgs
+        if last_page < 2:
+            return
+
+        print(f"Prefetching pages 2-{last_page} of {total_pages} ({concurrency} at a time)...")
+        executor = ThreadPoolExecutor(max_workers=concurrency)
+        futures = [executor.submit(fetch, page) for page in range(2, last_page + 1)]
+        try:
+            for page, future in enumerate(futures, 2):
+                try:
+                    orgs, _ = future.result()
+                except Exception as e:
+                    raise CrawlInterrupted(f"page {page}: {e}") from e
+                yield page, orgs
+        finally:
+            # Pages already in flight still finish (and get journaled)
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=True)
+
+    def _fetch_org_page(self, apollo_params: dict, page: int) -> dict:
+        """Fetch one organizations/search page, raising on a non-200 response."""
+        params = dict(apollo_params, page=page)
+        response = self.client.post('organizations/search', params, timeout=30)
+        if response.status_code != 200:
+            raise RuntimeError(f"API Response Status: {response.status_code} | Response Body: {response.text}")
+        return loads(response.content)
+
     # ------------------- STEP 2: PEOPLE ENRICHMENT ------------------- #
     def get_people_from_organization(self, org_id: str, org_name: str, job_titles: list = None) -> list:
         """Get people from a specific organization using mixed_people/search."""
-        url = "https://api.apollo.io/v1/mixed_people/search"
-        params = {'organization_ids': [org_id], 'page': 1, 'per_page': 10}
-        if job_titles:
-            params['person_titles'] = job_titles
-
         try:
-            response = requests.post(url, headers=self.headers, json=params, timeout=30)
-            if response.status_code == 200:
-                return response.json().get('people', [])
-            elif response.status_code == 403:
-                return self.get_people_alternative(org_id, org_name, job_titles)
-            else:
-                print(f"⚠️  Could not fetch people for {org_name}: {response.status_code}")
-                return []
+            return self._fetch_people(org_id, org_name, job_titles)
         except Exception as e:
             print(f"⚠️  Error fetching people for {org_name}: {e}")
             return []
 
+    def _fetch_people(self, org_id: str, org_name: str, job_titles: list = None) -> list:
+        """mixed_people/search lookup (403 -> contacts/search), raising on failure."""
+        endpoint = 'mixed_people/search'
+        params = {'organization_ids': [org_id], 'page': 1, 'per_page': 10}
+        if job_titles:
+            params['person_titles'] = job_titles
+
+        response = self.client.post(endpoint, params, timeout=30)
+        if response.status_code == 200:
+            return loads(response.content).get('people', [])
+        elif response.status_code == 403:
+            return self.get_people_alternative(org_id, org_name, job_titles)
+        raise RuntimeError(f"API Response Status: {response.status_code}")
+
     def get_people_alternative(self, org_id: str, org_name: str, job_titles: list = None) -> list:
-        """Alternative method using contacts/search endpoint."""
-        url = "https://api.apollo.io/v1/contacts/search"
+        """Alternative method using contacts/search endpoint, raising on failure.
+
+        Raising (instead of returning no people) keeps a failed fallback out of
+        the crawl journal and the dedup index, so the org is retried later.
+        """
+        endpoint = 'contacts/search'
         params = {'organization_ids': [org_id], 'page': 1, 'per_page': 10}
         if job_titles:
             params['titles'] = job_titles
-        try:
-            response = requests.post(url, headers=self.headers, json=params, timeout=30)
-            if response.status_code == 200:
-                return response.json().get('contacts', [])
-            return []
-        except Exception:
-            return []
-
-    def enrich_people_from_organizations(self, organizations: list, icp_config: dict) -> list:
-        """Extract people from organizations - STEP 2."""
-        signals = icp_config.get('Signals', {})
-        job_titles = []
-        if signals.get('hiring_data_roles'):
-            job_titles = [
-                'Chief Data Officer', 'VP of Data', 'Head of Data',
-                'Director of Data', 'VP of Analytics', 'Head of Analytics',
-                'Chief Analytics Officer', 'VP of Engineering', 'CTO'
-            ]
+        response = self.client.post(endpoint, params, timeout=30)
+        if response.status_code == 200:
+            return loads(response.content).get('contacts', [])
+        raise RuntimeError(f"contacts/search fallback failed: API Response Status: {response.status_code}")
+
+    def enrich_people_from_organizations(self, organizations: list, icp_config: dict,
+                                         concurrency: int = 10, sink: JSONLSink = None,
+                                         journal: CrawlJournal = None, dedup: DedupIndex = None,
+                                         max_lookups: int = None, deadline: float = None) -> list:
+        """Extract people from organizations - STEP 2.
+
+        Runs up to ``concurrency`` organization lookups at once; see
+        enrich_people_async for use from inside a running event loop.
+        """
+        return asyncio.run(self.enrich_people_async(organizations, icp_config, concurrency, sink,
+                                                    journal, dedup, max_lookups, deadline))
+
+    async def enrich_people_async(self, organizations: list, icp_config: dict,
+                                  concurrency: int = 10, sink: JSONLSink = None,
+                                  journal: CrawlJournal = None, dedup: DedupIndex = None,
+                                  max_lookups: int = None, deadline: float = None) -> list:
+        """Concurrently extract people from organizations, keeping input order.
+
+        People are appended to ``sink`` per organization as lookups complete,
+        and each person (by id or LinkedIn URL) is returned only once.
+        With a ``journal``, each finished org is recorded and orgs finished
+        by an earlier run are replayed without an API call. With a ``dedup``
+        index, orgs whose people any earlier run already fetched are served
+        from the index instead of spending a people-search credit.
+        ``max_lookups`` and the time.monotonic() ``deadline`` are hard
+        budgets: orgs that would exceed them are skipped, in input order.
+        """
+        job_titles = ICPQuery.from_config(icp_config).enrichment_titles
 
         print(f"\n{'='*70}")
         print("🔍 STEP 2: EXTRACTING PEOPLE FROM ORGANIZATIONS")
         print(f"{'='*70}")
         if job_titles:
             print(f"Target Titles: {', '.join(job_titles[:3])}...")
-
-        all_people = []
-        for i, org in enumerate(organizations[:10], 1):
+        print(f"Organizations: {len(organizations)} | Concurrency: {concurrency}")
+
+        crawl_key = ResponseCache.key('people-enrichment', {'person_titles': job_titles})
+        done = journal.completed_orgs(crawl_key) if journal else {}
+        if done:
+            print(f"♻️  Resuming: {len(done)} organizations already journaled")
+        failed = []
+        skipped = []
+        lookups = 0
+        seen_people = set()
+
+        def lookup(org: dict, org_id: str, org_name: str) -> list:
+            people = self._fetch_people(org_id, org_name, job_titles)
+            if dedup:
+                people = dedup.record_people(org, people, job_titles)
+            if journal:
+                journal.record_org(crawl_key, org_id, people)
+            return people
+
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def enrich_one(i: int, org: dict, executor: ThreadPoolExecutor) -> list:
+            nonlocal lookups
             org_id = org.get('id')
             org_name = org.get('name', 'Unknown')
-            print(f"{i}. Fetching people from: {org_name}")
-
-            people = self.get_people_from_organization(org_id, org_name, job_titles)
+            if org_id in done:
+                people = done[org_id]
+            elif dedup and dedup.people_fetched(org, job_titles):
+                people = dedup.stored_people(org, job_titles)
+            else:
+                async with semaphore:
+                    # Budget checks run on the event loop thread, in input order
+                    if ((max_lookups is not None and lookups >= max_lookups)
+                            or (deadline is not None and time.monotonic() >= deadline)):
+                        skipped.append(org_id)
+                        return []
+                    lookups += 1
+                    # The blocking lookup (including its 403 -> contacts/search
+                    # fallback) runs on the shared pooled client in a worker thread.
+                    try:
+                        people = await loop.run_in_executor(executor, lookup, org, org_id, org_name)
+                    except Exception as e:
+                        failed.append(org_id)
+                        print(f"{i}. {org_name}: ⚠️  Error fetching people: {e}")
+                        return []
+            # Runs on the event loop thread, so the shared seen-set needs no lock
+            people = unique_by_keys(people, person_keys, seen_people)
             if people:
+                # One context dict per org, shared by all of its people
+                context = organization_context(org)
                 for person in people:
-                    person['organization_context'] = {
-                        'id': org_id,
-                        'name': org_name,
-                        'industry': org.get('industry'),
-                        'employees': org.get('estimated_num_employees'),
-                        'website': org.get('website_url')
-                    }
-                all_people.extend(people)
-                print(f"  ✓ Found {len(people)} people")
+                    person['organization_context'] = context
+                if sink:
+                    sink.write_many(people)
+                people = [Person.from_api(p, context, self.keep_raw) for p in people]
+                print(f"{i}. {org_name}: ✓ Found {len(people)} people")
             else:
-                print(f"  ⚠️  No people found")
-            time.sleep(0.5)
+                print(f"{i}. {org_name}: ⚠️  No people found")
+            return people
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results = await asyncio.gather(
+                *(enrich_one(i, org, executor) for i, org in enumerate(organizations, 1))
+            )
+
+        if dedup and dedup.people_reused:
+            print(f"\n♻️  {dedup.people_reused} organizations served from the dedup index (no credits spent)")
+        self.failed_org_ids = set(failed) | set(skipped)
+        if skipped:
+            print(f"\n💳 {len(skipped)} organizations skipped: credit or time budget reached")
+        if failed:
+            print(f"\n⚠️  {len(failed)} organizations failed"
+                  + ("; rerun with --resume to retry only those." if journal else "."))
+
+        all_people = []
+        for people in results:
+            all_people.extend(people)
         return all_people
 
     # ------------------- DISPLAY FUNCTIONS ------------------- #
@@ -250,6 +345,12 @@ class ApolloDataRetriever:
             print(f"   Industry: {org.get('industry', 'N/A')}")
             print(f"   Employees: {org.get('estimated_num_employees', 'N/A')}")
             print(f"   Location: {org.get('city', 'N/A')}, {org.get('state', 'N/A')}")
+            if 'icp_score' in org:
+                print(f"   ICP Score: {org['icp_score']:.2f}")
+            if 'semantic_score' in org:
+                print(f"   Semantic Similarity: {org['semantic_score']:.2f}")
+            if 'llm_reason' in org:
+                print(f"   LLM: {org.get('llm_score', 0):.0f} - {org['llm_reason']}")
             print(f"   Website: {org.get('website_url', 'N/A')}\n")
 
     def display_people_results(self, people: list):
@@ -262,30 +363,272 @@ class ApolloDataRetriever:
         print(f"{'='*70}\n")
         for i, p in enumerate(people[:10], 1):
             print(f"{i}. 👤 {p.get('name', 'N/A')} | {p.get('title', 'N/A')} | {p.get('organization_context', {}).get('name', 'N/A')}")
+            if p.get('seniority_class') or p.get('function_class'):
+                print(f"   Class: {p.get('seniority_class') or 'N/A'} / {p.get('function_class') or 'N/A'}")
+            if 'llm_reason' in p:
+                print(f"   LLM: {p.get('llm_score', 0):.0f} - {p['llm_reason']}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="ICP-based Apollo search (2-step workflow)")
+    parser.add_argument('--config', default='data/icp_config.yaml', help='ICP YAML config')
+    parser.add_argument('--max-pages', default='2', help='Organization pages to fetch, or "all"')
+    parser.add_argument('--full-payload', action='store_true',
+                        help='Keep every Apollo field in in-memory results too (streamed JSONL, journal and '
+                             'dedup index always get full payloads)')
+    parser.add_argument('--split', action='store_true',
+                        help="Fetch every result, splitting queries that exceed Apollo's pagination ceiling "
+                             "(ignores --max-pages)")
+    add_cache_arguments(parser)
+    add_output_arguments(parser)
+    parser.add_argument('--store', default=None,
+                        help=f'SQLite prospect store results are upserted into (default: <output-dir>/{DEFAULT_STORE_NAME})')
+    parser.add_argument('--no-store', action='store_true', help='Do not write to the prospect store')
+    parser.add_argument('--resume', action='store_true',
+                        help='Skip pages and organizations completed by an earlier (interrupted) run')
+    parser.add_argument('--journal', default=DEFAULT_JOURNAL_PATH, help='SQLite crawl progress journal')
+    parser.add_argument('--dedup-index', default=DEFAULT_INDEX_PATH,
+                        help='SQLite identity index shared across runs')
+    parser.add_argument('--no-dedup', action='store_true',
+                        help='Disable the cross-run identity index (always re-fetch people)')
+    parser.add_argument('--delta', action='store_true',
+                        help='Only enrich organizations that are new or changed since the last snapshot '
+                             '(organization pages bypass the response cache)')
+    parser.add_argument('--snapshots', default=DEFAULT_SNAPSHOT_PATH, help='SQLite org snapshot store')
+    parser.add_argument('--max-credits', type=int, default=None,
+                        help='Hard cap on credits spent on people lookups (top ICP scores first; '
+                             'with --pipeline, in crawl order)')
+    parser.add_argument('--max-seconds', type=float, default=None, help='Hard cap on run wall time')
+    parser.add_argument('--top-k', type=int, default=None,
+                        help='Keep only the K best-scoring organizations while crawling and enrich them '
+                             'as they take the lead (combine with --max-pages all)')
+    parser.add_argument('--pipeline', action='store_true',
+                        help='Overlap the organization crawl with people enrichment in a staged, '
+                             'bounded-queue pipeline')
+    parser.add_argument('--stage-workers', nargs='*', metavar='STAGE=N',
+                        help='Pipeline worker counts, e.g. fetch=10 parse=2 score=1 people=10 sink=1')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='Estimate calls, credits and time from page 1, then exit')
+    parser.add_argument('--change-threshold', type=float, default=0.1,
+                        help='Relative employee / revenue change that triggers re-enrichment')
+    parser.add_argument('--semantic', action='store_true',
+                        help='Re-rank matches by embedding similarity to the ICP and list lookalikes (needs gpt4all)')
+    parser.add_argument('--embeddings', default=DEFAULT_EMBEDDINGS_DIR, help='Embedding index directory')
+    add_llm_arguments(parser)
+    parser.add_argument('--classify-titles', action='store_true',
+                        help='Tag people with seniority / function classes from their titles (needs spaCy)')
+    parser.add_argument('--nlp-model', default=DEFAULT_MODEL, help='spaCy pipeline for --classify-titles')
+    parser.add_argument('--nlp-processes', type=int, default=1, help='spaCy worker processes')
+    args = parser.parse_args()
+    validate_args(parser, args)
+    return args
+
+
+# Post-crawl steps that only the default (crawl, then enrich) flow runs
+STREAMING_EXCLUSIVE = ('split', 'delta', 'semantic', 'qualify', 'qualify_people', 'classify_titles')
+
+
+def validate_args(parser, args):
+    """Reject switches --pipeline / --top-k would silently ignore."""
+    modes = [flag for flag, on in (('--pipeline', args.pipeline), ('--top-k', args.top_k)) if on]
+    if len(modes) > 1:
+        parser.error("--pipeline and --top-k cannot be combined")
+    if modes:
+        ignored = ['--' + name.replace('_', '-') for name in STREAMING_EXCLUSIVE if getattr(args, name)]
+        if ignored:
+            parser.error(f"{modes[0]} does not support {', '.join(ignored)}")
 
 
 def main():
+    args = parse_args()
     api_key = os.getenv('APOLLO_API_KEY')
-    if not api_key:
+    if not api_key and not args.cache_only:
         print("❌ Error: Set APOLLO_API_KEY in .env file")
         return
 
-    config_file = 'data/icp_config.yaml'
+    config_file = args.config
     handler = InputHandler(config_file, file_type='yaml')
     icp_config = handler.read()
 
     print("\n🎯 ICP-BASED APOLLO SEARCH (2-STEP WORKFLOW)")
-    apollo = ApolloDataRetriever(api_key)
+    concurrency = int(os.getenv('APOLLO_CONCURRENCY', 10))
+    # Starting rate only; the limiter re-tunes itself from Apollo's rate-limit headers
+    rate_limiter = RateLimiter(requests_per_minute=float(os.getenv('APOLLO_REQUESTS_PER_MINUTE', 50)))
+    cache = cache_from_args(args)
+    if cache and args.delta and cache.mode == 'normal':
+        # A cached page would hide exactly the changes a delta run looks for
+        cache.refresh('organizations/search')
+    client = ApolloClient(api_key, pool_size=max(concurrency, int(os.getenv('APOLLO_POOL_SIZE', 10))),
+                          rate_limiter=rate_limiter, cache=cache)
+    apollo = ApolloDataRetriever(api_key, client=client, project=not args.full_payload)
+    journal = CrawlJournal(args.journal, resume=args.resume)
+    dedup = None if args.no_dedup else DedupIndex(args.dedup_index)
+
+    max_pages = args.max_pages if args.max_pages == 'all' else int(args.max_pages)
+    budget = BudgetPlanner(apollo, requests_per_minute=rate_limiter.default_rate * 60, concurrency=concurrency,
+                           max_credits=args.max_credits, max_seconds=args.max_seconds)
+    if args.dry_run or args.max_credits is not None or args.max_seconds is not None:
+        try:
+            budget.display(budget.estimate(icp_config, max_pages, split=args.split))
+        except Exception as e:
+            # The budgets are still enforced during the run; only the projection is missing
+            print(f"\n⚠️ Budget estimate unavailable: {e}")
+        if args.dry_run:
+            print("\n🧪 Dry run: no people endpoints were called.")
+            return
+    store = None if args.no_store else ProspectStore(args.store or os.path.join(args.output_dir, DEFAULT_STORE_NAME))
+
+    if args.pipeline:
+        if budget.max_lookups is not None:
+            print(f"💳 Pipeline mode spends the {budget.max_lookups}-lookup budget in crawl order, "
+                  "not by ICP score")
+        with sink_from_args(args, 'apollo_organizations') as org_sink, \
+                sink_from_args(args, 'apollo_people') as people_sink:
+            result = run_pipeline(apollo, icp_config, max_pages=max_pages,
+                                  workers=dict({'fetch': concurrency, 'people': concurrency},
+                                               **parse_workers(args.stage_workers)),
+                                  sink=org_sink, people_sink=people_sink, journal=journal, dedup=dedup,
+                                  max_lookups=budget.max_lookups, deadline=budget.deadline)
+        apollo.display_org_results({'organizations': result['organizations']})
+        apollo.display_people_results(result['people'])
+        if store:
+            store.upsert_orgs(result['organizations'], tech_filter=ICPQuery.from_config(icp_config).tech_stack)
+            store.upsert_people(result['people'])
+        print(f"✅ {org_sink.count} organizations and {people_sink.count} people streamed to {args.output_dir}")
+        display_run_summary(apollo, cache, dedup, store)
+        return
 
-    org_results = apollo.search_organizations(icp_config)
-    apollo.display_org_results(org_results)
+    if args.top_k:
+        with sink_from_args(args, 'apollo_organizations') as org_sink, \
+                sink_from_args(args, 'apollo_people') as people_sink:
+            result = search_top_k(apollo, icp_config, k=args.top_k, max_pages=max_pages, concurrency=concurrency,
+                                  sink=org_sink, people_sink=people_sink, journal=journal, dedup=dedup,
+                                  max_lookups=budget.max_lookups, deadline=budget.deadline)
+        print(f"\n🎯 Kept the top {len(result['organizations'])} of {result['matched']} matching organizations")
+        apollo.display_org_results({'organizations': result['organizations']})
+        apollo.display_people_results(result['people'])
+        if store:
+            store.upsert_orgs(result['organizations'], tech_filter=ICPQuery.from_config(icp_config).tech_stack)
+            store.upsert_people(result['people'])
+        print(f"✅ {org_sink.count} organizations and {people_sink.count} people streamed to {args.output_dir}")
+        display_run_summary(apollo, cache, dedup, store)
+        return
 
-    organizations = org_results.get('organizations', [])
-    if organizations:
-        people = apollo.enrich_people_from_organizations(organizations, icp_config)
+    with sink_from_args(args, 'apollo_organizations') as org_sink:
+        if args.split:
+            org_results = search_partitioned(apollo, icp_config, concurrency=concurrency, journal=journal,
+                                             dedup=dedup, sink=org_sink, deadline=budget.deadline)
+        else:
+            org_results = apollo.search_organizations(icp_config, max_pages=max_pages, sink=org_sink,
+                                                       journal=journal, dedup=dedup, deadline=budget.deadline)
+    print(f"✅ {org_sink.count} organizations streamed to {org_sink.path}")
+
+    # Apollo does not enforce the full ICP; filter and rank locally
+    fetched = org_results.get('organizations', [])
+    organizations = ICPScorer(ICPQuery.from_config(icp_config)).rank(fetched)
+    print(f"\n🎯 {len(organizations)} of {len(fetched)} organizations match every ICP constraint")
+    embeddings = None
+    # Semantic ranking only changes what is displayed; credits still go by ICP score
+    display_order = organizations
+    if args.semantic:
+        try:
+            embeddings = EmbeddingIndex(args.embeddings)
+            # Index everything fetched so later lookalike queries can reach non-matches too
+            embeddings.add(fetched)
+            display_order = embeddings.rank(ICPQuery.from_config(icp_config), organizations)
+        except Exception as e:
+            print(f"⚠️ Semantic ranking skipped: {e}")
+            embeddings = None
+    qualifier = None
+    if args.qualify or args.qualify_people:
+        try:
+            qualifier = LLMQualifier(backend_from_args(args), ICPQuery.from_config(icp_config), cache=cache,
+                                     batch_size=args.llm_batch, max_workers=args.llm_workers)
+        except Exception as e:
+            print(f"⚠️ LLM qualification skipped: {e}")
+    if qualifier and args.qualify and organizations:
+        organizations = qualify_records(qualifier, organizations, 'organizations', args.qualified_only)
+    kept = {id(o) for o in organizations}
+    apollo.display_org_results({'organizations': [o for o in display_order if id(o) in kept]})
+    if embeddings:
+        matched = {o.get('id') for o in organizations}
+        lookalikes = embeddings.top_k(embeddings.icp_vector(ICPQuery.from_config(icp_config)), k=10, exclude=matched)
+        if lookalikes:
+            names = embeddings.names([org_id for org_id, _ in lookalikes])
+            print("🧭 Closest indexed organizations outside this ICP match:")
+            for org_id, similarity in lookalikes:
+                print(f"   • {names.get(org_id) or org_id} ({similarity:.2f})")
+    if store:
+        store.upsert_orgs(fetched, tech_filter=ICPQuery.from_config(icp_config).tech_stack)
+
+    to_enrich = organizations
+    snapshots = SnapshotStore(args.snapshots, size_threshold=args.change_threshold) if args.delta else None
+    if snapshots:
+        delta = snapshots.diff(organizations)
+        to_enrich = delta.to_enrich
+        print(f"\n🔁 Delta refresh: {len(delta.new)} new, {len(delta.changed)} changed, "
+              f"{len(delta.unchanged)} unchanged organizations")
+        if dedup:
+            # Changed orgs must not be answered from the identity index
+            dedup.expire_people(delta.changed)
+
+    # Spend the credit budget on the highest-scoring accounts first
+    to_enrich = budget.select(to_enrich, dedup, ICPQuery.from_config(icp_config).enrichment_titles)
+    if to_enrich:
+        with sink_from_args(args, 'apollo_people') as people_sink:
+            people = apollo.enrich_people_from_organizations(to_enrich, icp_config,
+                                                             concurrency=concurrency, sink=people_sink,
+                                                             journal=journal, dedup=dedup,
+                                                             max_lookups=budget.max_lookups,
+                                                             deadline=budget.deadline)
+        if args.classify_titles:
+            try:
+                TitleNormalizer(args.nlp_model, n_process=args.nlp_processes).annotate_people(people)
+            except Exception as e:
+                print(f"⚠️ Title classification skipped: {e}")
+        if qualifier and args.qualify_people and people:
+            people = qualify_records(qualifier, people, 'people', args.qualified_only)
         apollo.display_people_results(people)
+        if store:
+            store.upsert_people(people)
+        print(f"✅ {people_sink.count} people streamed to {people_sink.path}")
+        if snapshots:
+            snapshots.record([o for o in to_enrich if o.get('id') not in apollo.failed_org_ids])
+    elif organizations:
+        print("\n✅ No organization changed since the last snapshot; nothing to enrich.")
     else:
-        print("\n⚠️ No organizations found.")
+        print("\n⚠️ No organizations matched the ICP.")
+
+    display_run_summary(apollo, cache, dedup, store, embeddings)
+
+
+def qualify_records(qualifier: LLMQualifier, records: list, label: str, qualified_only: bool = False) -> list:
+    """Annotate records with LLM verdicts; with ``qualified_only``, drop those the LLM rejected."""
+    try:
+        qualifier.annotate(records)
+    except Exception as e:
+        print(f"⚠️ LLM qualification of {label} skipped: {e}")
+        return records
+    print(f"\n🤖 LLM qualification of {label}: {qualifier.stats}")
+    if qualified_only:
+        kept, unjudged = keep_qualified(records)
+        print(f"   {len(kept) - unjudged} {label} accepted, {len(records) - len(kept)} rejected"
+              + (f", {unjudged} kept unjudged" if unjudged else ""))
+        return kept
+    return records
+
+
+def display_run_summary(apollo: ApolloDataRetriever, cache=None, dedup=None, store=None, embeddings=None):
+    """Latency, cache, identity-index and store statistics printed at the end of a run."""
+    apollo.client.display_latency_summary()
+    if cache:
+        print(f"\n💾 Response cache: {cache.stats()}")
+    if dedup:
+        print(f"🪪 Identity index: {dedup.stats()}")
+    if embeddings:
+        print(f"🧮 Embedding index: {embeddings.stats()}")
+    if store:
+        print(f"📦 Prospect store {store.path}: {store.stats()}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,232 @@
+import argparse
+import json
+import os
+import time
+from collections import deque
+from itertools import islice
+from multiprocessing import Pool
+from pathlib import Path
+
+import numpy as np
+
+from input_handler import InputHandler
+from icp_query import EMPLOYEE_RANGES, ICPQuery, parse_revenue
+from icp_scoring import ICPScorer
+from fast_decode import loads
+from result_sink import JSONLSink, _infer_compression, read_jsonl_lines
+
+
+DEFAULT_CHUNK_SIZE = 5000
+
+# Upper bound of each EMPLOYEE_RANGES bucket but the open-ended last one
+_BAND_LIMITS = np.array([int(r.split(',')[1]) for r in EMPLOYEE_RANGES[:-1]])
+
+# Per-worker state, built once by _init_worker and only read afterwards
+_STATE = {}
+
+
+def employee_bands(counts) -> list:
+    """Apollo employee-range label ('51,100', ...) for each count (None when unknown)."""
+    values = np.array([c if isinstance(c, (int, float)) else np.nan for c in counts], dtype=float)
+    index = np.searchsorted(_BAND_LIMITS, np.nan_to_num(values, nan=0), side='left')
+    return [EMPLOYEE_RANGES[i] if not np.isnan(v) and v > 0 else None for i, v in zip(index, values)]
+
+
+def _revenue(org) -> float:
+    """Numeric revenue, falling back to parsing the printed form ('20M', '1.5B')."""
+    value = org.get('organization_revenue')
+    if isinstance(value, (int, float)) and value > 0:
+        return value
+    try:
+        return parse_revenue(org.get('organization_revenue_printed'))
+    except ValueError:
+        return None
+
+
+def _init_worker(icp_config: dict, people: bool, full: bool, only_matches: bool):
+    """Pool initializer: compile the ICP (keyword automata, title model) once per process."""
+    _STATE['scorer'] = ICPScorer(ICPQuery.from_config(icp_config))
+    _STATE['full'] = full
+    _STATE['only_matches'] = only_matches
+    _STATE['titles'] = None
+    if people:
+        from title_normalizer import TitleNormalizer
+        _STATE['titles'] = TitleNormalizer()
+
+
+def _dumps(record: dict) -> str:
+    return json.dumps(record, separators=(',', ':'), ensure_ascii=False) + '\n'
+
+
+def _score_orgs(orgs: list) -> list:
+    scorer = _STATE['scorer']
+    for org in orgs:
+        org['organization_revenue'] = _revenue(org)
+    scored = scorer.score(scorer.to_frame(orgs))
+    bands = employee_bands([o.get('estimated_num_employees') for o in orgs])
+    out = []
+    for org, band, score, match, hits in zip(orgs, bands, scored['icp_score'], scored['icp_match'],
+                                             scored['keyword_hits']):
+        if _STATE['only_matches'] and not match:
+            continue
+        fields = {'icp_score': round(float(score), 4), 'icp_match': bool(match),
+                  'keyword_hits': int(hits), 'employee_band': band}
+        if _STATE['full']:
+            out.append(dict(org, **fields))
+        else:
+            out.append(dict({'id': org.get('id'), 'name': org.get('name'),
+                             'primary_domain': org.get('primary_domain'),
+                             'organization_revenue': org.get('organization_revenue')}, **fields))
+    return out
+
+
+def _classify_people(people: list) -> list:
+    classes = _STATE['titles'].classify_titles([p.get('title') for p in people])
+    out = []
+    for person, cls in zip(people, classes):
+        fields = {'seniority_class': cls['seniority'], 'function_class': cls['function']}
+        if _STATE['full']:
+            out.append(dict(person, **fields))
+        else:
+            out.append(dict({'id': person.get('id'), 'name': person.get('name'),
+                             'title': person.get('title')}, **fields))
+    return out
+
+
+def _read_range(path: str, start: int, end: int) -> list:
+    """Complete lines in bytes [start, end) of an uncompressed JSONL file."""
+    with open(path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+        at_eof = f.tell() >= os.fstat(f.fileno()).st_size
+    lines = data.split(b'\n')
+    # The last piece is empty, except in a file whose final line has no newline
+    return [line for line in (lines if at_eof else lines[:-1]) if line.strip()]
+
+
+def _process_chunk(task) -> tuple:
+    """Worker: read, decode, score / classify and re-encode one chunk.
+
+    ``task`` is a (path, start, end) byte range, which the worker reads
+    itself, or a list of lines already read by the parent. Returns
+    (JSONL bytes, records written, records read).
+    """
+    lines = _read_range(*task) if isinstance(task, tuple) else task
+    records = [loads(line) for line in lines]
+    results = _classify_people(records) if _STATE['titles'] else _score_orgs(records)
+    return ''.join(map(_dumps, results)).encode('utf-8'), len(results), len(records)
+
+
+def _byte_ranges(path: str, size: int) -> list:
+    """Split an uncompressed JSONL file into line-aligned (path, start, end) ranges of ~``size`` records."""
+    total = os.path.getsize(path)
+    with open(path, 'rb') as f:
+        sample = list(islice(f, 1000))
+        if not sample:
+            return []
+        step = max(1, sum(map(len, sample)) // len(sample) * size)
+        ranges = []
+        start = 0
+        while start < total:
+            f.seek(min(start + step, total))
+            f.readline()
+            end = min(f.tell(), total)
+            ranges.append((path, start, end))
+            start = end
+    return ranges
+
+
+def _tasks(paths: list, size: int):
+    """Chunks of about ``size`` records: byte ranges of plain files, shipped lines of compressed ones.
+
+    Workers read plain files themselves, so the parent does no per-record
+    work; compressed files decompress as one stream, so their lines are
+    read here.
+    """
+    for path in paths:
+        if _infer_compression(Path(path)) is None:
+            yield from _byte_ranges(str(path), size)
+            continue
+        lines = read_jsonl_lines(path)
+        while True:
+            chunk = list(islice(lines, size))
+            if not chunk:
+                break
+            yield chunk
+
+
+def score_files(paths: list, icp_config: dict, output: str, processes: int = None,
+                chunk_size: int = DEFAULT_CHUNK_SIZE, people: bool = False, full: bool = False,
+                only_matches: bool = False) -> dict:
+    """Re-score stored organizations (or classify stored people) across a process pool.
+
+    Inputs are cut into chunks of about ``chunk_size`` records (line-aligned
+    byte ranges for plain files, which workers read themselves); each
+    worker compiled the ICP once in its initializer, decodes and scores
+    whole chunks with the vectorized
+    ICPScorer, and sends back encoded JSONL. Results are collected in
+    submission order, so the output lines up with the input, and at most
+    two chunks per worker are in flight, so memory stays flat.
+
+    Args:
+        paths: Organization (or, with ``people``, person) JSONL files, optionally compressed
+        icp_config: Parsed ICP YAML
+        output: Result JSONL file (.gz / .zst compress it)
+        processes: Worker processes (default: all cores)
+        chunk_size: Records per task
+        people: Classify titles (needs spaCy) instead of scoring organizations
+        full: Keep every input field instead of a compact summary
+        only_matches: Drop organizations failing a hard ICP constraint
+    """
+    processes = processes or os.cpu_count() or 1
+    start = time.perf_counter()
+    inputs = 0
+    window = 2 * processes
+    with JSONLSink(output, append=False) as sink, \
+            Pool(processes, initializer=_init_worker, initargs=(icp_config, people, full, only_matches)) as pool:
+        pending = deque()
+        for task in _tasks(paths, chunk_size):
+            pending.append(pool.apply_async(_process_chunk, (task,)))
+            while len(pending) >= window or (pending and pending[0].ready()):
+                data, written, read = pending.popleft().get()
+                sink.write_encoded(data, written)
+                inputs += read
+        while pending:
+            data, written, read = pending.popleft().get()
+            sink.write_encoded(data, written)
+            inputs += read
+    elapsed = time.perf_counter() - start
+    return {'records': inputs, 'written': sink.count, 'seconds': round(elapsed, 2),
+            'records_per_second': round(inputs / elapsed) if elapsed else None, 'processes': processes}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline, multi-process re-scoring of stored results")
+    parser.add_argument('inputs', nargs='+', help='Stored apollo_organizations / apollo_people JSONL files')
+    parser.add_argument('--config', default='data/icp_config.yaml', help='ICP YAML config')
+    parser.add_argument('--output', default='scored_organizations.jsonl', help='Result JSONL (.gz / .zst)')
+    parser.add_argument('--processes', type=int, default=None, help='Worker processes (default: all cores)')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='Records per task')
+    parser.add_argument('--people', action='store_true',
+                        help='Inputs are people: classify titles instead of scoring orgs (needs spaCy)')
+    parser.add_argument('--full', action='store_true', help='Keep every input field in the output')
+    parser.add_argument('--only-matches', action='store_true',
+                        help='Drop organizations failing a hard ICP constraint')
+    args = parser.parse_args()
+
+    if args.people:
+        import title_normalizer
+        if title_normalizer.spacy is None:
+            print("❌ Error: --people requires the 'spacy' package")
+            return
+
+    icp_config = InputHandler(args.config, file_type='yaml').read()
+    stats = score_files(args.inputs, icp_config, args.output, processes=args.processes,
+                        chunk_size=args.chunk_size, people=args.people, full=args.full,
+                        only_matches=args.only_matches)
+    print(f"✅ {stats['records']} records -> {stats['written']} written to {args.output} "
+          f"in {stats['seconds']}s ({stats['records_per_second']}/s on {stats['processes']} processes)")
+
+
+if __name__ == "__main__":
+    main()
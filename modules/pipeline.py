@@ -0,0 +1,331 @@
+import queue
+import threading
+import time
+
+from icp_query import ICPQuery
+from icp_scoring import ICPScorer
+from crawl_journal import CrawlJournal
+from dedup_index import DedupIndex, org_keys, person_keys, unique_by_keys
+from fast_decode import loads
+from records import Organization, Person, organization_context
+from response_cache import ResponseCache
+
+
+DEFAULT_WORKERS = {'fetch': 10, 'parse': 2, 'score': 1, 'people': 10, 'sink': 1}
+
+# End-of-stream marker; each stage forwards one per downstream worker
+_DONE = object()
+
+
+class PeopleLookup:
+    """People lookup for one org, honoring the crawl journal, identity index and budgets.
+
+    Thread-safe; shared by every people worker of a run. Returns None for
+    orgs skipped because ``max_lookups`` or the time.monotonic()
+    ``deadline`` was reached (counted in ``skipped``; those past the
+    deadline also in ``timed_out``), and raises if the lookup itself fails.
+    """
+
+    def __init__(self, apollo, icp_config, journal: CrawlJournal = None, dedup: DedupIndex = None,
+                 max_lookups: int = None, deadline: float = None):
+        query = icp_config if isinstance(icp_config, ICPQuery) else ICPQuery.from_config(icp_config)
+        self.apollo = apollo
+        self.job_titles = query.enrichment_titles
+        self.journal = journal
+        self.dedup = dedup
+        self.max_lookups = max_lookups
+        self.deadline = deadline
+        self.crawl_key = ResponseCache.key('people-enrichment', {'person_titles': self.job_titles})
+        self.done = journal.completed_orgs(self.crawl_key) if journal else {}
+        self.lookups = 0
+        self.skipped = 0
+        self.timed_out = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, org) -> list:
+        org_id = org.get('id')
+        if org_id in self.done:
+            return self.done[org_id]
+        if self.dedup and self.dedup.people_fetched(org, self.job_titles):
+            return self.dedup.stored_people(org, self.job_titles)
+        with self._lock:
+            out_of_time = self.deadline is not None and time.monotonic() >= self.deadline
+            if out_of_time or (self.max_lookups is not None and self.lookups >= self.max_lookups):
+                self.skipped += 1
+                self.timed_out += out_of_time
+                return None
+            self.lookups += 1
+        people = self.apollo._fetch_people(org_id, org.get('name', 'Unknown'), self.job_titles)
+        if self.dedup:
+            people = self.dedup.record_people(org, people, self.job_titles)
+        if self.journal:
+            self.journal.record_org(self.crawl_key, org_id, people)
+        return people
+
+
+class Stage:
+    """A pool of worker threads between two bounded queues.
+
+    ``func`` maps one input item to an iterable of outputs. Putting into a
+    full ``outbox`` blocks the worker, so a slow stage throttles everything
+    upstream of it. When the last worker sees the end of its input, the
+    stage forwards end-of-stream to each worker of the next stage.
+    """
+
+    def __init__(self, name: str, func, workers: int, inbox: queue.Queue, outbox: queue.Queue = None):
+        self.name = name
+        self.func = func
+        self.workers = max(1, workers)
+        self.inbox = inbox
+        self.outbox = outbox
+        self.downstream_workers = 0
+        self.items = 0
+        self.errors = 0
+        self.busy = 0.0
+        self._alive = self.workers
+        self._lock = threading.Lock()
+        self._threads = []
+
+    def start(self):
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"{self.name}-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _work(self):
+        while True:
+            item = self.inbox.get()
+            if item is _DONE:
+                break
+            start = time.perf_counter()
+            try:
+                outputs = list(self.func(item) or ())
+            except Exception as e:
+                outputs = []
+                with self._lock:
+                    self.errors += 1
+                print(f"  ⚠️ {self.name} stage error: {e}")
+            with self._lock:
+                self.items += 1
+                self.busy += time.perf_counter() - start
+            for output in outputs:
+                self.outbox.put(output)
+        with self._lock:
+            self._alive -= 1
+            last = self._alive == 0
+        if last and self.outbox is not None:
+            for _ in range(self.downstream_workers):
+                self.outbox.put(_DONE)
+
+    def join(self):
+        for thread in self._threads:
+            thread.join()
+
+    def utilization(self, elapsed: float) -> float:
+        """Fraction of the run this stage's workers spent working (1.0 = saturated)."""
+        return self.busy / (elapsed * self.workers) if elapsed else 0.0
+
+
+def parse_workers(specs: list) -> dict:
+    """``['fetch=10', 'people=20']`` -> ``{'fetch': 10, 'people': 20}`` (for --stage-workers)."""
+    workers = {}
+    for spec in specs or []:
+        name, _, count = spec.partition('=')
+        if name not in DEFAULT_WORKERS or not count.isdigit():
+            raise ValueError(f"Bad stage worker spec {spec!r}; expected one of {list(DEFAULT_WORKERS)}=<count>")
+        workers[name] = int(count)
+    return workers
+
+
+def run_pipeline(apollo, icp_config, max_pages='all', workers: dict = None, queue_size: int = 50,
+                 enrich: bool = True, sink=None, people_sink=None, journal: CrawlJournal = None,
+                 dedup: DedupIndex = None, max_lookups: int = None, deadline: float = None) -> dict:
+    """Search and enrich as one streaming pipeline: fetch -> parse -> score -> people -> sink.
+
+    Pages are fetched, decoded and scored as they arrive, and each matching
+    organization's people lookup starts right away instead of after the
+    whole crawl. Stages are joined by queues of at most ``queue_size``
+    items, so memory stays bounded and wall time approaches that of the
+    slowest stage rather than the sum of all of them.
+
+    Args:
+        apollo: ApolloDataRetriever
+        icp_config: ICP dict or ICPQuery
+        max_pages: Organization pages to crawl, or "all"
+        workers: Worker count per stage (keys of DEFAULT_WORKERS)
+        queue_size: Capacity of each inter-stage queue
+        enrich: Run the people stages
+        sink / people_sink: Streamed organization / people JSONL output
+        max_lookups: Hard cap on people lookups (credits), spent first-come in
+                     crawl order rather than on the best scores
+        deadline: time.monotonic() after which no pages are fetched and no lookups start
+
+    Returns:
+        {'organizations': matches ranked by ICP score, 'people', 'complete', 'stages'}
+    """
+    query = icp_config if isinstance(icp_config, ICPQuery) else ICPQuery.from_config(icp_config)
+    workers = dict(DEFAULT_WORKERS, **(workers or {}))
+    scorer = ICPScorer(query)
+    lookup = PeopleLookup(apollo, query, journal, dedup, max_lookups, deadline)
+    apollo_params = apollo.transform_org_config(query)
+    crawl_key = ResponseCache.key('organizations/search', dict(apollo_params, page=None))
+    done_pages = journal.completed_pages(crawl_key) if journal else {}
+
+    print(f"\n{'='*70}")
+    print("🏭 PIPELINED SEARCH + ENRICHMENT")
+    print(f"{'='*70}")
+    print("Workers: " + ", ".join(f"{name} {count}" for name, count in workers.items()))
+
+    merge_lock = threading.Lock()
+    sink_lock = threading.Lock()
+    seen_orgs = set()
+    seen_people = set()
+    organizations = []
+    people = []
+    failed_pages = []
+    failed_orgs = []
+    total_pages = [1]
+
+    def fetch(page: int):
+        if deadline is not None and time.monotonic() >= deadline:
+            failed_pages.append(page)
+            return ()
+        try:
+            response = apollo.client.post('organizations/search', dict(apollo_params, page=page), timeout=30)
+            if response.status_code != 200:
+                raise RuntimeError(f"API Response Status: {response.status_code}")
+        except Exception as e:
+            failed_pages.append(page)
+            raise RuntimeError(f"page {page}: {e}") from e
+        return [(page, response.content)]
+
+    def parse(item):
+        page, raw = item
+        try:
+            orgs = loads(raw).get('organizations', [])
+        except Exception as e:
+            failed_pages.append(page)
+            raise RuntimeError(f"page {page}: {e}") from e
+        if journal:
+            journal.record_page(crawl_key, page, orgs, total_pages[0])
+        return [(page, orgs)]
+
+    def score(item):
+        page, orgs = item
+        with merge_lock:
+            found = len(orgs)
+            orgs = dedup.merge_orgs(orgs) if dedup else unique_by_keys(orgs, org_keys, seen_orgs)
+            if sink:
+                sink.write_many(orgs)
+        if not orgs:
+            return ()
+        scored = scorer.score(scorer.to_frame(orgs))
+        matched = []
+        for position, (org, value, match) in enumerate(zip(orgs, scored['icp_score'], scored['icp_match'])):
+            if match:
+                record = Organization.from_api(org, apollo.keep_raw)
+                record['icp_score'] = round(float(value), 4)
+                matched.append(record)
+                # Page / position break score ties the way ICPScorer.rank's stable sort would
+                with merge_lock:
+                    organizations.append((-record['icp_score'], page, position, record))
+        print(f"  ✓ Page {page}: {found} organizations, {len(matched)} match")
+        return matched if enrich else ()
+
+    def find_people(org):
+        try:
+            found = lookup(org)
+        except Exception:
+            failed_orgs.append(org.get('id'))
+            raise
+        if found is None:
+            failed_orgs.append(org.get('id'))
+            return ()
+        return [(org, found)]
+
+    def write_people(item):
+        org, found = item
+        with sink_lock:
+            found = unique_by_keys(found, person_keys, seen_people)
+            if found:
+                context = organization_context(org)
+                for person in found:
+                    person['organization_context'] = context
+                if people_sink:
+                    people_sink.write_many(found)
+                people.extend(Person.from_api(p, context, apollo.keep_raw) for p in found)
+        return ()
+
+    pages_q, raw_q, parsed_q = queue.Queue(queue_size), queue.Queue(queue_size), queue.Queue(queue_size)
+    orgs_q, people_q = queue.Queue(queue_size), queue.Queue(queue_size)
+    stages = [
+        Stage('fetch', fetch, workers['fetch'], pages_q, raw_q),
+        Stage('parse', parse, workers['parse'], raw_q, parsed_q),
+        Stage('score', score, workers['score'], parsed_q, orgs_q if enrich else None),
+    ]
+    if enrich:
+        stages += [
+            Stage('people', find_people, workers['people'], orgs_q, people_q),
+            Stage('sink', write_people, workers['sink'], people_q),
+        ]
+    for stage, nxt in zip(stages, stages[1:]):
+        stage.downstream_workers = nxt.workers
+
+    start = time.perf_counter()
+    for stage in stages:
+        stage.start()
+
+    # Page 1 is fetched up front: it tells the producer how many pages to queue
+    try:
+        if 1 in done_pages:
+            first, total_pages[0] = done_pages[1]
+        else:
+            response = apollo.client.post('organizations/search', dict(apollo_params, page=1), timeout=30)
+            if response.status_code != 200:
+                raise RuntimeError(f"API Response Status: {response.status_code} | Response Body: {response.text}")
+            data = loads(response.content)
+            first = data.get('organizations', [])
+            total_pages[0] = data.get('pagination', {}).get('total_pages', 1) or 1
+            if journal:
+                journal.record_page(crawl_key, 1, first, total_pages[0])
+        parsed_q.put((1, first))
+        last_page = total_pages[0] if max_pages == 'all' else min(int(max_pages), total_pages[0])
+        if done_pages:
+            print(f"♻️  Resuming: {len(done_pages)} pages already journaled")
+        for page in range(2, last_page + 1):
+            if page in done_pages:
+                parsed_q.put((page, done_pages[page][0]))
+            else:
+                pages_q.put(page)
+    except Exception as e:
+        failed_pages.append(1)
+        print(f"\n❌ Crawl stopped at page 1: {e}")
+    finally:
+        for _ in range(stages[0].workers):
+            pages_q.put(_DONE)
+
+    for stage in stages:
+        stage.join()
+    elapsed = time.perf_counter() - start
+
+    organizations = [record for *_, record in sorted(organizations, key=lambda e: e[:3])]
+    apollo.failed_org_ids = set(failed_orgs)
+    print(f"\n⏱️  Pipeline finished in {elapsed:.2f}s: {len(organizations)} matching organizations, "
+          f"{len(people)} people ({lookup.lookups} lookups)")
+    for stage in stages:
+        errors = f", {stage.errors} errors" if stage.errors else ""
+        print(f"  • {stage.name:<6} x{stage.workers}: {stage.items} items, "
+              f"{stage.utilization(elapsed):.0%} busy{errors}")
+    if lookup.skipped:
+        print(f"💳 {lookup.skipped} organizations skipped: credit or time budget reached")
+    if failed_pages:
+        print(f"⚠️  {len(failed_pages)} pages not fetched"
+              + ("; rerun with --resume to retry only those." if journal else "."))
+
+    return {
+        'organizations': organizations,
+        'people': people,
+        'complete': not failed_pages,
+        'stages': {s.name: {'workers': s.workers, 'items': s.items, 'busy': round(s.busy, 3),
+                            'errors': s.errors} for s in stages},
+    }
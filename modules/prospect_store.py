@@ -0,0 +1,309 @@
+import argparse
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from records import GROWTH_COLUMNS
+
+
+DEFAULT_STORE_NAME = 'prospects.sqlite'
+
+ORG_COLUMNS = (
+    'id', 'name', 'primary_domain', 'website_url', 'linkedin_uid',
+    'industry', 'country', 'state', 'city',
+    'estimated_num_employees', 'organization_revenue', *GROWTH_COLUMNS, 'icp_score',
+)
+PERSON_COLUMNS = (
+    'id', 'org_id', 'name', 'title', 'seniority', 'email', 'linkedin_url', 'city', 'state', 'country',
+)
+
+
+def _technologies(org) -> list:
+    """Technology names from an org payload (technology_names or current_technologies)."""
+    names = list(org.get('technology_names') or [])
+    for tech in org.get('current_technologies') or []:
+        if isinstance(tech, dict) and tech.get('name'):
+            names.append(tech['name'])
+    return names
+
+
+class ProspectStore:
+    """Local, indexed SQLite store of every organization and person retrieved.
+
+    Runs upsert into it instead of overwriting, so sales ops can slice the
+    accumulated universe (industry, size, revenue, keywords, technologies)
+    locally instead of issuing a new API search. Parquet export feeds
+    analytics tools.
+    """
+
+    def __init__(self, path: str = DEFAULT_STORE_NAME):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # Bulk upserts of tag rows dominate; WAL keeps NORMAL sync crash-safe
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        growth = ''.join(f"{col} REAL,\n" for col in GROWTH_COLUMNS)
+        self._conn.executescript(f"""
+            CREATE TABLE IF NOT EXISTS orgs (
+                id TEXT PRIMARY KEY,
+                name TEXT,
+                primary_domain TEXT COLLATE NOCASE,
+                website_url TEXT,
+                linkedin_uid TEXT,
+                industry TEXT COLLATE NOCASE,
+                country TEXT COLLATE NOCASE,
+                state TEXT COLLATE NOCASE,
+                city TEXT,
+                estimated_num_employees INTEGER,
+                organization_revenue REAL,
+                {growth}icp_score REAL,
+                matched_filter TEXT,
+                updated_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_orgs_domain ON orgs(primary_domain);
+            CREATE INDEX IF NOT EXISTS idx_orgs_country ON orgs(country);
+            CREATE INDEX IF NOT EXISTS idx_orgs_employees ON orgs(estimated_num_employees);
+            CREATE INDEX IF NOT EXISTS idx_orgs_revenue ON orgs(organization_revenue);
+            CREATE INDEX IF NOT EXISTS idx_orgs_industry ON orgs(industry);
+
+            CREATE TABLE IF NOT EXISTS keywords (
+                keyword TEXT NOT NULL,
+                org_id TEXT NOT NULL,
+                PRIMARY KEY (keyword, org_id)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_keywords_org ON keywords(org_id);
+
+            CREATE TABLE IF NOT EXISTS technologies (
+                technology TEXT NOT NULL,
+                org_id TEXT NOT NULL,
+                PRIMARY KEY (technology, org_id)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_technologies_org ON technologies(org_id);
+
+            CREATE TABLE IF NOT EXISTS people (
+                id TEXT PRIMARY KEY,
+                org_id TEXT,
+                name TEXT,
+                title TEXT,
+                seniority TEXT,
+                email TEXT,
+                linkedin_url TEXT,
+                city TEXT,
+                state TEXT,
+                country TEXT,
+                updated_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_people_org ON people(org_id);
+            CREATE INDEX IF NOT EXISTS idx_people_title ON people(title COLLATE NOCASE);
+        """)
+        if 'matched_filter' not in {c[1] for c in self._conn.execute("PRAGMA table_info(orgs)")}:
+            self._conn.execute("ALTER TABLE orgs ADD COLUMN matched_filter TEXT")
+        self._conn.commit()
+
+    # ------------------- WRITES ------------------- #
+    def upsert_orgs(self, organizations: list, tech_filter: list = None) -> int:
+        """Insert or refresh organizations (API dicts or records); returns rows written.
+
+        The technologies table holds only technologies named in the payload.
+        ``tech_filter`` (the technology filter of the query that returned
+        the orgs) is kept in ``matched_filter``: Apollo matches any of the
+        listed technologies, so only a single-technology filter says which
+        one an org uses, and only then is it added as a technology.
+        """
+        now = time.time()
+        tech_filter = list(tech_filter or [])
+        matched_filter = ','.join(str(t).lower() for t in tech_filter) or None
+        rows, keyword_rows, tech_rows, ids = [], [], [], []
+        for org in organizations:
+            org_id = org.get('id')
+            if not org_id:
+                continue
+            ids.append((org_id,))
+            rows.append(tuple(org.get(col) for col in ORG_COLUMNS) + (matched_filter, now))
+            # Industries are searchable as tags too ("fintech" is either, depending on the org)
+            tags = list(org.get('keywords') or []) + list(org.get('industries') or [])
+            keyword_rows.extend((str(k).lower(), org_id) for k in dict.fromkeys(tags))
+            techs = _technologies(org) or (tech_filter if len(tech_filter) == 1 else [])
+            tech_rows.extend((str(t).lower(), org_id) for t in dict.fromkeys(techs))
+
+        placeholders = ','.join('?' * (len(ORG_COLUMNS) + 2))
+        updates = ','.join(f"{col} = COALESCE(excluded.{col}, {col})"
+                           for col in ORG_COLUMNS[1:] + ('matched_filter',))
+        with self._lock:
+            self._conn.executemany(
+                f"INSERT INTO orgs ({','.join(ORG_COLUMNS)}, matched_filter, updated_at) VALUES ({placeholders}) "
+                f"ON CONFLICT(id) DO UPDATE SET {updates}, updated_at = excluded.updated_at", rows
+            )
+            self._conn.executemany("DELETE FROM keywords WHERE org_id = ?", ids)
+            self._conn.executemany("INSERT OR IGNORE INTO keywords (keyword, org_id) VALUES (?, ?)", keyword_rows)
+            if tech_rows:
+                tech_ids = list({(org_id,) for _, org_id in tech_rows})
+                self._conn.executemany("DELETE FROM technologies WHERE org_id = ?", tech_ids)
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO technologies (technology, org_id) VALUES (?, ?)", tech_rows
+                )
+            self._conn.commit()
+        return len(rows)
+
+    def upsert_people(self, people: list) -> int:
+        """Insert or refresh people (API dicts or records); returns rows written."""
+        now = time.time()
+        rows = []
+        for person in people:
+            if not person.get('id'):
+                continue
+            org_id = person.get('organization_id') or (person.get('organization_context') or {}).get('id')
+            rows.append((person.get('id'), org_id) + tuple(person.get(col) for col in PERSON_COLUMNS[2:]) + (now,))
+        placeholders = ','.join('?' * (len(PERSON_COLUMNS) + 1))
+        with self._lock:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO people ({','.join(PERSON_COLUMNS)}, updated_at) VALUES ({placeholders})",
+                rows
+            )
+            self._conn.commit()
+        return len(rows)
+
+    # ------------------- QUERIES ------------------- #
+    def find_orgs(self, industry: str = None, keywords: list = None, technologies: list = None,
+                  employees: tuple = None, revenue: tuple = None, country: str = None,
+                  domain: str = None, limit: int = None) -> list:
+        """Organizations matching every given filter, best ICP score first.
+
+        Args:
+            industry: Primary industry (case-insensitive)
+            keywords: Keyword / industry tags the org must all carry
+            technologies: Technologies the org must all use
+            employees: (min, max) employee count, either end may be None
+            revenue: (min, max) revenue, either end may be None
+            country: Country (case-insensitive)
+            domain: Primary domain
+            limit: Maximum rows
+        """
+        where, params = [], []
+        if industry:
+            where.append("o.industry = ?")
+            params.append(industry)
+        if country:
+            where.append("o.country = ?")
+            params.append(country)
+        if domain:
+            where.append("o.primary_domain = ?")
+            params.append(domain)
+        for column, bounds in (('estimated_num_employees', employees), ('organization_revenue', revenue)):
+            low, high = bounds or (None, None)
+            if low is not None:
+                where.append(f"o.{column} >= ?")
+                params.append(low)
+            if high is not None:
+                where.append(f"o.{column} <= ?")
+                params.append(high)
+        for keyword in keywords or []:
+            where.append("o.id IN (SELECT org_id FROM keywords WHERE keyword = ?)")
+            params.append(keyword.lower())
+        for tech in technologies or []:
+            where.append("o.id IN (SELECT org_id FROM technologies WHERE technology = ?)")
+            params.append(tech.lower())
+
+        sql = "SELECT o.* FROM orgs o"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY o.icp_score DESC NULLS LAST, o.estimated_num_employees DESC"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(sql, params)]
+
+    def people_for(self, org_ids: list) -> list:
+        """People stored for the given organizations."""
+        if not org_ids:
+            return []
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT * FROM people WHERE org_id IN ({','.join('?' * len(org_ids))})", list(org_ids)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {table: self._conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                    for table in ('orgs', 'people', 'keywords', 'technologies')}
+
+    # ------------------- EXPORT ------------------- #
+    def export_parquet(self, directory: str) -> list:
+        """Write each table to ``<directory>/<table>.parquet`` (needs pandas + pyarrow)."""
+        import pandas as pd
+
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        written = []
+        for table in ('orgs', 'people', 'keywords', 'technologies'):
+            with self._lock:
+                frame = pd.read_sql_query(f"SELECT * FROM {table}", self._conn)
+            path = directory / f"{table}.parquet"
+            try:
+                frame.to_parquet(path, index=False)
+            except ImportError as e:
+                raise ValueError("Parquet export requires the 'pyarrow' package") from e
+            written.append(path)
+        return written
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def _range(values):
+    return tuple(values) if values else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query or export the local prospect store")
+    parser.add_argument('--store', default=DEFAULT_STORE_NAME, help='SQLite prospect store')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    query = sub.add_parser('query', help='Find stored organizations')
+    query.add_argument('--industry')
+    query.add_argument('--keyword', action='append', help='Repeat for several (all must match)')
+    query.add_argument('--technology', action='append', help='Repeat for several (all must match)')
+    query.add_argument('--employees', nargs=2, type=int, metavar=('MIN', 'MAX'))
+    query.add_argument('--revenue', nargs=2, type=float, metavar=('MIN', 'MAX'))
+    query.add_argument('--country')
+    query.add_argument('--domain')
+    query.add_argument('--limit', type=int, default=50)
+    query.add_argument('--people', action='store_true', help='Also list stored people')
+
+    export = sub.add_parser('export', help='Export every table to Parquet')
+    export.add_argument('directory')
+
+    sub.add_parser('stats', help='Row counts')
+    args = parser.parse_args()
+
+    store = ProspectStore(args.store)
+    if args.command == 'stats':
+        print(f"📦 {store.stats()}")
+    elif args.command == 'export':
+        for path in store.export_parquet(args.directory):
+            print(f"✅ Exported {path}")
+    else:
+        start = time.perf_counter()
+        orgs = store.find_orgs(industry=args.industry, keywords=args.keyword, technologies=args.technology,
+                               employees=_range(args.employees), revenue=_range(args.revenue),
+                               country=args.country, domain=args.domain, limit=args.limit)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"\n🔎 {len(orgs)} organizations in {elapsed:.1f} ms\n")
+        for i, org in enumerate(orgs, 1):
+            print(f"{i}. 🏢 {org['name']} | {org['industry']} | {org['estimated_num_employees']} employees | "
+                  f"{org['primary_domain']}")
+        if args.people:
+            for p in store.people_for([o['id'] for o in orgs]):
+                print(f"   👤 {p['name']} | {p['title']} | {p['email'] or 'N/A'}")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
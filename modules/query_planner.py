@@ -0,0 +1,193 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+
+from icp_query import EMPLOYEE_RANGES, ICPQuery
+from response_cache import CacheMiss
+from crawl_journal import CrawlInterrupted, CrawlJournal
+from dedup_index import DedupIndex, org_keys, unique_by_keys
+from records import Organization
+
+
+# organizations/search will not page past this, whatever total_entries says
+PAGE_CEILING = 500
+
+US_STATES = (
+    'Alabama', 'Alaska', 'Arizona', 'Arkansas', 'California', 'Colorado', 'Connecticut',
+    'Delaware', 'District of Columbia', 'Florida', 'Georgia', 'Hawaii', 'Idaho', 'Illinois',
+    'Indiana', 'Iowa', 'Kansas', 'Kentucky', 'Louisiana', 'Maine', 'Maryland', 'Massachusetts',
+    'Michigan', 'Minnesota', 'Mississippi', 'Missouri', 'Montana', 'Nebraska', 'Nevada',
+    'New Hampshire', 'New Jersey', 'New Mexico', 'New York', 'North Carolina', 'North Dakota',
+    'Ohio', 'Oklahoma', 'Oregon', 'Pennsylvania', 'Rhode Island', 'South Carolina',
+    'South Dakota', 'Tennessee', 'Texas', 'Utah', 'Vermont', 'Virginia', 'Washington',
+    'West Virginia', 'Wisconsin', 'Wyoming'
+)
+
+
+class QueryPlanner:
+    """Split a broad organization query into disjoint pieces under the page ceiling.
+
+    Each piece's size is probed with a one-result request. Oversized queries
+    are split first by Apollo employee-range bucket, then a single bucket
+    covering the United States is split by state, plus one remainder piece
+    excluding every listed state (orgs with no or another state, e.g.
+    Puerto Rico). Pieces still too large after both splits are crawled up
+    to the ceiling with a warning. Pieces whose size probe fails are
+    reported and listed in ``failed``.
+    """
+
+    def __init__(self, apollo, per_page: int = 25, page_ceiling: int = PAGE_CEILING,
+                 probe_concurrency: int = 10):
+        """
+        Args:
+            apollo: ApolloDataRetriever whose client runs the probes and crawls
+            per_page: Page size the crawl will use
+            page_ceiling: Deepest page Apollo serves
+            probe_concurrency: Size probes run at once
+        """
+        self.apollo = apollo
+        self.capacity = per_page * page_ceiling
+        self.probe_concurrency = probe_concurrency
+        self.failed = []
+
+    def count(self, query: ICPQuery) -> int:
+        """Apollo's total_entries for a query."""
+        response = self.apollo.client.post('organizations/search', query.org_payload(page=1, per_page=1),
+                                           timeout=30)
+        if response.status_code != 200:
+            raise RuntimeError(f"API Response Status: {response.status_code} | Response Body: {response.text}")
+        return response.json().get('pagination', {}).get('total_entries', 0) or 0
+
+    def _probe(self, query: ICPQuery) -> int:
+        """count(), or None (recorded in ``failed``) when the probe errors or misses the cache."""
+        try:
+            return self.count(query)
+        except (RuntimeError, CacheMiss, OSError) as e:
+            self.failed.append(query)
+            print(f"  ⚠️  Size probe failed for {_describe(query)}: {e}")
+            return None
+
+    def _split(self, query: ICPQuery) -> list:
+        """Disjoint sub-queries covering ``query``, or [] if it cannot be split further."""
+        ranges = query.employee_ranges or EMPLOYEE_RANGES
+        if len(ranges) > 1:
+            return [replace(query, employee_ranges=(r,)) for r in ranges]
+        if 'United States' in query.locations and not query.excluded_locations:
+            # Apollo matches a state name against the org's state; US orgs in
+            # no listed state go to a remainder piece, and other countries
+            # stay together in their own piece.
+            others = tuple(loc for loc in query.locations if loc != 'United States')
+            pieces = [replace(query, locations=(state,)) for state in US_STATES]
+            pieces.append(replace(query, locations=('United States',), excluded_locations=US_STATES))
+            if others:
+                pieces.append(replace(query, locations=others))
+            return pieces
+        return []
+
+    def plan(self, query: ICPQuery) -> list:
+        """List of (sub-query, total_entries) pieces, each under the ceiling where possible.
+
+        Pieces whose probe failed are left out and recorded in ``failed``.
+        """
+        self.failed = []
+        pending = [(query, self._probe(query))]
+        pieces = []
+        with ThreadPoolExecutor(max_workers=self.probe_concurrency) as executor:
+            while pending:
+                current, total = pending.pop()
+                if not total:
+                    continue
+                if total <= self.capacity:
+                    pieces.append((current, total))
+                    continue
+                children = self._split(current)
+                if not children:
+                    print(f"⚠️  {total} results remain in one piece after splitting; "
+                          f"only the first {self.capacity} are reachable")
+                    pieces.append((current, total))
+                    continue
+                pending.extend(zip(children, executor.map(self._probe, children)))
+        return pieces
+
+
+def _describe(query: ICPQuery) -> str:
+    """Short label of a split piece for progress messages."""
+    parts = [f"employees {', '.join(query.employee_ranges) or 'any'}",
+             f"locations {', '.join(query.locations) or 'any'}"]
+    if query.excluded_locations:
+        parts.append(f"excluding {len(query.excluded_locations)} locations")
+    return ' | '.join(parts)
+
+
+def search_partitioned(apollo, icp_config, concurrency: int = 10, journal: CrawlJournal = None,
+                       dedup: DedupIndex = None, sink=None, planner: QueryPlanner = None,
+                       keep_raw: bool = None, deadline: float = None) -> dict:
+    """Full-recall organization search: plan pieces, crawl them in parallel, merge with dedup.
+
+    Returns the same shape as ApolloDataRetriever.search_organizations
+    (compact Organization records; full payloads go to ``sink``). No piece
+    reads further pages once the time.monotonic() ``deadline`` passes, and
+    the result is then marked incomplete.
+    """
+    query = icp_config if isinstance(icp_config, ICPQuery) else ICPQuery.from_config(icp_config)
+    keep_raw = apollo.keep_raw if keep_raw is None else keep_raw
+    planner = planner or QueryPlanner(apollo, probe_concurrency=concurrency)
+
+    print(f"\n{'='*70}")
+    print("🧩 STEP 1: PARTITIONED ORGANIZATION SEARCH")
+    print(f"{'='*70}")
+    pieces = planner.plan(query)
+    expected = sum(total for _, total in pieces)
+    print(f"Split into {len(pieces)} queries covering {expected} results "
+          f"(≤ {planner.capacity} each)")
+    if planner.failed:
+        print(f"  ❌ {len(planner.failed)} queries could not be sized and are not crawled")
+    if not pieces:
+        return {'organizations': [], 'pagination': {'total_entries': 0}, 'complete': not planner.failed}
+
+    workers = min(len(pieces), concurrency)
+    page_concurrency = max(1, concurrency // workers)
+
+    def out_of_time() -> bool:
+        return deadline is not None and time.monotonic() >= deadline
+
+    def crawl(piece: ICPQuery) -> tuple:
+        """(organizations, whether the deadline cut the piece short)."""
+        orgs = []
+        if out_of_time():
+            return orgs, True
+        for _, page_orgs in apollo.iter_organization_pages(piece, 'all', page_concurrency, journal):
+            orgs.extend(page_orgs)
+            if out_of_time():
+                return orgs, True
+        return orgs, False
+
+    all_orgs = []
+    seen = set()
+    complete = not planner.failed
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(crawl, piece) for piece, _ in pieces]
+        for i, future in enumerate(futures, 1):
+            try:
+                orgs, timed_out = future.result()
+            except CrawlInterrupted as e:
+                complete = False
+                print(f"  ❌ Piece {i}/{len(pieces)} stopped at {e}")
+                continue
+            if timed_out:
+                complete = False
+                print(f"  ⏰ Piece {i}/{len(pieces)} stopped: time budget spent")
+            # Pieces are disjoint, but ranges / states can overlap at the edges
+            orgs = dedup.merge_orgs(orgs) if dedup else unique_by_keys(orgs, org_keys, seen)
+            if sink:
+                sink.write_many(orgs)
+            all_orgs.extend(Organization.from_api(o, keep_raw) for o in orgs)
+            print(f"  ✓ Piece {i}/{len(pieces)}: {len(orgs)} organizations")
+
+    if not complete and journal:
+        print("   Completed pages are journaled; rerun with --resume to continue.")
+    return {
+        'organizations': all_orgs,
+        'pagination': {'total_entries': len(all_orgs)},
+        'complete': complete
+    }
@@ -0,0 +1,199 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+
+# Conservative starting point (requests per minute) until Apollo's
+# x-rate-limit-* headers tell us the real plan limits.
+DEFAULT_REQUESTS_PER_MINUTE = 50
+
+# Apollo reports limits per window, shortest first. The shortest advertised
+# window paces the bucket; the longer ones only cap how many requests may go
+# out before they reset.
+RATE_LIMIT_WINDOWS = {
+    'minute': ('x-rate-limit-minute', 'x-minute-requests-left', 60),
+    'hourly': ('x-rate-limit-hourly', 'x-hourly-requests-left', 3600),
+    '24-hour': ('x-rate-limit-24-hour', 'x-24-hour-requests-left', 86400),
+}
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+def _header_int(headers, name: str):
+    value = headers.get(name)
+    if value is None:
+        return None
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_retry_after(value) -> float:
+    """Parse a Retry-After header (delta-seconds or HTTP date) into seconds."""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except (TypeError, ValueError):
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(retry_at.timestamp() - time.time(), 0.0)
+
+
+class TokenBucket:
+    """Thread-safe token bucket with an optional hard pause (after a 429)."""
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum burst size
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self):
+        """Block until a token is available, then take it."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now >= self.paused_until and self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = max(self.paused_until - now, (1 - self.tokens) / self.rate)
+            time.sleep(wait)
+
+    def set_rate(self, rate: float, capacity: float):
+        with self.lock:
+            self._refill(time.monotonic())
+            self.rate = rate
+            self.capacity = capacity
+            self.tokens = min(self.tokens, capacity)
+
+    def limit_tokens(self, remaining: float):
+        """Never hold more tokens than the server says are left in the window."""
+        with self.lock:
+            self._refill(time.monotonic())
+            self.tokens = min(self.tokens, remaining)
+
+    def pause(self, seconds: float):
+        """Stop handing out tokens for ``seconds`` and drain the bucket."""
+        with self.lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.paused_until = max(self.paused_until, now + seconds)
+            self.tokens = 0
+
+
+class RateLimiter:
+    """Per-endpoint token buckets that adapt to Apollo's rate-limit headers.
+
+    Every call goes through ``acquire(endpoint)`` before it is sent and
+    ``update_from_headers(endpoint, headers)`` after it returns. Retryable
+    responses (429/5xx) get a jittered exponential backoff that also pauses
+    the endpoint's bucket, so concurrent callers back off together.
+    """
+
+    def __init__(self, requests_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE,
+                 burst_seconds: float = 5, safety_margin: float = 0.95,
+                 backoff_base: float = 0.5, backoff_cap: float = 60):
+        """
+        Args:
+            requests_per_minute: Initial per-endpoint rate before headers arrive
+            burst_seconds: Bucket capacity expressed in seconds of rate
+            safety_margin: Fraction of the advertised plan limit to run at
+            backoff_base: First backoff step in seconds
+            backoff_cap: Upper bound for a single backoff sleep in seconds
+        """
+        self.default_rate = requests_per_minute / 60
+        self.burst_seconds = burst_seconds
+        self.safety_margin = safety_margin
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.buckets = {}
+        self._windows = {}
+        self._lock = threading.Lock()
+
+    def _capacity(self, rate: float) -> float:
+        return max(1.0, rate * self.burst_seconds)
+
+    def bucket(self, endpoint: str) -> TokenBucket:
+        with self._lock:
+            bucket = self.buckets.get(endpoint)
+            if bucket is None:
+                bucket = TokenBucket(self.default_rate, self._capacity(self.default_rate))
+                self.buckets[endpoint] = bucket
+            return bucket
+
+    def acquire(self, endpoint: str):
+        self.bucket(endpoint).acquire()
+
+    def _time_to_reset(self, endpoint: str, name: str, window: float, left: int) -> float:
+        """Seconds until the endpoint's ``name`` window resets, as far as we can tell.
+
+        Apollo does not send reset times, so a window is taken to start when
+        its requests-left count is first seen or goes back up. The real
+        window started earlier, so the estimate errs on the long side.
+        """
+        now = time.monotonic()
+        with self._lock:
+            state = self._windows.get((endpoint, name))
+            if state is None or left > state[1]:
+                state = self._windows[(endpoint, name)] = [now, left]
+            state[1] = left
+            return max(state[0] + window - now, 0.0)
+
+    def update_from_headers(self, endpoint: str, headers):
+        """Re-tune the endpoint's bucket from x-rate-limit-* / *-requests-left headers.
+
+        The rate follows the shortest window with an advertised limit. A
+        longer window that has no requests left pauses the endpoint until
+        it resets instead of slowing every request down to its average rate.
+        """
+        bucket = self.bucket(endpoint)
+        pace_window = None
+        remaining = []
+        for name, (limit_header, left_header, window) in RATE_LIMIT_WINDOWS.items():
+            limit = _header_int(headers, limit_header)
+            if limit and pace_window is None:
+                pace_window = window
+                rate = limit * self.safety_margin / window
+                bucket.set_rate(rate, self._capacity(rate))
+            left = _header_int(headers, left_header)
+            if left is None:
+                continue
+            remaining.append(left)
+            if pace_window is not None and window > pace_window:
+                reset_in = self._time_to_reset(endpoint, name, window, left)
+                if left <= 0 and reset_in > 0:
+                    bucket.pause(reset_in)
+
+        if remaining:
+            bucket.limit_tokens(min(remaining))
+
+    def backoff(self, endpoint: str, attempt: int, headers=None) -> float:
+        """Pause the endpoint after a retryable response and return the sleep time.
+
+        Uses full-jitter exponential backoff, but never less than the
+        server's Retry-After.
+        """
+        delay = random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+        retry_after = parse_retry_after(headers.get('Retry-After')) if headers is not None else None
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        self.bucket(endpoint).pause(delay)
+        return delay
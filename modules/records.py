@@ -0,0 +1,148 @@
+import sys
+
+
+# Apollo headcount growth fields, read by scoring, delta refresh and the store.
+# Kept here rather than in icp_scoring so records stay free of pandas / numpy.
+GROWTH_COLUMNS = [
+    'organization_headcount_six_month_growth',
+    'organization_headcount_twelve_month_growth',
+    'organization_headcount_twenty_four_month_growth',
+]
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _intern_all(values) -> tuple:
+    return tuple(sys.intern(v) if isinstance(v, str) else v for v in values or ())
+
+
+class _Record:
+    """Dict-style read access over __slots__, so records flow through code written for API dicts."""
+    __slots__ = ()
+    # Slots holding repeated low-cardinality strings
+    _interned = ()
+    # Slots holding lists of tags
+    _tag_lists = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._public = frozenset(cls.fields())
+
+    @classmethod
+    def fields(cls) -> tuple:
+        """Apollo fields this record keeps (its public slots)."""
+        return tuple(s for s in cls.__slots__ if not s.startswith('_'))
+
+    def get(self, key: str, default=None):
+        if key in self._public:
+            value = getattr(self, key)
+            return default if value is None else value
+        raw = getattr(self, '_raw', None)
+        return raw.get(key, default) if raw else default
+
+    def __getitem__(self, key: str):
+        value = self.get(key, KeyError)
+        if value is KeyError:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: str, value):
+        setattr(self, key, value)
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    @property
+    def raw(self) -> dict:
+        """Full API payload, if the record was built with keep_raw=True."""
+        return self._raw
+
+    def to_dict(self) -> dict:
+        """API-shaped dict (the raw payload when kept, plus any fields set locally)."""
+        out = dict(self._raw) if self._raw else {}
+        for name in self.fields():
+            value = getattr(self, name)
+            if value is not None:
+                out[name] = list(value) if name in self._tag_lists else value
+        return out
+
+    def __repr__(self):
+        return f"{type(self).__name__}(id={getattr(self, 'id', None)!r}, name={getattr(self, 'name', None)!r})"
+
+
+def organization_context(org) -> dict:
+    """Summary attached to an org's people; build it once per org and share it across them."""
+    return {
+        'id': org.get('id'),
+        'name': org.get('name', 'Unknown'),
+        'industry': org.get('industry'),
+        'employees': org.get('estimated_num_employees'),
+        'website': org.get('website_url'),
+    }
+
+
+class Organization(_Record):
+    """Compact Apollo organization: only the fields display, scoring, dedup and export use.
+
+    Roughly a tenth of the memory of the ~50-key API dict; repeated strings
+    (industry, location, keyword tags) are interned so a large universe
+    shares one copy of each.
+    """
+    __slots__ = (
+        'id', 'name', 'website_url', 'primary_domain', 'linkedin_uid',
+        'industry', 'industries', 'secondary_industries', 'keywords', 'technology_names',
+        'current_technologies', 'estimated_num_employees', 'organization_revenue',
+        'city', 'state', 'country',
+        *GROWTH_COLUMNS,
+        'icp_score', 'semantic_score', 'llm_qualified', 'llm_score', 'llm_reason', '_raw',
+    )
+    _interned = ('industry', 'city', 'state', 'country')
+    _tag_lists = ('industries', 'secondary_industries', 'keywords', 'technology_names')
+
+    @classmethod
+    def from_api(cls, data: dict, keep_raw: bool = False) -> 'Organization':
+        """Build from an organizations/search result dict.
+
+        Args:
+            data: Apollo organization dict
+            keep_raw: Also keep the full payload (for export); off by default
+        """
+        org = cls.__new__(cls)
+        for name in cls.__slots__[:-1]:
+            value = data.get(name)
+            if name in cls._tag_lists:
+                value = _intern_all(value) if value is not None else None
+            elif name in cls._interned:
+                value = _intern(value)
+            setattr(org, name, value)
+        org._raw = data if keep_raw else None
+        return org
+
+
+class Person(_Record):
+    """Compact Apollo person / contact sharing its organization's context dict."""
+    __slots__ = (
+        'id', 'name', 'first_name', 'last_name', 'title', 'seniority',
+        'seniority_class', 'function_class', 'email', 'linkedin_url', 'city', 'state', 'country',
+        'organization_id', 'llm_qualified', 'llm_score', 'llm_reason', 'organization_context', '_raw',
+    )
+    _interned = ('title', 'seniority', 'seniority_class', 'function_class', 'city', 'state', 'country', 'organization_id')
+
+    @classmethod
+    def from_api(cls, data: dict, organization_context: dict = None, keep_raw: bool = False) -> 'Person':
+        """Build from a mixed_people/search or contacts/search result dict.
+
+        Args:
+            data: Apollo person dict
+            organization_context: Shared per-org summary (see organization_context)
+            keep_raw: Also keep the full payload (for export); off by default
+        """
+        person = cls.__new__(cls)
+        for name in cls.__slots__[:-2]:
+            value = data.get(name)
+            setattr(person, name, _intern(value) if name in cls._interned else value)
+        person.organization_context = organization_context or data.get('organization_context')
+        person._raw = data if keep_raw else None
+        return person
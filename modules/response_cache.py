@@ -0,0 +1,185 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+
+
+DEFAULT_CACHE_PATH = '.cache/apollo_responses.sqlite'
+
+# Seconds a cached response stays fresh, per endpoint. Endpoints not listed
+# (e.g. auth/health) are never cached.
+DEFAULT_TTLS = {
+    'organizations/search': 7 * 24 * 3600,
+    'mixed_people/search': 3 * 24 * 3600,
+    'people/search': 3 * 24 * 3600,
+    'contacts/search': 24 * 3600,
+}
+
+CACHE_MODES = ('normal', 'refresh', 'cache-only')
+
+
+class CacheMiss(Exception):
+    """Raised in cache-only mode when a request is not in the cache."""
+
+
+def canonicalize(params: dict) -> str:
+    """Stable JSON form of a request payload.
+
+    Keys are sorted, None values dropped and lists of strings sorted, so
+    payloads that only differ in ordering share a cache entry.
+    """
+    def normalize(value):
+        if isinstance(value, dict):
+            return {k: normalize(v) for k, v in value.items() if v is not None}
+        if isinstance(value, (list, tuple)):
+            items = [normalize(v) for v in value]
+            if all(isinstance(v, str) for v in items):
+                return sorted(items)
+            return items
+        return value
+
+    return json.dumps(normalize(params or {}), sort_keys=True, separators=(',', ':'))
+
+
+class ResponseCache:
+    """Content-addressed, zlib-compressed Apollo response cache in SQLite.
+
+    Entries are keyed on endpoint + canonicalized payload, expire after a
+    per-endpoint TTL and are evicted least-recently-used once the stored
+    size exceeds ``max_bytes``.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, mode: str = 'normal', ttls: dict = None,
+                 max_bytes: int = 512 * 1024 * 1024):
+        """
+        Args:
+            path: SQLite file holding the cache
+            mode: 'normal' (read + write), 'refresh' (skip reads, overwrite)
+                  or 'cache-only' (never hit the network, ignore TTLs)
+            ttls: Per-endpoint TTL in seconds, defaults to DEFAULT_TTLS
+            max_bytes: Compressed size budget before LRU eviction
+        """
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Unsupported cache mode: {mode}. Expected one of {CACHE_MODES}")
+        self.path = Path(path)
+        self.mode = mode
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._refreshed = set()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                endpoint TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses(last_access)")
+        self._conn.commit()
+        self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    @staticmethod
+    def key(endpoint: str, params: dict) -> str:
+        return hashlib.sha256(f"{endpoint}\n{canonicalize(params)}".encode('utf-8')).hexdigest()
+
+    def caches(self, endpoint: str) -> bool:
+        """Whether responses from this endpoint are cached at all."""
+        return self.ttls.get(endpoint, 0) > 0
+
+    def refresh(self, endpoint: str):
+        """Re-fetch (and re-cache) this endpoint's responses as in refresh mode; other endpoints are unaffected."""
+        self._refreshed.add(endpoint)
+
+    def get(self, endpoint: str, params: dict) -> bytes:
+        """Return the cached body, or None on a miss / expired entry / refresh mode."""
+        if self.mode == 'refresh' or endpoint in self._refreshed or not self.caches(endpoint):
+            return None
+
+        key = self.key(endpoint, params)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            fresh = row is not None and (
+                self.mode == 'cache-only' or now - row[1] <= self.ttls[endpoint]
+            )
+            if not fresh:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+        return zlib.decompress(row[0])
+
+    def put(self, endpoint: str, params: dict, body: bytes):
+        """Store a successful response body."""
+        if self.mode == 'cache-only' or not self.caches(endpoint):
+            return
+
+        key = self.key(endpoint, params)
+        blob = zlib.compress(body, 6)
+        now = time.time()
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, endpoint, body, size, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, endpoint, blob, len(blob), now, now)
+            )
+            self._total_bytes += len(blob) - (old[0] if old else 0)
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        """Drop least-recently-used entries until the cache is under 90% of its budget."""
+        target = int(self.max_bytes * 0.9)
+        rows = self._conn.execute("SELECT key, size FROM responses ORDER BY last_access ASC")
+        evicted = []
+        for key, size in rows:
+            if self._total_bytes <= target:
+                break
+            evicted.append((key,))
+            self._total_bytes -= size
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", evicted)
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        return {'entries': entries, 'bytes': self._total_bytes, 'hits': self.hits, 'misses': self.misses}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def add_cache_arguments(parser):
+    """Add the shared --cache-only / --refresh / --no-cache switches to an ArgumentParser."""
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--cache-only', action='store_true',
+                       help='Serve every request from the response cache; never call the API')
+    group.add_argument('--refresh', action='store_true',
+                       help='Ignore cached responses and re-fetch (results are re-cached)')
+    group.add_argument('--no-cache', action='store_true', help='Disable the response cache')
+    parser.add_argument('--cache-path', default=DEFAULT_CACHE_PATH, help='SQLite response cache file')
+
+
+def cache_from_args(args) -> ResponseCache:
+    """Build the ResponseCache selected by add_cache_arguments switches (None if disabled)."""
+    if args.no_cache:
+        return None
+    mode = 'cache-only' if args.cache_only else 'refresh' if args.refresh else 'normal'
+    return ResponseCache(args.cache_path, mode=mode)
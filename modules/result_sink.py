@@ -0,0 +1,222 @@
+import gzip
+import io
+import json
+import threading
+import time
+from pathlib import Path
+
+try:
+    import zstandard
+except ImportError:  # optional: only needed for .zst output
+    zstandard = None
+
+
+COMPRESSIONS = (None, 'gzip', 'zstd')
+
+
+def _encode(value):
+    """json.dumps fallback: compact records (records.py) serialize as their API dict."""
+    to_dict = getattr(value, 'to_dict', None)
+    return to_dict() if to_dict else str(value)
+
+
+def _infer_compression(path: Path) -> str:
+    if path.suffix == '.gz':
+        return 'gzip'
+    if path.suffix == '.zst':
+        return 'zstd'
+    return None
+
+
+def _drop_partial_tail(path: Path):
+    """Cut an uncompressed file back to its last complete line (the tail of an interrupted write)."""
+    with open(path, 'rb+') as f:
+        size = f.seek(0, 2)
+        end = size
+        while end > 0:
+            f.seek(max(0, end - 65536))
+            block = f.read(end - f.tell())
+            newline = block.rfind(b'\n')
+            if newline >= 0:
+                end = end - len(block) + newline + 1
+                break
+            end -= len(block)
+        if end != size:
+            f.truncate(end)
+
+
+class JSONLSink:
+    """JSON Lines writer for org / person records.
+
+    Each record is written as one compact line as soon as it arrives, so
+    memory stays flat, a crash only loses the unflushed tail, and other
+    processes can tail the file while a crawl is running. Output can be
+    gzip- or zstd-compressed; both are flushed at block boundaries so
+    readers can decompress everything written so far.
+    """
+
+    def __init__(self, path: str, compression: str = 'infer', flush_every: int = 100,
+                 flush_interval: float = 5.0, append: bool = False, skip_existing: bool = False):
+        """
+        Args:
+            path: Output file (.jsonl, .jsonl.gz or .jsonl.zst)
+            compression: None, 'gzip', 'zstd' or 'infer' (from the file suffix)
+            flush_every: Flush after this many records
+            flush_interval: ...or once this many seconds passed since the last flush
+            append: Keep existing records instead of truncating the file
+            skip_existing: With ``append``, drop records whose ``id`` is already
+                           in the file (e.g. pages replayed by a resumed crawl)
+        """
+        self.path = Path(path)
+        self.compression = _infer_compression(self.path) if compression == 'infer' else compression
+        if self.compression not in COMPRESSIONS:
+            raise ValueError(f"Unsupported compression: {self.compression}. Expected one of {COMPRESSIONS}")
+        if self.compression == 'zstd' and zstandard is None:
+            raise ValueError("zstd compression requires the 'zstandard' package")
+
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.count = 0
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        self._existing = set()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if append and self.path.exists():
+            if self.compression is None:
+                _drop_partial_tail(self.path)
+            if skip_existing:
+                self._existing = {r.get('id') for r in read_jsonl(self.path) if r.get('id')}
+        mode = 'ab' if append else 'wb'
+        self._raw = open(self.path, mode)
+        if self.compression == 'gzip':
+            # Each run appends a new gzip member; multi-member files read fine.
+            self._file = gzip.GzipFile(fileobj=self._raw, mode=mode)
+        elif self.compression == 'zstd':
+            self._file = zstandard.ZstdCompressor().stream_writer(self._raw, closefd=False)
+        else:
+            self._file = self._raw
+
+    def write(self, record: dict):
+        """Append one record."""
+        if self._existing and record.get('id') in self._existing:
+            return
+        line = json.dumps(record, separators=(',', ':'), ensure_ascii=False, default=_encode) + '\n'
+        with self._lock:
+            self._file.write(line.encode('utf-8'))
+            self.count += 1
+            self._pending += 1
+            self._maybe_flush()
+
+    def write_many(self, records: list):
+        """Append a batch of records (e.g. one API page)."""
+        if self._existing:
+            records = [r for r in records if r.get('id') not in self._existing]
+        if not records:
+            return
+        data = ''.join(
+            json.dumps(r, separators=(',', ':'), ensure_ascii=False, default=_encode) + '\n'
+            for r in records
+        ).encode('utf-8')
+        with self._lock:
+            self._file.write(data)
+            self.count += len(records)
+            self._pending += len(records)
+            self._maybe_flush()
+
+    def write_encoded(self, data: bytes, count: int):
+        """Append ``count`` records already serialized as JSON lines (e.g. by worker processes)."""
+        if not count:
+            return
+        with self._lock:
+            self._file.write(data)
+            self.count += count
+            self._pending += count
+            self._maybe_flush()
+
+    def _maybe_flush(self):
+        if (self._pending >= self.flush_every
+                or time.monotonic() - self._last_flush >= self.flush_interval):
+            self._flush()
+
+    def _flush(self):
+        if self.compression == 'gzip':
+            self._file.flush()  # zlib Z_SYNC_FLUSH
+        elif self.compression == 'zstd':
+            self._file.flush(zstandard.FLUSH_BLOCK)
+        self._raw.flush()
+        self._pending = 0
+        self._last_flush = time.monotonic()
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def close(self):
+        with self._lock:
+            if self._raw.closed:
+                return
+            if self._file is not self._raw:
+                self._file.close()
+            self._raw.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def read_jsonl_lines(path: str):
+    """Yield the raw (undecoded) lines of a (possibly gzip/zstd-compressed) JSONL file."""
+    path = Path(path)
+    compression = _infer_compression(path)
+    if compression == 'gzip':
+        stream = gzip.open(path, 'rt', encoding='utf-8')
+    elif compression == 'zstd':
+        if zstandard is None:
+            raise ValueError("Reading .zst files requires the 'zstandard' package")
+        raw = zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), read_across_frames=True,
+                                                         closefd=True)
+        stream = io.TextIOWrapper(raw, encoding='utf-8')
+    else:
+        stream = open(path, 'r', encoding='utf-8')
+
+    with stream:
+        try:
+            for line in stream:
+                if not line.endswith('\n'):
+                    break  # partially written tail of a file still being written
+                line = line.strip()
+                if line:
+                    yield line
+        except EOFError:
+            return  # gzip stream of a crawl that is still running (no trailer yet)
+
+
+def read_jsonl(path: str):
+    """Yield records from a (possibly gzip/zstd-compressed) JSONL file."""
+    for line in read_jsonl_lines(path):
+        yield json.loads(line)
+
+
+def add_output_arguments(parser):
+    """Add the shared --output-dir / --compress switches to an ArgumentParser."""
+    parser.add_argument('--output-dir', default='.', help='Directory for streamed JSONL results')
+    parser.add_argument('--compress', choices=['gzip', 'zstd'], default=None,
+                        help='Compress streamed results')
+
+
+def sink_from_args(args, name: str, **kwargs) -> JSONLSink:
+    """Open ``<output-dir>/<name>.jsonl[.gz|.zst]`` as selected by add_output_arguments switches.
+
+    A fresh run truncates the file. With ``--resume`` it is appended to,
+    skipping records the interrupted run already wrote, since the journal
+    replays their pages and organizations.
+    """
+    suffix = {None: '.jsonl', 'gzip': '.jsonl.gz', 'zstd': '.jsonl.zst'}[args.compress]
+    if getattr(args, 'resume', False):
+        kwargs.setdefault('append', True)
+        kwargs.setdefault('skip_existing', True)
+    return JSONLSink(Path(args.output_dir) / f"{name}{suffix}", compression=args.compress, **kwargs)
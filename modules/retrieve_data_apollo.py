@@ -1,7 +1,8 @@
 import os
-import requests
 import json
 from input_handler import InputHandler
+from apollo_client import ApolloClient
+from icp_query import ICPQuery
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -11,50 +12,21 @@ load_dotenv()
 class ApolloDataRetriever:
     """Retrieve data from Apollo API based on ICP configuration."""
     
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, client: ApolloClient = None, pool_size: int = 10):
         self.api_key = api_key
-        self.headers = {
-            'Content-Type': 'application/json',
-            'X-Api-Key': api_key
-        }
+        # One pooled keep-alive client shared by every endpoint call
+        self.client = client or ApolloClient(api_key, pool_size=pool_size)
     
     def transform_config(self, icp_config: dict) -> dict:
         """Transform ICP config to Apollo API format - FREE TIER ONLY."""
-        icp = icp_config.get('ICP', {})
-        signals = icp_config.get('Signals', {})
-        
-        # Only use filters available on FREE tier
-        apollo_params = {
-            'page': 1,
-            'per_page': 10
-        }
-        
-        # Basic keyword search (FREE)
-        keywords = []
-        if 'industry' in icp:
-            keywords.extend(icp['industry'])
-        if 'keywords' in icp:
-            keywords.extend(icp['keywords'])
-        
-        if keywords:
-            apollo_params['q_organization_keyword_tags'] = keywords
-        
-        # Location (FREE)
-        if 'geography' in icp:
-            apollo_params['organization_locations'] = icp['geography']
-        
-        # NOTE: These are NOT available on free tier:
-        # - revenue_range
-        # - organization_num_employees_ranges  
-        # - organization_technology_slugs
-        # - Most advanced filters
-        
-        return apollo_params
+        # Only keyword tags and raw locations are available on the free tier;
+        # revenue, employee ranges and technology filters are not.
+        return ICPQuery.from_config(icp_config).free_tier_payload()
     
     def search(self, icp_config: dict) -> dict:
         """Search Apollo API with ICP config - Free tier friendly."""
         # Use organizations/search for free tier
-        url = "https://api.apollo.io/v1/organizations/search"
+        endpoint = 'organizations/search'
         
         # Transform config to Apollo format
         apollo_params = self.transform_config(icp_config)
@@ -63,7 +35,7 @@ class ApolloDataRetriever:
         print(json.dumps(apollo_params, indent=2))
         
         try:
-            response = requests.post(url, headers=self.headers, json=apollo_params, timeout=30)
+            response = self.client.post(endpoint, apollo_params, timeout=30)
             
             # Print detailed error info
             if response.status_code != 200:
@@ -1,7 +1,11 @@
 import os
-import requests
+import argparse
 import json
 from input_handler import InputHandler
+from apollo_client import ApolloClient
+from icp_query import ICPQuery
+from response_cache import add_cache_arguments, cache_from_args
+from result_sink import add_output_arguments, sink_from_args
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -11,155 +15,22 @@ load_dotenv()
 class ApolloDataRetriever:
     """Retrieve data from Apollo API based on ICP configuration."""
     
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, client: ApolloClient = None, pool_size: int = 10):
         self.api_key = api_key
-        self.headers = {
-            'Content-Type': 'application/json',
-            'Cache-Control': 'no-cache',
-            'X-Api-Key': api_key
-        }
+        # One pooled keep-alive client shared by every endpoint call
+        self.client = client or ApolloClient(api_key, pool_size=pool_size)
     
     def transform_org_config(self, icp_config: dict) -> dict:
         """Transform ICP config to Apollo Organizations API format."""
-        icp = icp_config.get('ICP', {})
-        signals = icp_config.get('Signals', {})
-        
-        apollo_params = {
-            'page': 1,
-            'per_page': 25
-        }
-        
-        # 1. Map GEOGRAPHY
-        if 'geography' in icp:
-            locations = []
-            for geo in icp['geography']:
-                if geo.upper() in ['USA', 'US']:
-                    locations.append('United States')
-                else:
-                    locations.append(geo)
-            apollo_params['organization_locations'] = locations
-        
-        # 2. Map EMPLOYEE COUNT
-        if 'employee_count_min' in icp:
-            emp_min = icp['employee_count_min']
-            ranges = []
-            # Only include ranges >= employee_count_min
-            if emp_min <= 10:
-                ranges = ['1,10', '11,20', '21,50', '51,100', '101,200', '201,500', '501,1000', '1001,2000', '2001,5000', '5001,10000', '10001+']
-            elif emp_min <= 20:
-                ranges = ['11,20', '21,50', '51,100', '101,200', '201,500', '501,1000', '1001,2000', '2001,5000', '5001,10000', '10001+']
-            elif emp_min <= 50:
-                ranges = ['21,50', '51,100', '101,200', '201,500', '501,1000', '1001,2000', '2001,5000', '5001,10000', '10001+']
-            elif emp_min <= 100:
-                ranges = ['51,100', '101,200', '201,500', '501,1000', '1001,2000', '2001,5000', '5001,10000', '10001+']
-            elif emp_min <= 200:
-                ranges = ['101,200', '201,500', '501,1000', '1001,2000', '2001,5000', '5001,10000', '10001+']
-            elif emp_min <= 500:
-                ranges = ['201,500', '501,1000', '1001,2000', '2001,5000', '5001,10000', '10001+']
-            else:
-                ranges = ['501,1000', '1001,2000', '2001,5000', '5001,10000', '10001+']
-            apollo_params['organization_num_employees_ranges'] = ranges
-        
-        # 3. Map INDUSTRY + KEYWORDS (combine them)
-        keyword_tags = []
-        if 'industry' in icp:
-            keyword_tags.extend(icp['industry'])
-        if 'keywords' in icp:
-            keyword_tags.extend(icp['keywords'])
-        if keyword_tags:
-            apollo_params['q_organization_keyword_tags'] = keyword_tags
-        
-        # 4. Map TECH STACK
-        if 'tech_stack' in signals and signals['tech_stack']:
-            apollo_params['organization_technology_slugs'] = signals['tech_stack']
-        
-        # 5. Map FUNDING SIGNAL
-        if signals.get('funding'):
-            apollo_params['funding_stage_list'] = [
-                'seed', 'series_a', 'series_b', 'series_c', 'series_d', 'series_e', 'series_f'
-            ]
-        
-        # 6. Map REVENUE (using a workaround - not all plans support revenue_range directly)
-        # We'll use organization size as proxy along with employee count
-        
-        return apollo_params
+        return ICPQuery.from_config(icp_config).org_payload()
     
     def transform_people_config(self, icp_config: dict) -> dict:
         """Transform ICP config to Apollo People API format."""
-        icp = icp_config.get('ICP', {})
-        signals = icp_config.get('Signals', {})
-        
-        apollo_params = {
-            'page': 1,
-            'per_page': 25
-        }
-        
-        # 1. Map GEOGRAPHY for people
-        if 'geography' in icp:
-            locations = []
-            for geo in icp['geography']:
-                if geo.upper() in ['USA', 'US']:
-                    locations.append('United States')
-                else:
-                    locations.append(geo)
-            apollo_params['person_locations'] = locations
-        
-        # 2. Map EMPLOYEE COUNT (for the organizations they work at)
-        if 'employee_count_min' in icp:
-            emp_min = icp['employee_count_min']
-            ranges = []
-            if emp_min <= 10:
-                ranges = ['1,10', '11,20', '21,50', '51,100', '101,200', '201,500', '501,1000', '1001,2000', '2001,5000', '5001,10000', '10001+']
-            elif emp_min <= 20:
-                ranges = ['11,20', '21,50', '51,100', '101,200', '201,500', '501,1000', '1001,2000', '2001,5000', '5001,10000', '10001+']
-            elif emp_min <= 50:
-                ranges = ['21,50', '51,100', '101,200', '201,500', '501,1000', '1001,2000', '2001,5000', '5001,10000', '10001+']
-            elif emp_min <= 100:
-                ranges = ['51,100', '101,200', '201,500', '501,1000', '1001,2000', '2001,5000', '5001,10000', '10001+']
-            elif emp_min <= 200:
-                ranges = ['101,200', '201,500', '501,1000', '1001,2000', '2001,5000', '5001,10000', '10001+']
-            elif emp_min <= 500:
-                ranges = ['201,500', '501,1000', '1001,2000', '2001,5000', '5001,10000', '10001+']
-            else:
-                ranges = ['501,1000', '1001,2000', '2001,5000', '5001,10000', '10001+']
-            apollo_params['organization_num_employees_ranges'] = ranges
-        
-        # 3. Map KEYWORDS (search for people with these keywords in their profile)
-        if 'keywords' in icp:
-            apollo_params['q_keywords'] = ' '.join(icp['keywords'])
-        
-        # 4. Map INDUSTRY (filter organizations by industry keywords)
-        if 'industry' in icp:
-            apollo_params['organization_industry_keyword_tags'] = icp['industry']
-        
-        # 5. Map TECH STACK
-        if 'tech_stack' in signals and signals['tech_stack']:
-            apollo_params['organization_technology_slugs'] = signals['tech_stack']
-        
-        # 6. Map HIRING DATA ROLES (target people with data-related titles)
-        if signals.get('hiring_data_roles'):
-            apollo_params['person_titles'] = [
-                'Chief Data Officer',
-                'VP of Data',
-                'Head of Data',
-                'Director of Data',
-                'Data Science Manager',
-                'VP of Analytics',
-                'Head of Analytics',
-                'Chief Analytics Officer'
-            ]
-        
-        # 7. Map FUNDING SIGNAL
-        if signals.get('funding'):
-            apollo_params['organization_latest_funding_stage_cd'] = [
-                'seed', 'series_a', 'series_b', 'series_c', 'series_d', 'series_e'
-            ]
-        
-        return apollo_params
+        return ICPQuery.from_config(icp_config).people_payload()
     
     def search_organizations(self, icp_config: dict) -> dict:
         """Search organizations using Apollo API."""
-        url = "https://api.apollo.io/v1/organizations/search"
+        endpoint = 'organizations/search'
         
         apollo_params = self.transform_org_config(icp_config)
         
@@ -179,7 +50,7 @@ class ApolloDataRetriever:
         print(json.dumps(apollo_params, indent=2))
         
         try:
-            response = requests.post(url, headers=self.headers, json=apollo_params, timeout=30)
+            response = self.client.post(endpoint, apollo_params, timeout=30)
             
             if response.status_code != 200:
                 print(f"\n❌ API Response Status: {response.status_code}")
@@ -196,7 +67,7 @@ class ApolloDataRetriever:
     
     def search_people(self, icp_config: dict) -> dict:
         """Search people using Apollo API."""
-        url = "https://api.apollo.io/v1/people/search"
+        endpoint = 'people/search'
         
         apollo_params = self.transform_people_config(icp_config)
         
@@ -217,7 +88,7 @@ class ApolloDataRetriever:
         print(json.dumps(apollo_params, indent=2))
         
         try:
-            response = requests.post(url, headers=self.headers, json=apollo_params, timeout=30)
+            response = self.client.post(endpoint, apollo_params, timeout=30)
             
             if response.status_code != 200:
                 print(f"\n❌ API Response Status: {response.status_code}")
@@ -307,14 +178,20 @@ class ApolloDataRetriever:
 
 
 def main():
+    parser = argparse.ArgumentParser(description="ICP-based Apollo search")
+    parser.add_argument('--config', default='data/icp_config.yaml', help='ICP YAML config')
+    add_cache_arguments(parser)
+    add_output_arguments(parser)
+    args = parser.parse_args()
+
     # Get API key
     api_key = os.getenv('APOLLO_API_KEY')
-    if not api_key:
+    if not api_key and not args.cache_only:
         print("❌ Error: Set APOLLO_API_KEY environment variable")
         return
     
     # Read ICP config using InputHandler
-    config_file = 'data/icp_config.yaml'
+    config_file = args.config
     handler = InputHandler(config_file, file_type='yaml')
     icp_config = handler.read()
     
@@ -325,7 +202,9 @@ def main():
     print(json.dumps(icp_config, indent=2))
     
     # Initialize Apollo
-    apollo = ApolloDataRetriever(api_key)
+    cache = cache_from_args(args)
+    client = ApolloClient(api_key, pool_size=int(os.getenv('APOLLO_POOL_SIZE', 10)), cache=cache)
+    apollo = ApolloDataRetriever(api_key, client=client)
     
     # Search both organizations and people based on ICP
     print("\n" + "="*70)
@@ -336,19 +215,19 @@ def main():
     org_results = apollo.search_organizations(icp_config)
     apollo.display_org_results(org_results)
     
-    # Save organization results
-    with open('apollo_organizations_results.json', 'w') as f:
-        json.dump(org_results, f, indent=2)
-    print("✅ Organization results saved to apollo_organizations_results.json")
+    # Stream organization results, one record per org
+    with sink_from_args(args, 'apollo_organizations_results') as sink:
+        sink.write_many(org_results.get('organizations', []))
+    print(f"✅ {sink.count} organizations appended to {sink.path}")
     
     # 2. Search People
     people_results = apollo.search_people(icp_config)
     apollo.display_people_results(people_results)
     
-    # Save people results
-    with open('apollo_people_results.json', 'w') as f:
-        json.dump(people_results, f, indent=2)
-    print("✅ People results saved to apollo_people_results.json")
+    # Stream people results, one record per person
+    with sink_from_args(args, 'apollo_people_results') as sink:
+        sink.write_many(people_results.get('people', []))
+    print(f"✅ {sink.count} people appended to {sink.path}")
     
     # Summary
     org_count = org_results.get('pagination', {}).get('total_entries', 0) if 'error' not in org_results else 0
@@ -372,6 +251,8 @@ def main():
     print(f"  ✓ Hiring Data Roles: {signals.get('hiring_data_roles', False)}")
     print(f"{'='*70}\n")
 
+    apollo.client.display_latency_summary()
+
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,215 @@
+import heapq
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from icp_query import ICPQuery
+from icp_scoring import ICPScorer
+from crawl_journal import CrawlInterrupted, CrawlJournal
+from dedup_index import DedupIndex, person_keys, unique_by_keys
+from pipeline import PeopleLookup
+from records import Organization, Person, organization_context
+
+
+def icp_score_func(query: ICPQuery):
+    """Score function for TopKRanker: ICP score per org, None for orgs failing a hard constraint."""
+    scorer = ICPScorer(query)
+
+    def score(organizations: list) -> list:
+        if not organizations:
+            return []
+        scored = scorer.score(scorer.to_frame(organizations))
+        return [float(s) if m else None for s, m in zip(scored['icp_score'], scored['icp_match'])]
+    return score
+
+
+class TopKRanker:
+    """Bounded min-heap holding the ``k`` best-scoring items seen so far.
+
+    Memory is O(k) however many items are offered. Ties keep the earlier
+    item, matching the stable sort of ICPScorer.rank.
+    """
+
+    def __init__(self, k: int):
+        self.k = k
+        self._heap = []
+        self._seq = 0
+        self.offered = 0
+
+    def __len__(self):
+        return len(self._heap)
+
+    @property
+    def full(self) -> bool:
+        return len(self._heap) >= self.k
+
+    @property
+    def threshold(self) -> float:
+        """Score an item must beat to enter a full heap (None while it is filling)."""
+        return self._heap[0][0] if self.full else None
+
+    def offer(self, item, score: float) -> tuple:
+        """Try to add ``item``; returns (accepted, evicted item or None)."""
+        self.offered += 1
+        self._seq += 1
+        entry = (score, -self._seq, item)
+        if not self.full:
+            heapq.heappush(self._heap, entry)
+            return True, None
+        if entry[:2] > self._heap[0][:2]:
+            return True, heapq.heapreplace(self._heap, entry)[2]
+        return False, None
+
+    def ranked(self) -> list:
+        """(item, score) pairs held, best first."""
+        return [(item, score) for score, _, item in sorted(self._heap, key=lambda e: e[:2], reverse=True)]
+
+    def leaders(self) -> list:
+        """Held items, best first."""
+        return [item for item, _ in self.ranked()]
+
+
+def search_top_k(apollo, icp_config, k: int = 50, max_pages='all', concurrency: int = 10,
+                 score_func=None, enrich: bool = True, sink=None, people_sink=None,
+                 journal: CrawlJournal = None, dedup: DedupIndex = None,
+                 max_lookups: int = None, deadline: float = None) -> dict:
+    """Crawl organization pages, keep only the top ``k`` and enrich them as they lead.
+
+    Each page is scored as it arrives and offered to a TopKRanker, so only
+    ``k`` Organization records are ever held (full payloads stream to
+    ``sink``). Once the heap is full, every org that enters it gets its
+    people lookup queued immediately, while later pages are still being
+    fetched; queued lookups for orgs pushed out again are cancelled. A
+    lookup already running when its org is evicted still spends its credit
+    (reported as ``wasted_lookups``). With ``max_lookups``, ``k`` credits
+    are reserved for the final leaders and only the surplus is spent on
+    these early lookups, so churn in the heap cannot starve the leaders.
+
+    Args:
+        apollo: ApolloDataRetriever
+        icp_config: ICP dict or ICPQuery
+        k: Organizations to keep
+        score_func: list of org dicts -> list of scores (None rejects); defaults to the ICP score
+        enrich: Look up people for the leaders
+        sink / people_sink: Streamed organization / people JSONL output
+        max_lookups: Hard cap on people lookups (credits); early lookups get
+                     at most ``max_lookups - k`` of them
+        deadline: time.monotonic() after which no further pages are read and no lookups start
+    """
+    query = icp_config if isinstance(icp_config, ICPQuery) else ICPQuery.from_config(icp_config)
+    score_func = score_func or icp_score_func(query)
+    ranker = TopKRanker(k)
+    lookup = PeopleLookup(apollo, query, journal, dedup, max_lookups, deadline) if enrich else None
+
+    print(f"\n{'='*70}")
+    print(f"🏆 STREAMING TOP-{k} SEARCH")
+    print(f"{'='*70}")
+
+    stats = {'wasted_lookups': 0, 'early_lookups': 0}
+    # Each leader needs at most one lookup, so early lookups beyond this
+    # surplus could leave final leaders without a credit
+    early_budget = None if max_lookups is None else max(0, max_lookups - k)
+
+    executor = ThreadPoolExecutor(max_workers=concurrency) if enrich else None
+    futures = {}
+
+    def start(org, early: bool = False):
+        if not executor or org.get('id') in futures:
+            return
+        if early:
+            if early_budget is not None and stats['early_lookups'] >= early_budget:
+                return
+            if deadline is not None and time.monotonic() >= deadline:
+                return
+            stats['early_lookups'] += 1
+        futures[org.get('id')] = executor.submit(lookup, org)
+
+    complete = True
+    filled = False
+    matched = 0
+    try:
+        for page, orgs in apollo.iter_organization_pages(query, max_pages, concurrency, journal):
+            found = len(orgs)
+            if dedup:
+                orgs = dedup.merge_orgs(orgs)
+            if sink:
+                sink.write_many(orgs)
+            entered = 0
+            for org, score in zip(orgs, score_func(orgs)):
+                if score is None:
+                    continue
+                matched += 1
+                record = Organization.from_api(org, apollo.keep_raw)
+                accepted, evicted = ranker.offer(record, score)
+                if not accepted:
+                    continue
+                entered += 1
+                if evicted is not None:
+                    future = futures.pop(evicted.get('id'), None)
+                    if future is not None and not future.cancel():
+                        stats['wasted_lookups'] += 1
+                if ranker.full and not filled:
+                    # Heap just filled: queue every current leader, best first
+                    filled = True
+                    for leader in ranker.leaders():
+                        start(leader, early=True)
+                elif filled:
+                    start(record, early=True)
+            threshold = f" | entry score {ranker.threshold:.3f}" if ranker.full else ""
+            print(f"  ✓ Page {page}: found {found} organizations, {entered} entered the top {k}{threshold}")
+            if deadline is not None and time.monotonic() >= deadline:
+                complete = False
+                print("\n⏰ Time budget spent; stopping the organization crawl")
+                break
+    except CrawlInterrupted as e:
+        complete = False
+        print(f"\n❌ Crawl stopped at {e}")
+
+    leaders = []
+    for org, score in ranker.ranked():
+        org['icp_score'] = round(score, 4)
+        leaders.append(org)
+
+    people = []
+    failed = []
+    if executor:
+        for org in leaders:
+            start(org)
+        seen_people = set()
+        for i, org in enumerate(leaders, 1):
+            org_name = org.get('name', 'Unknown')
+            try:
+                found = futures[org.get('id')].result()
+            except Exception as e:
+                failed.append(org.get('id'))
+                print(f"{i}. {org_name}: ⚠️  Error fetching people: {e}")
+                continue
+            if found is None:
+                failed.append(org.get('id'))
+                print(f"{i}. {org_name}: ⏭️  Skipped: credit or time budget reached")
+                continue
+            found = unique_by_keys(found, person_keys, seen_people)
+            if not found:
+                continue
+            context = organization_context(org)
+            for person in found:
+                person['organization_context'] = context
+            if people_sink:
+                people_sink.write_many(found)
+            people.extend(Person.from_api(p, context, apollo.keep_raw) for p in found)
+        executor.shutdown(wait=True)
+        apollo.failed_org_ids = set(failed)
+        stats.update(lookups=lookup.lookups, skipped=lookup.skipped, timed_out=lookup.timed_out)
+        print(f"\n👥 {len(people)} people for the top {len(leaders)} organizations "
+              f"({lookup.lookups} lookups, {stats['wasted_lookups']} spent on orgs later pushed out)")
+        if lookup.skipped - lookup.timed_out:
+            print(f"💳 {lookup.skipped - lookup.timed_out} organizations skipped: credit budget reached")
+        if lookup.timed_out:
+            print(f"⏰ {lookup.timed_out} organizations skipped: time budget spent")
+
+    return {
+        'organizations': leaders,
+        'people': people,
+        'matched': matched,
+        'complete': complete,
+        'stats': stats,
+    }
@@ -0,0 +1,133 @@
+try:
+    import spacy
+except ImportError:  # optional: only needed for title / keyword normalization
+    spacy = None
+
+
+DEFAULT_MODEL = 'en_core_web_sm'
+
+# Components titles and keyword tags never need; lemmas only need the tagger
+DISABLED_COMPONENTS = ('parser', 'ner', 'textcat', 'senter')
+
+# Common abbreviations expanded before classification
+ABBREVIATIONS = {
+    'ceo': 'chief executive officer', 'cto': 'chief technology officer',
+    'cfo': 'chief financial officer', 'coo': 'chief operating officer',
+    'cio': 'chief information officer', 'cdo': 'chief data officer',
+    'cao': 'chief analytics officer', 'cmo': 'chief marketing officer',
+    'cpo': 'chief product officer', 'ciso': 'chief information security officer',
+    'vp': 'vice president', 'svp': 'senior vice president', 'evp': 'executive vice president',
+    'sr': 'senior', 'jr': 'junior', 'mgr': 'manager', 'dir': 'director', 'eng': 'engineering',
+    'it': 'information technology', 'bi': 'business intelligence', 'ml': 'machine learning', 'ai': 'artificial intelligence',
+}
+
+# First matching class wins, so "vice president" is checked before "president"
+SENIORITY_CLASSES = (
+    ('vp', {'vice'}),
+    ('c_suite', {'chief', 'founder', 'cofounder', 'president', 'owner', 'partner'}),
+    ('head', {'head'}),
+    ('director', {'director'}),
+    ('manager', {'manager', 'lead', 'leader'}),
+    ('senior', {'senior', 'principal', 'staff'}),
+    ('entry', {'junior', 'intern', 'associate', 'assistant'}),
+)
+FUNCTION_CLASSES = (
+    ('data', {'data', 'datum', 'analytics', 'analytic', 'analyst', 'intelligence', 'scientist',
+              'science', 'machine', 'learning', 'artificial'}),
+    ('it', {'information', 'security'}),
+    ('engineering', {'engineering', 'engineer', 'developer', 'software', 'technology', 'architect',
+                     'devops', 'platform', 'infrastructure'}),
+    ('product', {'product'}),
+    ('sales', {'sales', 'sale', 'account', 'revenue', 'business', 'partnership'}),
+    ('marketing', {'marketing', 'growth', 'brand', 'demand', 'content'}),
+    ('finance', {'finance', 'financial', 'accounting', 'controller'}),
+    ('operations', {'operation', 'operations', 'operating'}),
+    ('people', {'hr', 'people', 'talent', 'recruiting', 'human'}),
+    ('executive', {'executive'}),
+)
+
+_MODELS = {}
+
+
+def load_nlp(model: str = DEFAULT_MODEL, disable: tuple = DISABLED_COMPONENTS):
+    """spaCy pipeline, loaded at most once per process (and so once per worker)."""
+    if spacy is None:
+        raise ValueError("Title normalization requires the 'spacy' package")
+    key = (model, tuple(disable))
+    if key not in _MODELS:
+        _MODELS[key] = spacy.load(model, disable=list(disable))
+    return _MODELS[key]
+
+
+def _expand(text: str) -> str:
+    words = text.replace('/', ' ').replace('&', ' and ').replace(',', ' ').replace('.', ' ').split()
+    return ' '.join(ABBREVIATIONS.get(w.lower(), w) for w in words)
+
+
+def _classify(lemmas: set, classes: tuple) -> str:
+    for name, words in classes:
+        if lemmas & words:
+            return name
+    return None
+
+
+class TitleNormalizer:
+    """Batch spaCy normalization of job titles and organization keyword tags.
+
+    Strings are de-duplicated and cached, so only unseen ones go through
+    ``nlp.pipe``; the model is loaded once per process with the parser, NER
+    and classifiers disabled. ``n_process`` > 1 fans batches out to spaCy
+    worker processes.
+    """
+
+    def __init__(self, model: str = DEFAULT_MODEL, batch_size: int = 1000, n_process: int = 1):
+        """
+        Args:
+            model: spaCy pipeline name
+            batch_size: Texts per nlp.pipe batch
+            n_process: spaCy worker processes (1 = in-process)
+        """
+        self.nlp = load_nlp(model)
+        self.batch_size = batch_size
+        self.n_process = n_process
+        self._titles = {}
+        self._keywords = {}
+
+    def _lemmas(self, texts: list) -> list:
+        """Lowercased lemma tuples (no stop words / punctuation), one per text."""
+        docs = self.nlp.pipe(texts, batch_size=self.batch_size, n_process=self.n_process)
+        return [
+            tuple(t.lemma_.lower() for t in doc if not (t.is_punct or t.is_space or t.is_stop))
+            for doc in docs
+        ]
+
+    def classify_titles(self, titles: list) -> list:
+        """Seniority / function class and lemmatized tokens for each title.
+
+        Returns one dict per input title: ``{'seniority', 'function', 'tokens'}``.
+        """
+        missing = list(dict.fromkeys(t for t in titles if t and t not in self._titles))
+        if missing:
+            for title, lemmas in zip(missing, self._lemmas([_expand(t) for t in missing])):
+                words = set(lemmas)
+                self._titles[title] = {
+                    'seniority': _classify(words, SENIORITY_CLASSES) or 'individual',
+                    'function': _classify(words, FUNCTION_CLASSES),
+                    'tokens': lemmas,
+                }
+        empty = {'seniority': None, 'function': None, 'tokens': ()}
+        return [self._titles.get(t, empty) if t else empty for t in titles]
+
+    def normalize_keywords(self, texts: list) -> list:
+        """Lemmatized token tuple for each keyword tag / keyword text."""
+        missing = list(dict.fromkeys(t for t in texts if t and t not in self._keywords))
+        if missing:
+            self._keywords.update(zip(missing, self._lemmas(missing)))
+        return [self._keywords.get(t, ()) for t in texts]
+
+    def annotate_people(self, people: list) -> list:
+        """Set ``seniority_class`` / ``function_class`` on each person from its title."""
+        for person, cls in zip(people, self.classify_titles([p.get('title') for p in people])):
+            person['seniority_class'] = cls['seniority']
+            person['function_class'] = cls['function']
+        return people
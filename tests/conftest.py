@@ -0,0 +1,42 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULES = os.path.join(ROOT, 'modules')
+if MODULES not in sys.path:
+    sys.path.insert(0, MODULES)
+
+from apollo_client import ApolloClient
+from input_handler import InputHandler
+from mock_apollo_server import MockApolloConfig, start_mock_server
+from rate_limiter import RateLimiter
+
+
+@pytest.fixture
+def icp_config():
+    return InputHandler(os.path.join(ROOT, 'data', 'icp_config.yaml'), file_type='yaml').read()
+
+
+@pytest.fixture
+def mock_apollo():
+    """Factory: start a mock Apollo server and return an ApolloDataRetriever pointed at it."""
+    from new import ApolloDataRetriever
+
+    servers = []
+
+    def start(cache=None, project=False, **config):
+        config.setdefault('latency', 0)
+        config.setdefault('num_orgs', 200)
+        config.setdefault('seed_path', os.path.join(ROOT, 'apollo_organizations_results.json'))
+        server, url = start_mock_server(MockApolloConfig(**config))
+        servers.append(server)
+        client = ApolloClient('test-key', base_url=url, rate_limiter=RateLimiter(requests_per_minute=600000),
+                              max_retries=0, cache=cache)
+        return ApolloDataRetriever('test-key', client=client, project=project)
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
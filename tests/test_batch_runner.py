@@ -0,0 +1,64 @@
+import json
+
+from batch_runner import fit_to_ceiling, plan_queries, run_batch
+from query_planner import QueryPlanner
+
+KEYWORDS = ['SaaS']
+
+
+def icp(geography, employees=None, keywords=KEYWORDS):
+    config = {'ICP': {'geography': geography, 'keywords': keywords}}
+    if employees is not None:
+        config['ICP']['employee_count_min'] = employees
+    return config
+
+
+def _seed(tmp_path):
+    seeds = [{'name': name, 'country': 'United States', 'state': state, 'keywords': ['saas']}
+             for name, state in (('Bay', 'California'), ('Lone Star', 'Texas'), ('Gotham', 'New York'))]
+    path = tmp_path / 'seed.json'
+    path.write_text(json.dumps({'organizations': seeds}))
+    return str(path)
+
+
+def test_icps_differing_only_in_local_filters_share_a_crawl():
+    configs = {'ca': icp(['California'], 100), 'tx': icp(['Texas'], 500),
+               'ca_copy': icp(['California'], 100), 'fintech': icp(['California'], keywords=['FinTech'])}
+
+    plan = plan_queries(configs)
+
+    assert [p.members for p in plan] == [['ca', 'tx', 'ca_copy'], ['fintech']]
+    merged = plan[0].query
+    assert merged.locations == ('California', 'Texas')
+    assert merged.employee_ranges[0] == '51,100'
+
+
+def test_unfiltered_member_widens_the_merge():
+    plan = plan_queries({'ca': icp(['California'], 100), 'anywhere': icp([])})
+
+    assert len(plan) == 1
+    assert plan[0].query.locations == ()
+    assert plan[0].query.employee_ranges == ()
+
+
+def test_merge_past_the_ceiling_is_crawled_per_icp(mock_apollo, tmp_path):
+    apollo = mock_apollo(num_orgs=90, seed_path=_seed(tmp_path))
+    configs = {'ca': icp(['California']), 'tx': icp(['Texas']), 'ca_copy': icp(['California'])}
+    plan = plan_queries(configs)
+
+    # 60 orgs in the merged query, 30 in each state
+    assert [p.members for p in fit_to_ceiling(apollo, plan, configs, QueryPlanner(apollo, page_ceiling=2))] \
+        == [['ca', 'ca_copy'], ['tx']]
+    assert [p.members for p in fit_to_ceiling(apollo, plan, configs, QueryPlanner(apollo, page_ceiling=3))] \
+        == [['ca', 'tx', 'ca_copy']]
+
+
+def test_batch_serves_each_icp_from_the_shared_crawl(mock_apollo, tmp_path):
+    apollo = mock_apollo(num_orgs=90, seed_path=_seed(tmp_path))
+    configs = {'ca': icp(['California']), 'tx': icp(['Texas'])}
+
+    results = run_batch(apollo, configs, output_dir=str(tmp_path / 'out'), enrich=False)
+
+    assert {o['state'] for o in results['ca']['organizations']} == {'California'}
+    assert len(results['ca']['organizations']) == len(results['tx']['organizations']) == 30
+    assert (tmp_path / 'out' / 'tx' / 'apollo_organizations.jsonl').exists()
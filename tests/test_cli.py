@@ -0,0 +1,45 @@
+import os
+import sys
+
+import pytest
+
+import new
+
+CONFIG = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'icp_config.yaml')
+
+
+def run_main(monkeypatch, tmp_path, *argv):
+    monkeypatch.setattr(sys, 'argv', [
+        'new.py', '--config', CONFIG, '--output-dir', str(tmp_path), '--cache-path', str(tmp_path / 'cache.sqlite'),
+        '--journal', str(tmp_path / 'journal.sqlite'), '--dedup-index', str(tmp_path / 'identity.sqlite'),
+        '--snapshots', str(tmp_path / 'snapshots.sqlite'), *argv])
+    new.main()
+
+
+def test_dry_run_without_estimate_exits_cleanly(monkeypatch, tmp_path, capsys):
+    run_main(monkeypatch, tmp_path, '--cache-only', '--dry-run')
+    out = capsys.readouterr().out
+    assert 'Budget estimate unavailable' in out
+    assert 'Dry run' in out
+
+
+def test_budgeted_run_continues_without_estimate(monkeypatch, tmp_path, capsys):
+    run_main(monkeypatch, tmp_path, '--cache-only', '--max-credits', '5')
+    out = capsys.readouterr().out
+    assert 'Budget estimate unavailable' in out
+    assert 'STEP 1' in out
+
+
+@pytest.mark.parametrize('argv', [
+    ['--pipeline', '--top-k', '5'],
+    ['--pipeline', '--split'],
+    ['--top-k', '5', '--delta'],
+    ['--pipeline', '--semantic'],
+    ['--top-k', '5', '--qualify'],
+    ['--pipeline', '--classify-titles'],
+])
+def test_streaming_modes_reject_unsupported_flags(monkeypatch, argv):
+    monkeypatch.setattr(sys, 'argv', ['new.py', *argv])
+    with pytest.raises(SystemExit) as exc:
+        new.parse_args()
+    assert exc.value.code == 2
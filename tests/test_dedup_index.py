@@ -0,0 +1,34 @@
+from dedup_index import DedupIndex, titles_key
+
+ORG = {'id': 'org1', 'primary_domain': 'acme.com'}
+CTO = {'id': 'p1', 'title': 'CTO'}
+CFO = {'id': 'p2', 'title': 'CFO'}
+
+
+def test_title_sets_do_not_share_people(tmp_path):
+    dedup = DedupIndex(str(tmp_path / 'identity.sqlite'))
+    dedup.merge_orgs([ORG])
+    dedup.record_people(ORG, [CTO], ['CTO'])
+
+    assert dedup.people_fetched(ORG, ['cto'])
+    assert dedup.stored_people(ORG, ['CTO']) == [CTO]
+    assert not dedup.people_fetched(ORG, ['CFO'])
+    assert dedup.stored_people(ORG, ['CFO']) == []
+
+    dedup.record_people(ORG, [CFO], ['CFO'])
+    assert dedup.stored_people(ORG, ['CFO']) == [CFO]
+    assert dedup.stored_people(ORG, ['CTO']) == [CTO]
+
+
+def test_expire_people_forgets_every_title_set(tmp_path):
+    dedup = DedupIndex(str(tmp_path / 'identity.sqlite'))
+    dedup.record_people(ORG, [CTO], ['CTO'])
+    dedup.record_people(ORG, [CFO], None)
+    dedup.expire_people([{'primary_domain': 'www.acme.com'}])
+    assert not dedup.people_fetched(ORG, ['CTO'])
+    assert not dedup.people_fetched(ORG)
+
+
+def test_titles_key_ignores_order_and_case():
+    assert titles_key(['CTO', 'VP of Data']) == titles_key(['vp of data', 'cto '])
+    assert titles_key([]) == titles_key(None) == ''
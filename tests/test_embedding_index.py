@@ -0,0 +1,37 @@
+import hashlib
+
+import numpy as np
+
+from embedding_index import EmbeddingIndex, profile_text
+
+
+class HashEmbedder:
+    """Deterministic stand-in for Embed4All."""
+
+    def embed(self, texts):
+        return [np.frombuffer(hashlib.sha256(t.encode()).digest(), dtype=np.uint8)[:8].astype(np.float32) + 1
+                for t in texts]
+
+
+ORGS = [{'id': f'o{i}', 'name': f'Org {i}', 'keywords': [f'kw{i}']} for i in range(3)]
+
+
+def test_interrupted_add_does_not_shift_rows(tmp_path):
+    index = EmbeddingIndex(str(tmp_path), embedder=HashEmbedder())
+    index.add(ORGS[:2])
+    index.close()
+    # An add() that appended its vectors but crashed before committing the rows
+    with open(tmp_path / 'vectors.f32', 'ab') as f:
+        f.write(np.ones((5, 8), dtype=np.float32).tobytes())
+
+    index = EmbeddingIndex(str(tmp_path), embedder=HashEmbedder())
+    index.add(ORGS)
+    expected = index.embed([profile_text(ORGS[2])])[0]
+    assert (tmp_path / 'vectors.f32').stat().st_size == 3 * 8 * 4
+    assert np.isclose(index.similarity(expected, ['o2'])[0], 1.0)
+
+
+def test_lookalike_names(tmp_path):
+    index = EmbeddingIndex(str(tmp_path), embedder=HashEmbedder())
+    index.add(ORGS)
+    assert index.names(['o1', 'missing']) == {'o1': 'Org 1'}
@@ -0,0 +1,37 @@
+import copy
+import json
+import os
+
+from conftest import ROOT
+from icp_query import ICPQuery
+from icp_scoring import ICPScorer
+
+
+def seed_orgs():
+    with open(os.path.join(ROOT, 'apollo_organizations_results.json'), encoding='utf-8') as f:
+        return json.load(f)['organizations']
+
+
+def test_state_geography_matches_orgs_in_that_state(icp_config):
+    config = copy.deepcopy(icp_config)
+    config['ICP']['geography'] = ['California']
+    orgs = seed_orgs()
+    in_state = {o['id'] for o in orgs if o.get('state') == 'California'}
+    assert in_state
+
+    query = ICPQuery.from_config(config)
+    scored = ICPScorer(query).score(ICPScorer(query).to_frame(orgs))
+    located = set(scored['id'][scored['icp_match']])
+    assert located <= in_state
+    assert located == {o['id'] for o in orgs if query.matches(o)}
+    assert located
+
+
+def test_country_shorthand_matches_country(icp_config):
+    query = ICPQuery.from_config(icp_config)
+    org = {'country': 'United States', 'state': 'Texas', 'city': 'Austin',
+           'organization_revenue': 50_000_000, 'estimated_num_employees': 500}
+    assert query.matches(org)
+    assert query.matches(dict(org, country=None, state=None, city=None)) is False
+    city = ICPQuery.from_config(dict(icp_config, ICP=dict(icp_config['ICP'], geography=['Austin, TX'])))
+    assert city.matches(dict(org, country='Canada'))
@@ -0,0 +1,57 @@
+import random
+
+from icp_scoring import TagColumn
+from keyword_matcher import KeywordMatcher, normalize_token, tokenize
+
+
+def naive_counts(terms: list, text: str) -> list:
+    """Reference: count each term's token sequence at every position of the text's tokens."""
+    tokens = tokenize(text)
+    counts = []
+    for term in terms:
+        pattern = tokenize(term)
+        counts.append(sum(tokens[i:i + len(pattern)] == pattern for i in range(len(tokens))))
+    return counts
+
+
+def test_matches_whole_tokens_unlike_substrings():
+    matcher = KeywordMatcher(['AI', 'ML', 'Data'])
+
+    for tag in ('retail', 'html emails', 'database'):
+        assert any(term.lower() in tag for term in matcher.terms)  # the old substring test fired
+        assert matcher.counts(tag) == [0, 0, 0]
+    assert matcher.counts('AI-driven ML for data teams') == [1, 1, 1]
+
+
+def test_overlapping_terms_all_fire():
+    matcher = KeywordMatcher(['data', 'data warehouse', 'warehouse', 'cloud data warehouse'])
+
+    assert matcher.counts('Cloud data warehouses and data lakes') == [2, 1, 1, 1]
+
+
+def test_plurals_fold_on_both_sides():
+    assert [normalize_token(t) for t in ('companies', 'platforms', 'business', 'analytics', 'os')] \
+        == ['company', 'platform', 'business', 'analytic', 'os']
+
+    matcher = KeywordMatcher(['Machine Learning Platform', 'Companies', 'SaaS', 'saas'])
+    assert matcher.terms == ['Machine Learning Platform', 'Companies', 'SaaS']
+    assert matcher.counts('machine-learning platforms for software companies') == [1, 1, 0]
+    assert matcher.counts('B2B SaaS company') == [0, 1, 1]
+
+
+def test_automaton_agrees_with_naive_scan():
+    rng = random.Random(3)
+    words = ['data', 'cloud', 'platform', 'platforms', 'ai', 'retail', 'analytics', 'warehouse']
+    terms = ['data', 'cloud data', 'data platform', 'ai', 'analytics', 'data data', 'warehouse']
+    matcher = KeywordMatcher(terms)
+    for _ in range(200):
+        text = ' '.join(rng.choice(words) for _ in range(rng.randint(0, 12)))
+        assert matcher.counts(text) == naive_counts(terms, text)
+
+
+def test_tag_column_counts_terms_per_row():
+    column = TagColumn.from_lists([['Fintech', 'Payments'], [], ['payment platforms', 'retail']])
+    matcher = KeywordMatcher(['payment', 'ai'])
+
+    assert column.term_counts(matcher).tolist() == [[1, 0], [0, 0], [1, 0]]
+    assert column.overlap(matcher).tolist() == [0.5, 0.0, 0.5]
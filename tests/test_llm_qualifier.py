@@ -0,0 +1,43 @@
+import json
+
+from icp_query import ICPQuery
+from llm_qualifier import LLMQualifier, keep_qualified
+from records import Organization, Person
+
+
+class ScriptedBackend:
+    """Answers each numbered record from a name -> verdict table; unknown names get no verdict."""
+    model = 'scripted'
+
+    def __init__(self, verdicts):
+        self.verdicts = verdicts
+
+    def complete(self, system, prompt):
+        answers = []
+        for line in prompt.splitlines():
+            number, _, text = line.partition('. ')
+            for name, verdict in self.verdicts.items():
+                if name in text:
+                    answers.append(dict(verdict, i=int(number)))
+        return json.dumps(answers)
+
+
+def test_qualified_only_keeps_zero_scores_and_unjudged(icp_config):
+    backend = ScriptedBackend({'Zero': {'qualified': True, 'score': 0, 'reason': 'fits'},
+                               'Bad': {'qualified': False, 'score': 80, 'reason': 'no'}})
+    orgs = [Organization.from_api({'id': n, 'name': n}) for n in ('Zero', 'Bad', 'Silent')]
+    qualifier = LLMQualifier(backend, ICPQuery.from_config(icp_config))
+
+    qualifier.annotate(orgs)
+    kept, unjudged = keep_qualified(orgs)
+
+    assert [o['id'] for o in kept] == ['Zero', 'Silent']
+    assert unjudged == 1
+    assert orgs[0]['llm_score'] == 0.0 and orgs[1]['llm_score'] == 0.0
+
+
+def test_people_can_be_qualified(icp_config):
+    backend = ScriptedBackend({'CTO': {'qualified': True, 'score': 90, 'reason': 'buyer'}})
+    person = Person.from_api({'id': 'p1', 'title': 'CTO'}, {'name': 'Acme'})
+    LLMQualifier(backend, ICPQuery.from_config(icp_config)).annotate([person])
+    assert person['llm_qualified'] is True and person['llm_score'] == 90.0
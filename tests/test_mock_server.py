@@ -0,0 +1,48 @@
+import http.client
+from urllib.parse import urlparse
+
+from benchmark import run_benchmarks
+from mock_apollo_server import MockApolloConfig, MockApolloData, start_mock_server
+from retrieve_data_apollo import ApolloDataRetriever as FreeRetriever
+
+
+def test_country_shorthands_match_united_states():
+    data = MockApolloData(MockApolloConfig(num_orgs=50, seed_path='missing.json'))
+
+    full = data.search_organizations({'organization_locations': ['United States']})
+    assert full
+    for alias in ('USA', 'US', 'usa', 'United States of America'):
+        assert data.search_organizations({'organization_locations': [alias]}) == full
+    assert data.search_organizations({'organization_not_locations': ['USA']}) == []
+
+
+def test_free_implementation_finds_orgs(mock_apollo, icp_config):
+    apollo = mock_apollo()
+    free = FreeRetriever(apollo.client.api_key, client=apollo.client)
+
+    assert free.search(icp_config)['organizations']
+
+
+def test_keep_alive_responses_are_complete():
+    server, url = start_mock_server(MockApolloConfig(num_orgs=10, latency=0, seed_path='missing.json'))
+    try:
+        parsed = urlparse(url)
+        conn = http.client.HTTPConnection(parsed.hostname, parsed.port, timeout=5)
+        for _ in range(3):
+            conn.request('POST', '/v1/organizations/search', body=b'{"per_page": 5}',
+                         headers={'Content-Type': 'application/json'})
+            response = conn.getresponse()
+            assert response.status == 200
+            assert response.getheader('Content-Type') == 'application/json'
+            assert b'"organizations"' in response.read()
+        conn.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_crashed_implementation_is_skipped(capsys, icp_config):
+    # An unknown name raises KeyError in the child before any row is sent
+    assert run_benchmarks(['no-such-implementation'], 'http://127.0.0.1:9/v1', icp_config,
+                          timeout=30) == []
+    assert 'no-such-implementation benchmark exited with code 1' in capsys.readouterr().out
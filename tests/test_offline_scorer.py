@@ -0,0 +1,47 @@
+import json
+import os
+
+import pytest
+
+from icp_query import ICPQuery
+from icp_scoring import ICPScorer
+from mock_apollo_server import MockApolloConfig, MockApolloData
+from offline_scorer import _read_range, score_files
+from result_sink import read_jsonl
+
+SEED_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                         'apollo_organizations_results.json')
+
+
+@pytest.fixture
+def orgs():
+    return MockApolloData(MockApolloConfig(num_orgs=120, seed_path=SEED_PATH)).organizations
+
+
+def _write(path, records, trailing_newline=True):
+    data = '\n'.join(json.dumps(r) for r in records) + ('\n' if trailing_newline else '')
+    path.write_text(data, encoding='utf-8')
+
+
+def test_read_range_keeps_unterminated_last_line(tmp_path):
+    path = tmp_path / 'orgs.jsonl'
+    path.write_bytes(b'{"id":"a"}\n{"id":"b"}')
+    assert _read_range(str(path), 0, path.stat().st_size) == [b'{"id":"a"}', b'{"id":"b"}']
+    assert _read_range(str(path), 0, 11) == [b'{"id":"a"}']
+
+
+@pytest.mark.parametrize('trailing_newline', [True, False])
+def test_pool_matches_in_process_scorer(tmp_path, icp_config, orgs, trailing_newline):
+    path = tmp_path / 'orgs.jsonl'
+    _write(path, orgs, trailing_newline)
+    output = tmp_path / 'scored.jsonl'
+
+    stats = score_files([str(path)], icp_config, str(output), processes=2, chunk_size=7)
+
+    scorer = ICPScorer(ICPQuery.from_config(icp_config))
+    expected = scorer.score(scorer.to_frame(orgs))
+    scored = list(read_jsonl(output))
+    assert stats['records'] == stats['written'] == len(orgs)
+    assert [r['id'] for r in scored] == [o['id'] for o in orgs]
+    assert [r['icp_score'] for r in scored] == [round(float(s), 4) for s in expected['icp_score']]
+    assert [r['icp_match'] for r in scored] == [bool(m) for m in expected['icp_match']]
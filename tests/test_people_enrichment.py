@@ -0,0 +1,23 @@
+from crawl_journal import CrawlJournal
+from dedup_index import DedupIndex
+
+
+def test_failed_contacts_fallback_is_not_recorded(mock_apollo, icp_config, tmp_path):
+    apollo = mock_apollo(forbid_people=True, forbid_contacts=True)
+    orgs = apollo.search_organizations(icp_config, max_pages=1)['organizations'][:3]
+    journal = CrawlJournal(str(tmp_path / 'journal.sqlite'))
+    dedup = DedupIndex(str(tmp_path / 'identity.sqlite'))
+
+    people = apollo.enrich_people_from_organizations(orgs, icp_config, journal=journal, dedup=dedup)
+
+    assert people == []
+    assert apollo.failed_org_ids == {o['id'] for o in orgs}
+    assert not any(dedup.people_fetched(o) for o in orgs)
+
+
+def test_contacts_fallback_returns_people(mock_apollo, icp_config):
+    apollo = mock_apollo(forbid_people=True)
+    orgs = apollo.search_organizations(icp_config, max_pages=1)['organizations'][:2]
+    people = apollo.enrich_people_from_organizations(orgs, icp_config)
+    assert len(people) == 2 * 5
+    assert not apollo.failed_org_ids
@@ -0,0 +1,33 @@
+import pipeline
+from pipeline import run_pipeline
+
+
+def test_parse_failure_marks_page_failed(mock_apollo, icp_config, monkeypatch):
+    apollo = mock_apollo(num_orgs=1000)
+    decode = pipeline.loads
+    calls = []
+
+    def flaky_decode(raw):
+        calls.append(raw)
+        if len(calls) == 2:
+            raise ValueError('truncated body')
+        return decode(raw)
+
+    monkeypatch.setattr(pipeline, 'loads', flaky_decode)
+    result = run_pipeline(apollo, icp_config, max_pages=3, enrich=False, workers={'fetch': 1, 'parse': 1})
+
+    assert not result['complete']
+    assert result['stages']['parse']['errors'] == 1
+
+
+def test_pipeline_matches_sequential_ranking(mock_apollo, icp_config):
+    from icp_query import ICPQuery
+    from icp_scoring import ICPScorer
+
+    apollo = mock_apollo(num_orgs=1000)
+    result = run_pipeline(apollo, icp_config, max_pages=4, enrich=True)
+    fetched = apollo.search_organizations(icp_config, max_pages=4)['organizations']
+    expected = ICPScorer(ICPQuery.from_config(icp_config)).rank(fetched)
+
+    assert [o['id'] for o in result['organizations']] == [o['id'] for o in expected]
+    assert len(result['people']) == 5 * len(expected)
@@ -0,0 +1,25 @@
+from crawl_journal import CrawlJournal
+from pipeline import run_pipeline
+from response_cache import ResponseCache
+from result_sink import JSONLSink, read_jsonl
+
+
+def test_projection_keeps_full_payloads_in_sink_and_journal(mock_apollo, icp_config, tmp_path):
+    apollo = mock_apollo(project=True)
+    journal = CrawlJournal(str(tmp_path / 'journal.sqlite'))
+    with JSONLSink(tmp_path / 'orgs.jsonl') as sink:
+        result = apollo.search_organizations(icp_config, max_pages=1, sink=sink, journal=journal)
+
+    streamed = list(read_jsonl(tmp_path / 'orgs.jsonl'))
+    assert streamed and all('logo_url' in o for o in streamed)
+    crawl_key = ResponseCache.key('organizations/search', dict(apollo.transform_org_config(icp_config), page=None))
+    journaled, _ = journal.completed_pages(crawl_key)[1]
+    assert all('logo_url' in o for o in journaled)
+    assert all(o.raw is None for o in result['organizations'])
+
+
+def test_pipeline_streams_full_payloads(mock_apollo, icp_config, tmp_path):
+    apollo = mock_apollo(project=True)
+    with JSONLSink(tmp_path / 'orgs.jsonl') as sink:
+        run_pipeline(apollo, icp_config, max_pages=1, enrich=False, sink=sink)
+    assert all('logo_url' in o for o in read_jsonl(tmp_path / 'orgs.jsonl'))
@@ -0,0 +1,25 @@
+from prospect_store import ProspectStore
+from records import Organization
+
+
+def test_technologies_come_from_payload_or_single_tech_filter(tmp_path):
+    store = ProspectStore(str(tmp_path / 'prospects.sqlite'))
+    searched = {'id': 'o1', 'name': 'Searched'}
+    enriched = Organization.from_api({'id': 'o2', 'name': 'Enriched',
+                                      'current_technologies': [{'uid': 'looker', 'name': 'Looker'}]})
+
+    store.upsert_orgs([searched, enriched], tech_filter=('Snowflake',))
+
+    assert [o['id'] for o in store.find_orgs(technologies=['snowflake'])] == ['o1']
+    assert [o['id'] for o in store.find_orgs(technologies=['Looker'])] == ['o2']
+    assert store.stats()['technologies'] == 2
+
+
+def test_multi_tech_filter_is_recorded_but_not_attributed(tmp_path):
+    store = ProspectStore(str(tmp_path / 'prospects.sqlite'))
+
+    store.upsert_orgs([{'id': 'o1', 'name': 'Searched'}], tech_filter=('Snowflake', 'Databricks'))
+
+    assert store.find_orgs(technologies=['snowflake']) == []
+    assert store.stats()['technologies'] == 0
+    assert store.find_orgs()[0]['matched_filter'] == 'snowflake,databricks'
@@ -0,0 +1,53 @@
+import json
+
+from icp_query import ICPQuery
+from query_planner import QueryPlanner, search_partitioned
+from response_cache import ResponseCache
+
+ICP = {'ICP': {'geography': ['USA']}}
+
+
+def _seed(tmp_path):
+    seeds = [{'name': 'Bay', 'country': 'United States', 'state': 'California'},
+             {'name': 'Gotham', 'country': 'United States', 'state': 'New York'},
+             {'name': 'Island', 'country': 'United States', 'state': 'Puerto Rico'},
+             {'name': 'Nowhere', 'country': 'United States', 'state': None}]
+    path = tmp_path / 'seed.json'
+    path.write_text(json.dumps({'organizations': seeds}))
+    return str(path)
+
+
+def test_state_split_keeps_orgs_outside_the_listed_states(mock_apollo, tmp_path):
+    apollo = mock_apollo(num_orgs=400, seed_path=_seed(tmp_path))
+    planner = QueryPlanner(apollo, page_ceiling=1)
+
+    result = search_partitioned(apollo, ICP, concurrency=4, planner=planner)
+
+    assert any(q.excluded_locations for q, _ in planner.plan(ICPQuery.from_config(ICP)))
+    assert result['complete']
+    assert len(result['organizations']) == 400
+    states = {o.get('state') for o in result['organizations']}
+    assert {'Puerto Rico', None} <= states
+
+
+def test_failed_probe_is_reported_not_raised(mock_apollo, tmp_path):
+    cache = ResponseCache(str(tmp_path / 'cache.sqlite'), mode='cache-only')
+    apollo = mock_apollo(cache=cache)
+    planner = QueryPlanner(apollo)
+
+    result = search_partitioned(apollo, ICP, planner=planner)
+
+    assert result['organizations'] == []
+    assert not result['complete']
+    assert len(planner.failed) == 1
+
+
+
+def test_deadline_stops_the_partitioned_crawl(mock_apollo, tmp_path):
+    apollo = mock_apollo(num_orgs=400, seed_path=_seed(tmp_path))
+    planner = QueryPlanner(apollo, page_ceiling=1)
+
+    result = search_partitioned(apollo, ICP, concurrency=4, planner=planner, deadline=0.0)
+
+    assert not result['complete']
+    assert result['organizations'] == []
@@ -0,0 +1,50 @@
+import time
+
+from rate_limiter import RateLimiter
+
+
+def apollo_headers(minute_left=199, hourly_left=399, daily_left=1999):
+    return {
+        'x-rate-limit-minute': '200', 'x-minute-requests-left': str(minute_left),
+        'x-rate-limit-hourly': '400', 'x-hourly-requests-left': str(hourly_left),
+        'x-rate-limit-24-hour': '2000', 'x-24-hour-requests-left': str(daily_left),
+    }
+
+
+def test_shortest_window_paces_the_bucket():
+    limiter = RateLimiter(requests_per_minute=50, safety_margin=0.95)
+    limiter.update_from_headers('organizations/search', apollo_headers())
+
+    bucket = limiter.bucket('organizations/search')
+    assert bucket.rate == 200 * 0.95 / 60
+    assert bucket.capacity == bucket.rate * limiter.burst_seconds
+    assert bucket.paused_until <= time.monotonic()
+
+
+def test_minute_requests_left_caps_tokens():
+    limiter = RateLimiter()
+    limiter.update_from_headers('organizations/search', apollo_headers(minute_left=2))
+
+    assert limiter.bucket('organizations/search').tokens <= 2
+
+
+def test_exhausted_long_window_pauses_until_reset():
+    limiter = RateLimiter()
+    limiter.update_from_headers('organizations/search', apollo_headers(hourly_left=5))
+    limiter.update_from_headers('organizations/search', apollo_headers(hourly_left=0))
+
+    bucket = limiter.bucket('organizations/search')
+    assert 3500 < bucket.paused_until - time.monotonic() <= 3600
+    assert bucket.rate == 200 * 0.95 / 60
+    # Other endpoints keep their own windows
+    assert limiter.bucket('mixed_people/search').paused_until == 0.0
+
+
+def test_long_window_reset_restarts_its_clock():
+    limiter = RateLimiter()
+    endpoint = 'organizations/search'
+    limiter.update_from_headers(endpoint, apollo_headers(daily_left=10))
+    limiter._windows[(endpoint, '24-hour')][0] -= 86000
+    assert limiter._time_to_reset(endpoint, '24-hour', 86400, 9) < 500
+    # The count went back up: a new window started
+    assert limiter._time_to_reset(endpoint, '24-hour', 86400, 1999) > 86000
@@ -0,0 +1,24 @@
+from response_cache import ResponseCache
+
+
+def test_refresh_bypasses_one_endpoint(tmp_path):
+    cache = ResponseCache(str(tmp_path / 'cache.sqlite'))
+    cache.put('organizations/search', {'page': 1}, b'orgs')
+    cache.put('mixed_people/search', {'page': 1}, b'people')
+
+    cache.refresh('organizations/search')
+
+    assert cache.get('organizations/search', {'page': 1}) is None
+    assert cache.get('mixed_people/search', {'page': 1}) == b'people'
+
+
+def test_refreshed_pages_are_refetched_and_recached(mock_apollo, icp_config, tmp_path):
+    cache = ResponseCache(str(tmp_path / 'cache.sqlite'))
+    apollo = mock_apollo(cache=cache)
+    apollo.search_organizations(icp_config, max_pages=1)
+    cache.refresh('organizations/search')
+    apollo.search_organizations(icp_config, max_pages=1)
+    assert cache.hits == 0
+
+    fresh = ResponseCache(str(tmp_path / 'cache.sqlite'))
+    assert fresh.get('organizations/search', dict(apollo.transform_org_config(icp_config), page=1))
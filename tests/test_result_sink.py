@@ -0,0 +1,32 @@
+from argparse import Namespace
+
+from result_sink import JSONLSink, read_jsonl, sink_from_args
+
+
+def _args(tmp_path, resume=False):
+    return Namespace(output_dir=str(tmp_path), compress=None, resume=resume)
+
+
+def test_fresh_run_truncates(tmp_path):
+    with sink_from_args(_args(tmp_path), 'orgs') as sink:
+        sink.write_many([{'id': 'a'}, {'id': 'b'}])
+    with sink_from_args(_args(tmp_path), 'orgs') as sink:
+        sink.write_many([{'id': 'c'}])
+    assert [r['id'] for r in read_jsonl(tmp_path / 'orgs.jsonl')] == ['c']
+
+
+def test_resume_appends_without_duplicates(tmp_path):
+    with sink_from_args(_args(tmp_path), 'orgs') as sink:
+        sink.write_many([{'id': 'a'}, {'id': 'b'}])
+    with sink_from_args(_args(tmp_path, resume=True), 'orgs') as sink:
+        sink.write_many([{'id': 'a'}, {'id': 'b'}, {'id': 'c'}])
+        sink.write({'id': 'd'})
+    assert [r['id'] for r in read_jsonl(tmp_path / 'orgs.jsonl')] == ['a', 'b', 'c', 'd']
+
+
+def test_append_drops_partial_tail(tmp_path):
+    path = tmp_path / 'orgs.jsonl'
+    path.write_bytes(b'{"id":"a"}\n{"id":"b","na')
+    with JSONLSink(path, append=True) as sink:
+        sink.write({'id': 'c'})
+    assert [r['id'] for r in read_jsonl(path)] == ['a', 'c']
@@ -0,0 +1,50 @@
+import itertools
+
+from streaming_ranker import TopKRanker, search_top_k
+
+
+def rising_scores():
+    """Every org scores above all earlier ones, so each one evicts the current minimum."""
+    counter = itertools.count()
+    return lambda orgs: [float(next(counter)) for _ in orgs]
+
+
+def test_ranker_keeps_best_and_earlier_ties():
+    ranker = TopKRanker(2)
+    for item, score in (('a', 1.0), ('b', 3.0), ('c', 3.0), ('d', 2.0)):
+        ranker.offer(item, score)
+    assert ranker.leaders() == ['b', 'c']
+
+
+def test_credit_budget_is_reserved_for_final_leaders(mock_apollo, icp_config):
+    apollo = mock_apollo(num_orgs=500)
+    result = search_top_k(apollo, icp_config, k=5, max_pages=4, concurrency=4,
+                          score_func=rising_scores(), max_lookups=5)
+
+    assert result['stats']['early_lookups'] == 0
+    assert result['stats']['lookups'] == 5
+    assert not apollo.failed_org_ids
+    assert len(result['people']) == 5 * 5
+
+
+def test_surplus_credits_fund_early_lookups(mock_apollo, icp_config):
+    apollo = mock_apollo(num_orgs=500)
+    result = search_top_k(apollo, icp_config, k=5, max_pages=4, concurrency=4,
+                          score_func=rising_scores(), max_lookups=8)
+
+    assert result['stats']['early_lookups'] <= 3
+    assert result['stats']['lookups'] <= 8
+    assert not apollo.failed_org_ids
+
+
+def test_no_lookups_after_the_deadline(mock_apollo, icp_config, capsys):
+    apollo = mock_apollo(num_orgs=500)
+    result = search_top_k(apollo, icp_config, k=5, max_pages=4, concurrency=4,
+                          score_func=rising_scores(), deadline=0.0)
+
+    assert len(result['organizations']) == 5
+    assert result['complete'] is False
+    assert result['stats']['lookups'] == 0
+    assert result['stats']['timed_out'] == 5
+    assert len(apollo.failed_org_ids) == 5
+    assert '5 organizations skipped: time budget spent' in capsys.readouterr().out